@@ -0,0 +1,326 @@
+"""
+Benchmark Runner - Time the main storage, analysis and collection paths on a synthetic universe
+
+Usage:
+    python benchmarks/run.py --tickers 500 --years 10
+    python benchmarks/run.py --save-baseline            # record this machine's baseline
+    python benchmarks/run.py --baseline benchmarks/baseline.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+# Add project root to path
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+
+from benchmarks.universe import DEFAULT_END, generate_universe
+from src.analyzer import TechnicalAnalyzer
+from src.data_collector import DataCollector
+from src.database import StockDatabase
+from src.providers import ReplayProvider
+from src.rate_limiter import TokenBucket
+from stock_names import search_stocks
+
+DEFAULT_BASELINE = os.path.join(ROOT, 'benchmarks', 'baseline.json')
+RESULTS_DIR = os.path.join(ROOT, 'benchmarks', 'results')
+
+SEARCH_QUERIES = ['A', 'APP', 'MICRO', 'BANK', 'ENERGY', 'INC', 'Z', 'SYN00', 'NVDA', 'HOLD']
+
+
+class BenchmarkContext:
+    """Synthetic universe plus the databases the scenarios share"""
+
+    def __init__(self, workdir, tickers, years, seed):
+        """Generate the universe (untimed)"""
+        self.workdir = workdir
+        self.seed = seed
+        self.universe = generate_universe(tickers, years, seed)
+        self.tickers = list(self.universe)
+        self.rows = sum(len(df) for df in self.universe.values())
+        self.analyzer = TechnicalAnalyzer()
+        self.db = None
+        self.frames = None
+        self.indicators = None
+        self.count = 0
+        self.scratch = []       # per-run databases, closed after each timed run
+
+    def fresh_path(self):
+        """Path for a new empty database file"""
+        self.count += 1
+        return os.path.join(self.workdir, f"bench_{self.count}", 'stocks.db')
+
+    def fresh_db(self):
+        """A new empty database, closed by close_scratch()"""
+        db = StockDatabase(self.fresh_path())
+        self.scratch.append(db)
+        return db
+
+    def close_scratch(self):
+        """Close the databases opened for the last run"""
+        while self.scratch:
+            self.scratch.pop().close()
+
+    def populated_db(self):
+        """Database holding the whole universe, created on first use"""
+        if self.db is None:
+            self.db = StockDatabase(self.fresh_path())
+            self.db.save_stock_data_bulk(self.universe)
+        return self.db
+
+    def close(self):
+        """Close every database the scenarios opened"""
+        self.close_scratch()
+        if self.db is not None:
+            self.db.close()
+            self.db = None
+
+    def stored_frames(self):
+        """Every ticker's bars as read back from the database"""
+        if self.frames is None:
+            db = self.populated_db()
+            self.frames = {ticker: db.get_stock_data(ticker) for ticker in self.tickers}
+        return self.frames
+
+    def indicator_frames(self):
+        """Every ticker's bars with indicators"""
+        if self.indicators is None:
+            self.indicators = {ticker: self.analyzer.calculate_all_indicators(df)
+                               for ticker, df in self.stored_frames().items()}
+        return self.indicators
+
+
+# Each scenario does its setup untimed and returns (timed callable, items processed)
+
+def scenario_save_stock_data(ctx):
+    """Insert every ticker's history into an empty database"""
+    db = ctx.fresh_db()
+
+    def run():
+        for ticker, df in ctx.universe.items():
+            db.save_stock_data(ticker, df)
+
+    return run, ctx.rows
+
+
+def scenario_get_stock_data(ctx):
+    """Read every ticker's full history"""
+    db = ctx.populated_db()
+
+    def run():
+        for ticker in ctx.tickers:
+            db.get_stock_data(ticker)
+
+    return run, ctx.rows
+
+
+def scenario_calculate_all_indicators(ctx):
+    """Calculate indicators for every ticker"""
+    frames = ctx.stored_frames()
+
+    def run():
+        for df in frames.values():
+            ctx.analyzer.calculate_all_indicators(df)
+
+    return run, ctx.rows
+
+
+def scenario_save_indicators(ctx):
+    """Write every ticker's indicators"""
+    db = ctx.populated_db()
+    frames = ctx.indicator_frames()
+
+    def run():
+        for ticker, df in frames.items():
+            db.save_indicators(ticker, df, replace=True)
+
+    return run, ctx.rows
+
+
+def scenario_generate_signals(ctx):
+    """Generate the latest signals for every ticker"""
+    frames = ctx.indicator_frames()
+
+    def run():
+        for df in frames.values():
+            ctx.analyzer.generate_signals(df)
+
+    return run, len(frames)
+
+
+def scenario_search_stocks(ctx):
+    """Run dashboard ticker searches over the universe"""
+    def run():
+        for query in SEARCH_QUERIES * 100:
+            search_stocks(query, ctx.tickers)
+
+    return run, len(SEARCH_QUERIES) * 100
+
+
+def scenario_collect_watchlist(ctx):
+    """Collect the whole universe from an offline provider into an empty database"""
+    # Offline stand-in serving the same universe, with the request throttles
+    # lifted so the run measures our own collection and storage throughput
+    provider = ReplayProvider(root=os.path.join(ctx.workdir, 'no_recordings'), latency=0,
+                              jitter=0, error_rate=0, seed=ctx.seed, as_of=DEFAULT_END)
+    collector = DataCollector(db_path=ctx.fresh_path(), provider=provider)
+    ctx.scratch.append(collector.db)
+    collector.history_limiter = TokenBucket(1e9, 1e9)
+    collector.info_limiter = TokenBucket(1e9, 1e9)
+
+    # Warm the provider's per-ticker cache so generation time isn't measured
+    for ticker in ctx.tickers:
+        provider.history(ticker)
+
+    def run():
+        collector.collect_watchlist(ctx.tickers, mode='concurrent', incremental=False)
+
+    return run, len(ctx.tickers)
+
+
+SCENARIOS = {
+    'save_stock_data': scenario_save_stock_data,
+    'get_stock_data': scenario_get_stock_data,
+    'calculate_all_indicators': scenario_calculate_all_indicators,
+    'save_indicators': scenario_save_indicators,
+    'generate_signals': scenario_generate_signals,
+    'search_stocks': scenario_search_stocks,
+    'collect_watchlist': scenario_collect_watchlist,
+}
+
+
+def run_scenario(ctx, name, repeat):
+    """Time a scenario `repeat` times, each after a fresh untimed setup"""
+    runs = []
+    for _ in range(repeat):
+        with contextlib.redirect_stdout(io.StringIO()):
+            try:
+                func, items = SCENARIOS[name](ctx)
+                started = time.perf_counter()
+                func()
+                runs.append(time.perf_counter() - started)
+            finally:
+                ctx.close_scratch()
+
+    median = statistics.median(runs)
+    return {
+        'seconds': median,
+        'min': min(runs),
+        'runs': runs,
+        'items': items,
+        'per_second': items / median if median else None,
+    }
+
+
+def git_commit():
+    """Current commit hash, or None outside a git checkout"""
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline, tolerance):
+    """Per-scenario ratio against a baseline; returns names slower than 1 + tolerance"""
+    regressions = []
+    print(f"\n{'scenario':<28}{'baseline':>12}{'current':>12}{'ratio':>9}")
+
+    for name, result in results['results'].items():
+        base = baseline.get('results', {}).get(name)
+        if not base:
+            print(f"{name:<28}{'-':>12}{result['min']:>11.3f}s{'new':>9}")
+            continue
+
+        # Best-of-N is less sensitive to background noise than the median
+        ratio = result['min'] / base['min'] if base['min'] else float('inf')
+        flag = ' ⚠️' if ratio > 1 + tolerance else ''
+        print(f"{name:<28}{base['min']:>11.3f}s{result['min']:>11.3f}s{ratio:>8.2f}x{flag}")
+        result['baseline_ratio'] = ratio
+        if ratio > 1 + tolerance:
+            regressions.append(name)
+
+    if baseline.get('meta', {}).get('universe') != results['meta']['universe']:
+        print("⚠️  Baseline was recorded on a different universe; ratios are not comparable")
+
+    return regressions
+
+
+def main():
+    """Run the benchmark suite from the command line"""
+    parser = argparse.ArgumentParser(description="Benchmark storage, analysis and collection paths")
+    parser.add_argument('--tickers', type=int, default=100, help="tickers in the synthetic universe")
+    parser.add_argument('--years', type=float, default=5, help="years of daily history per ticker")
+    parser.add_argument('--seed', type=int, default=0, help="universe seed")
+    parser.add_argument('--repeat', type=int, default=3, help="timed runs per scenario (median is reported)")
+    parser.add_argument('--scenarios', nargs='+', choices=list(SCENARIOS), help="scenarios to run (default: all)")
+    parser.add_argument('--output', help="JSON results file (default: benchmarks/results/<timestamp>.json)")
+    parser.add_argument('--baseline', help="compare against this results file")
+    parser.add_argument('--save-baseline', action='store_true', help=f"also write results to {DEFAULT_BASELINE}")
+    parser.add_argument('--tolerance', type=float, default=0.2, help="allowed slowdown vs baseline (0.2 = 20%%)")
+    args = parser.parse_args()
+
+    names = args.scenarios or list(SCENARIOS)
+
+    print(f"\n{'='*60}")
+    print(f"⏱️  BENCHMARKS: {args.tickers} tickers x {args.years:g} years (seed {args.seed})")
+    print(f"{'='*60}")
+
+    with tempfile.TemporaryDirectory(prefix='stock-bench-') as workdir:
+        started = time.perf_counter()
+        ctx = BenchmarkContext(workdir, args.tickers, args.years, args.seed)
+        print(f"🧬 Generated {ctx.rows:,} bars in {time.perf_counter() - started:.1f}s\n")
+
+        results = {
+            'meta': {
+                'timestamp': datetime.now().isoformat(timespec='seconds'),
+                'commit': git_commit(),
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'cpus': os.cpu_count(),
+                'universe': {'tickers': args.tickers, 'years': args.years, 'seed': args.seed,
+                             'rows': ctx.rows},
+                'repeat': args.repeat,
+            },
+            'results': {},
+        }
+
+        try:
+            for name in names:
+                result = run_scenario(ctx, name, args.repeat)
+                results['results'][name] = result
+                print(f"  {name:<28}{result['seconds']:>9.3f}s  {result['per_second']:>14,.0f} items/s")
+        finally:
+            ctx.close()
+
+    regressions = []
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+
+    output = args.output or os.path.join(RESULTS_DIR, datetime.now().strftime('%Y%m%d-%H%M%S') + '.json')
+    paths = [output] + ([DEFAULT_BASELINE] if args.save_baseline else [])
+    for path in paths:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump(results, f, indent=2)
+    print(f"\n📁 Results: {', '.join(paths)}")
+
+    if regressions:
+        print(f"❌ Slower than baseline by more than {args.tolerance:.0%}: {', '.join(regressions)}\n")
+        sys.exit(1)
+    print()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,38 @@
+"""
+Universe Generator - Seeded synthetic OHLCV history for benchmark runs
+"""
+
+import sys
+import os
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.providers import synthetic_history
+
+try:
+    from sp500_tickers import SP500_TICKERS
+except ImportError:
+    SP500_TICKERS = []
+
+# Fixed end date so every run benchmarks exactly the same bars
+DEFAULT_END = '2024-12-31'
+
+
+def universe_tickers(n):
+    """First n S&P 500 symbols, padded with generated ones (SYN0001, ...) if needed"""
+    tickers = list(dict.fromkeys(SP500_TICKERS))[:n]
+    tickers += [f"SYN{i:04d}" for i in range(1, n - len(tickers) + 1)]
+    return tickers
+
+
+def generate_universe(n_tickers, years, seed=0, end=DEFAULT_END):
+    """{ticker: Yahoo-style OHLCV DataFrame} for n_tickers over the last `years` years
+
+    Bars fall on NYSE sessions and each ticker gets its own drift and
+    volatility, so the output is realistic in shape and identical for a seed.
+    """
+    return {
+        ticker: synthetic_history(ticker, end=end, years=years, seed=seed)
+        for ticker in universe_tickers(n_tickers)
+    }
@@ -34,9 +34,45 @@ except ImportError:
 DATA_PERIOD = '2y'        # How much historical data to fetch (1d, 5d, 1mo, 3mo, 6mo, 1y, 2y, 5y, 10y, ytd, max)
 DATA_INTERVAL = '1d'      # Data interval (1m, 2m, 5m, 15m, 30m, 60m, 90m, 1h, 1d, 5d, 1wk, 1mo, 3mo)
 UPDATE_FREQUENCY = 3600   # Seconds between automatic updates (3600 = 1 hour)
+SCHEDULER_CHUNK_SIZE = 10  # Tickers refreshed together by the scheduler (python src/scheduler.py)
+SCHEDULER_SPREAD = 0.8     # Fraction of UPDATE_FREQUENCY over which a cycle's chunks are spread
+
+# Data Provider Settings
+DATA_PROVIDER = 'yfinance'  # yfinance (live), replay (offline from REPLAY_DIR) or record (live, saved to REPLAY_DIR)
+REPLAY_DIR = 'data/replay'  # Recorded responses; unrecorded tickers get deterministic synthetic data
+REPLAY_LATENCY = 0.0        # Seconds added to every replayed request
+REPLAY_JITTER = 0.0         # Extra random latency per request (0 to this many seconds)
+REPLAY_ERROR_RATE = 0.0     # Fraction of replayed requests that fail
+REPLAY_SEED = 0             # Seed for synthetic data, jitter and injected errors
+
+# Collection Throughput Settings
+COLLECTION_MODE = 'serial'  # serial (one at a time), concurrent (worker pool) or batch (multi-ticker downloads)
+MAX_WORKERS = 8             # Worker threads used in concurrent mode
+BATCH_GROUP_SIZE = 50       # Tickers per request in batch mode
+HISTORY_RATE_LIMIT = 4.0    # Max price history requests per second (all workers combined)
+HISTORY_BURST = 4           # Max history requests allowed in a single burst
+INFO_RATE_LIMIT = 2.0       # Max company info requests per second (all workers combined)
+INFO_BURST = 2              # Max info requests allowed in a single burst
+
+# Incremental Update Settings
+INCREMENTAL_UPDATES = True  # Only download bars after the last stored date
+INCREMENTAL_OVERLAP_BARS = 5  # Stored bars re-fetched to catch revisions
+REVISION_TOLERANCE = 1e-4   # Relative close change that triggers a full refetch
+STREAMING_INDICATORS = True # Update stored indicators bar by bar during collection
+FUNDAMENTALS_TTL = 86400    # Seconds before stored company info is refreshed (86400 = 1 day)
+FUNDAMENTALS_RETRY = 900    # Seconds before a failed or empty company info fetch is retried
 
 # Database Settings
 DATABASE_PATH = 'data/stocks.db'
+ASYNC_INDICATOR_WRITES = False  # Save dashboard indicators on a background thread
+DB_JOURNAL_MODE = 'WAL'   # WAL lets dashboard readers run while the collector writes
+DB_SYNCHRONOUS = 'NORMAL' # OFF, NORMAL, FULL (NORMAL is safe with WAL)
+DB_CACHE_SIZE = -65536    # Page cache per connection (negative = KiB, so 64 MB)
+DB_MMAP_SIZE = 268435456  # Bytes of the database file to memory-map (256 MB)
+DB_TEMP_STORE = 'MEMORY'  # DEFAULT, FILE or MEMORY
+DB_BUSY_TIMEOUT = 30      # Seconds to wait on a locked database
+PRICE_BACKEND = 'sqlite'  # Where OHLCV bars live: 'sqlite' or 'npy' (columnar memory-mapped files)
+PRICE_STORE_DIR = 'data/prices'  # Directory for the 'npy' backend (migrate with python src/price_store.py)
 
 # Technical Indicator Settings
 SHORT_WINDOW = 20         # Short-term moving average
@@ -48,10 +84,28 @@ MACD_SIGNAL = 9          # MACD signal line period
 BOLLINGER_PERIOD = 20    # Bollinger Bands period
 BOLLINGER_STD = 2        # Bollinger Bands standard deviation
 
+# Indicator Cache Settings
+INDICATOR_CACHE_SIZE = 256   # Analysis results kept in memory (LRU)
+INDICATOR_CACHE_DIR = None   # Set to e.g. 'data/cache' to also keep results on disk
+
 # Signal Thresholds
 RSI_OVERBOUGHT = 70      # RSI overbought threshold
 RSI_OVERSOLD = 30        # RSI oversold threshold
 
+# Backtest Settings (python src/backtest.py)
+BACKTEST_COMMISSION = 0.0005  # Commission as a fraction of traded notional (0.0005 = 5 bps)
+BACKTEST_SLIPPAGE = 0.0005    # Slippage as a fraction of traded notional
+BACKTEST_ALLOW_SHORT = False   # SELL goes short instead of moving to cash
+
+# Parameter Sweep Settings (python src/optimizer.py)
+OPTIMIZER_WORKERS = None      # Worker processes for sweeps (None = one per CPU core)
+OPTIMIZER_METRIC = 'sharpe'   # Statistic used to rank parameter sets
+
+# Report Settings (python src/report.py)
+REPORT_DIR = 'data/reports'   # Where watchlist reports are written
+REPORT_FORMAT = 'csv'         # csv, parquet (needs pyarrow) or json
+REPORT_WORKERS = None         # Worker processes (None = one per CPU core)
+
 # Dashboard Settings
 CHART_HEIGHT = 600        # Chart height in pixels
 CHART_THEME = 'plotly'    # Chart theme (plotly, plotly_white, plotly_dark)
@@ -64,3 +118,9 @@ ANTHROPIC_API_KEY = None      # For Claude AI sentiment analysis
 # Logging Settings
 LOG_LEVEL = 'INFO'        # DEBUG, INFO, WARNING, ERROR, CRITICAL
 LOG_FILE = 'data/stock_analysis.log'
+
+# Metrics Settings
+METRICS_ENABLED = True        # Time fetches, queries, writes and indicator calculations
+METRICS_DIR = 'data/metrics'  # Prometheus text files, one per process (collector.prom, ...); None disables
+METRICS_PORT = None           # Serve /metrics over HTTP from the dashboard and scheduler (e.g. 9108)
+DASHBOARD_TIMINGS = False     # Show the per-rerun timing panel by default (toggle in the sidebar)
@@ -14,9 +14,14 @@ import os
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 import config
-from src.database import StockDatabase
+from src.database import StockDatabase, BackgroundWriter
 from src.data_collector import DataCollector
 from src.analyzer import TechnicalAnalyzer
+from src.fundamentals import FundamentalsStore
+from src.indicator_cache import CachedAnalyzer
+from src.jobs import JobManager
+from src import metrics
+from src.screener import Screener
 from src.news_fetcher import NewsFetcher
 from src.portfolio_manager import PortfolioManager
 
@@ -34,6 +39,9 @@ except ImportError:
         return [t for t in available_tickers if query in t.upper()]
 
 
+# Render timings for this rerun (the script runs top to bottom on every interaction)
+stages = metrics.StageTimer()
+
 # Page configuration
 st.set_page_config(
     page_title="Stock Analysis Tool",
@@ -56,6 +64,121 @@ def init_components():
 db, collector, analyzer, news_fetcher, portfolio_mgr = init_components()
 
 
+@st.cache_resource
+def init_metrics():
+    """Set up logging and the /metrics endpoint once per server process"""
+    metrics.setup_logging()
+    return metrics.serve()
+
+init_metrics()
+stages.lap('init')
+
+
+@st.cache_resource
+def init_background_writer():
+    """Start the shared background writer for non-critical saves"""
+    return BackgroundWriter()
+
+
+@st.cache_resource
+def init_fundamentals_store():
+    """Create the shared local fundamentals store"""
+    return FundamentalsStore(db, collector)
+
+
+@st.cache_resource
+def init_cached_analyzer():
+    """Create the shared indicator cache in front of the analyzer"""
+    return CachedAnalyzer(analyzer, db)
+
+
+@st.cache_resource
+def init_screener():
+    """Create the shared universe screener"""
+    return Screener(db)
+
+
+@st.cache_resource
+def init_job_manager():
+    """Create the job manager shared by every session"""
+    return JobManager()
+
+
+COLLECTION_JOB = 'collect_watchlist'
+
+
+def start_collection_job():
+    """Start watchlist collection in the background (joins a run already in progress)"""
+    watchlist = config.WATCHLIST
+    return init_job_manager().submit(
+        COLLECTION_JOB,
+        lambda job: collector.collect_watchlist(watchlist, progress_callback=job.advance),
+        total=len(watchlist)
+    )
+
+
+def render_job_progress(job):
+    """Show a collection job's progress in the current container"""
+    progress = job.progress()
+    errors = progress['errors']
+
+    if job.running:
+        eta = f" • ~{progress['eta']:.0f}s left" if progress['eta'] is not None else ""
+        st.progress(progress['fraction'],
+                    text=f"Updating stocks: {progress['done']}/{progress['total']}{eta}")
+    elif progress['status'] == 'done':
+        st.success(f"✅ Updated {progress['succeeded']}/{progress['total']} stocks "
+                   f"in {progress['elapsed']:.0f}s")
+    else:
+        st.error(f"❌ Update failed: {progress['error']}")
+
+    if errors:
+        st.caption(f"⚠️ {len(errors)} failed: {', '.join(errors[:5])}"
+                   f"{'...' if len(errors) > 5 else ''}")
+
+
+def display_collection_progress():
+    """Show the latest collection job, polling while it runs"""
+    job = init_job_manager().get(COLLECTION_JOB)
+    if job is None:
+        return
+
+    if job.running and hasattr(st, 'fragment'):
+        # Poll just this block; rerun the whole app once the job finishes
+        @st.fragment(run_every=2)
+        def poll_progress():
+            render_job_progress(job)
+            if not job.running:
+                st.rerun()
+
+        poll_progress()
+    else:
+        render_job_progress(job)
+        if job.running and st.button("🔄 Refresh progress", key="refresh_job_progress"):
+            st.rerun()
+
+
+# Calendar days covered by each time range option
+TIME_RANGE_DAYS = {
+    '1d': 1,
+    '5d': 5,
+    '1mo': 30,
+    '3mo': 90,
+    '6mo': 180,
+    '1y': 365,
+    '2y': 730,
+    '5y': 1825,
+}
+
+
+def get_range_start(time_range):
+    """Get the first date shown for a time range option (None for All)"""
+    days = TIME_RANGE_DAYS.get(time_range)
+    if days is None:
+        return None
+    return datetime.now() - timedelta(days=days)
+
+
 def create_candlestick_chart(df, ticker):
     """Create interactive candlestick chart with indicators"""
     
@@ -498,6 +621,50 @@ def display_news_and_sentiment(ticker):
     return overall_sentiment, sentiment_score
 
 
+def display_screener():
+    """Screen every stored ticker on its latest indicators and signals"""
+    st.subheader("🔎 Stock Screener")
+    st.caption("Filters run over the latest stored values for the whole universe at once.")
+
+    expression = st.text_input(
+        "Filter expression",
+        value="RSI < 30 and SMA_20 > SMA_50",
+        help="Columns: close, price, change_pct, RSI, SMA_20, SMA_50, MACD, MACD_Signal, "
+             "MACD_Histogram, BB_Upper, BB_Middle, BB_Lower, trend, rsi_signal, macd_signal, "
+             "bb_signal, overall. Example: RSI < 30 and overall == 'BUY'"
+    )
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        sort_by = st.selectbox("Rank by", options=['RSI', 'change_pct', 'close', 'MACD_Histogram',
+                                                   'SMA_20', 'SMA_50'])
+    with col2:
+        descending = st.checkbox("Descending", value=False)
+    with col3:
+        limit = st.number_input("Max results", min_value=1, max_value=1000, value=50)
+
+    try:
+        results = init_screener().screen(expression, sort_by=sort_by, ascending=not descending)
+    except ValueError as e:
+        st.error(f"❌ {e}")
+        return
+
+    missing = results.attrs.get('missing_signals', [])
+    if missing:
+        st.warning(f"⚠️ No stored signals for {len(missing)} tickers ({', '.join(missing[:10])}"
+                   + (" ..." if len(missing) > 10 else "") + "); filters on trend, rsi_signal, "
+                   "macd_signal, bb_signal or overall skip them until their indicators are updated.")
+
+    st.write(f"**{len(results)} matches**" + (f" (showing top {int(limit)})" if len(results) > limit else ""))
+    st.dataframe(
+        results[['rank'] + Screener.DISPLAY_COLUMNS].head(int(limit)).round(2),
+        use_container_width=True
+    )
+
+    if results.empty:
+        st.info("💡 Signals are stored as data is collected; run an update if the screener looks empty.")
+
+
 def main():
     """Main dashboard function"""
     
@@ -510,19 +677,27 @@ def main():
     
     # Get available tickers
     available_tickers = db.get_all_tickers()
+    stages.lap('tickers')
     
     if not available_tickers:
         st.warning("⚠️ No data available. Please run data collection first!")
         
         if st.button("🔄 Collect Data Now"):
-            with st.spinner("Collecting data... This may take a minute..."):
-                collector.collect_watchlist()
-                st.success("✅ Data collected! Refreshing...")
-                st.rerun()
+            start_collection_job()
+        
+        # Tickers appear here as soon as the first ones are saved
+        display_collection_progress()
         
         st.info("💡 Or run: `python src/data_collector.py` from terminal")
         return
     
+    # Page selector
+    view = st.sidebar.radio("View", options=["📈 Stock Analysis", "🔎 Screener"], horizontal=True)
+    if view == "🔎 Screener":
+        display_screener()
+        stages.lap('screener')
+        return
+    
     # Stock search and selector
     st.sidebar.subheader("🔍 Stock Search")
 
@@ -601,20 +776,19 @@ def main():
     
     # Update all button
     if st.sidebar.button("🔄 Update All Stocks"):
-        with st.spinner("Updating all stocks..."):
-            collector.collect_watchlist()
-            st.sidebar.success("✅ All stocks updated!")
-            st.rerun()
+        start_collection_job()
+    
+    # Runs in the background; each ticker is committed as it finishes
+    with st.sidebar:
+        display_collection_progress()
     
     st.sidebar.markdown("---")
+    stages.lap('sidebar')
 
-    # Stock info - fetch full info from yfinance for detailed metrics
-    import yfinance as yf
-    stock = yf.Ticker(selected_ticker)
-    try:
-        full_stock_info = stock.info
-    except:
-        full_stock_info = {}
+    # Stock info - full info payload from local storage; missing or stale
+    # entries are refreshed in the background and show up on a later rerun
+    fundamentals = init_fundamentals_store()
+    full_stock_info = fundamentals.get(selected_ticker)
 
     stock_info = db.get_stock_info(selected_ticker)
 
@@ -627,6 +801,8 @@ def main():
     industry = full_stock_info.get('industry') or (stock_info.get('industry') if stock_info else 'N/A')
     st.sidebar.write(f"Sector: {sector}")
     st.sidebar.write(f"Industry: {industry}")
+    if not full_stock_info and fundamentals.is_refreshing(selected_ticker):
+        st.sidebar.caption("⏳ Loading detailed metrics in the background...")
 
     # Enhanced Financial Metrics (collapsible)
 
@@ -939,46 +1115,45 @@ def main():
                 else:
                     st.error(msg)
 
-    # Get stock data
-    df = db.get_stock_data(selected_ticker)
+    stages.lap('company_info')
+
+    # Get stock data with indicators and signals - only the selected range is
+    # read from the database, and only when the cached result is out of date
+    start_date = get_range_start(time_range)
+    
+    def load_stock_data():
+        return db.get_stock_data(
+            selected_ticker,
+            start_date=start_date,
+            columns=['open', 'high', 'low', 'close', 'volume']
+        )
+    
+    def save_indicators(df_with_indicators, signals):
+        # Save indicators and their signals to database (off the render path when enabled)
+        if config.ASYNC_INDICATOR_WRITES:
+            init_background_writer().submit(db.save_indicators, selected_ticker, df_with_indicators,
+                                            signals=signals)
+        else:
+            db.save_indicators(selected_ticker, df_with_indicators, signals=signals)
+    
+    # Indicators over a cut-down range lack their warm-up bars (SMA_50 is NaN
+    # on a 1mo view), so only full-history results are persisted
+    df_with_indicators, signals = init_cached_analyzer().analyze(
+        selected_ticker,
+        load_stock_data,
+        variant=(time_range, start_date.strftime('%Y-%m-%d') if start_date else None),
+        on_compute=save_indicators if start_date is None else None
+    )
     
-    if df.empty:
+    stages.lap('analyze')
+    
+    if df_with_indicators is None:
         st.error(f"No data found for {selected_ticker}")
         return
     
-    # Filter by time range
-    if time_range != 'All':
-        end_date = datetime.now()
-        if time_range == '1d':
-            start_date = end_date - timedelta(days=1)
-        elif time_range == '5d':
-            start_date = end_date - timedelta(days=5)
-        elif time_range == '1mo':
-            start_date = end_date - timedelta(days=30)
-        elif time_range == '3mo':
-            start_date = end_date - timedelta(days=90)
-        elif time_range == '6mo':
-            start_date = end_date - timedelta(days=180)
-        elif time_range == '1y':
-            start_date = end_date - timedelta(days=365)
-        elif time_range == '2y':
-            start_date = end_date - timedelta(days=730)
-        elif time_range == '5y':
-            start_date = end_date - timedelta(days=1825)
-
-        df = df[df.index >= start_date]
-    
-    # Calculate indicators
-    df_with_indicators = analyzer.calculate_all_indicators(df)
-    
-    # Save indicators to database
-    db.save_indicators(selected_ticker, df_with_indicators)
-    
-    # Generate signals
-    signals = analyzer.generate_signals(df_with_indicators)
-    
     # Display metrics
     display_metrics(selected_ticker, df_with_indicators)
+    stages.lap('metrics')
     
     st.markdown("---")
     
@@ -986,6 +1161,7 @@ def main():
     st.subheader(f"📈 {selected_ticker} Chart")
     fig = create_candlestick_chart(df_with_indicators, selected_ticker)
     st.plotly_chart(fig, use_container_width=True)
+    stages.lap('chart')
     
     st.markdown("---")
     
@@ -996,11 +1172,13 @@ def main():
 
     # Display news and sentiment (get sentiment data back)
     news_sentiment, news_score = display_news_and_sentiment(selected_ticker)
+    stages.lap('news')
 
     st.markdown("---")
 
     # Display signal conflicts and analysis
     display_signal_conflicts(signals, news_sentiment, news_score)
+    stages.lap('signals')
 
     st.markdown("---")
 
@@ -1015,7 +1193,44 @@ def main():
     st.markdown("---")
     st.caption(f"Last updated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     st.caption("⚠️ This tool is for educational purposes only. Not financial advice.")
+    stages.lap('raw_data')
+
+
+def display_timing_panel():
+    """Where this rerun's time went, plus process-wide timers (opt-in from the sidebar)"""
+    total = stages.elapsed()
+    metrics.observe('dashboard_rerun_seconds', total)
+    metrics.write_metrics('dashboard')
+
+    st.sidebar.markdown("---")
+    if not st.sidebar.checkbox("⏱️ Show render timings", value=config.DASHBOARD_TIMINGS, key='show_timings'):
+        return
+
+    with st.expander(f"⏱️ Render timings: {total * 1000:.0f} ms this rerun", expanded=True):
+        rerun = pd.DataFrame(stages.stages, columns=['Stage', 'Seconds'])
+        rerun['ms'] = rerun['Seconds'] * 1000
+        rerun['Share'] = rerun['Seconds'] / total * 100 if total else 0.0
+        st.dataframe(rerun[['Stage', 'ms', 'Share']].round(1), use_container_width=True, hide_index=True)
+
+        cache = init_cached_analyzer().cache.stats()
+        st.caption(f"Indicator cache: {cache['hit_rate']:.0%} hit rate "
+                   f"({cache['hits'] + cache['disk_hits']} hits, {cache['misses']} misses, "
+                   f"{cache['entries']} entries)")
+
+        # Cumulative since the server started, across every session
+        timers = pd.DataFrame(metrics.REGISTRY.snapshot()['timers'])
+        if not timers.empty:
+            timers['labels'] = [' '.join(f"{k}={v}" for k, v in labels.items()) for labels in timers['labels']]
+            timers['mean_ms'] = timers['mean'] * 1000
+            timers['max_ms'] = timers['max'] * 1000
+            timers = timers.sort_values('sum', ascending=False)
+            st.write("**Process totals since start**")
+            st.dataframe(
+                timers[['name', 'labels', 'count', 'sum', 'mean_ms', 'max_ms']].round(3),
+                use_container_width=True, hide_index=True
+            )
 
 
 if __name__ == '__main__':
     main()
+    display_timing_panel()
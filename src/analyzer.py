@@ -11,11 +11,21 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 import config
+from src import metrics
 
 
 class TechnicalAnalyzer:
     """Calculate technical indicators and identify trading signals"""
     
+    # Categories returned by generate_signal_series(); array codes index into these
+    SIGNAL_LABELS = {
+        'trend': ('Unknown', 'Strong Uptrend', 'Uptrend', 'Sideways', 'Downtrend', 'Strong Downtrend'),
+        'rsi_signal': ('Unknown', 'Overbought', 'Oversold', 'Bullish', 'Bearish'),
+        'macd_signal': ('Unknown', 'Bullish', 'Bearish'),
+        'bb_signal': ('Unknown', 'Overbought', 'Oversold', 'Neutral'),
+        'overall': ('HOLD', 'BUY', 'SELL'),
+    }
+    
     def __init__(self):
         """Initialize analyzer with configuration"""
         self.short_window = config.SHORT_WINDOW
@@ -27,6 +37,19 @@ class TechnicalAnalyzer:
         self.bb_period = config.BOLLINGER_PERIOD
         self.bb_std = config.BOLLINGER_STD
     
+    def get_params(self):
+        """Get the indicator parameters as a dict"""
+        return {
+            'short_window': self.short_window,
+            'long_window': self.long_window,
+            'rsi_period': self.rsi_period,
+            'macd_fast': self.macd_fast,
+            'macd_slow': self.macd_slow,
+            'macd_signal': self.macd_signal,
+            'bb_period': self.bb_period,
+            'bb_std': self.bb_std,
+        }
+    
     def calculate_sma(self, df, window):
         """Calculate Simple Moving Average"""
         close_col = 'Close' if 'Close' in df.columns else 'close'
@@ -92,6 +115,7 @@ class TechnicalAnalyzer:
         
         return upper, middle, lower
     
+    @metrics.timed('indicator_seconds', step='calculate_all_indicators')
     def calculate_all_indicators(self, df):
         """Calculate all technical indicators"""
         if df is None or df.empty:
@@ -196,6 +220,7 @@ class TechnicalAnalyzer:
         else:
             return 'Neutral'
     
+    @metrics.timed('indicator_seconds', step='generate_signals')
     def generate_signals(self, df):
         """Generate comprehensive trading signals"""
         if df is None or df.empty:
@@ -254,6 +279,107 @@ class TechnicalAnalyzer:
         
         return signals
     
+    def _signal_codes(self, close, sma_20, sma_50, rsi, macd, macd_signal, bb_upper, bb_lower):
+        """Same rules as generate_signals(), applied elementwise to aligned arrays"""
+        labels = self.SIGNAL_LABELS
+
+        def select(name, rules, default):
+            # Apply rules last to first so the earliest true one wins, like the
+            # if/elif chains above (cheaper than np.select on large panels)
+            codes = np.full(np.shape(close), labels[name].index(default), dtype=np.int8)
+            for condition, label in reversed(rules):
+                codes[condition] = labels[name].index(label)
+            return codes
+
+        def votes(name, values, choices, weight=1):
+            # Lookup table from category code to votes, instead of np.isin
+            table = np.array([weight if label in choices else 0 for label in labels[name]], dtype=np.int8)
+            return table.take(values)
+
+        with np.errstate(invalid='ignore'):
+            signals = {
+                'trend': select('trend', [
+                    (np.isnan(sma_20) | np.isnan(sma_50), 'Unknown'),
+                    ((sma_20 > sma_50) & (close > sma_20), 'Strong Uptrend'),
+                    (sma_20 > sma_50, 'Uptrend'),
+                    ((sma_20 < sma_50) & (close < sma_20), 'Strong Downtrend'),
+                    (sma_20 < sma_50, 'Downtrend'),
+                ], 'Sideways'),
+                'rsi_signal': select('rsi_signal', [
+                    (np.isnan(rsi), 'Unknown'),
+                    (rsi >= config.RSI_OVERBOUGHT, 'Overbought'),
+                    (rsi <= config.RSI_OVERSOLD, 'Oversold'),
+                    (rsi > 50, 'Bullish'),
+                ], 'Bearish'),
+                'macd_signal': select('macd_signal', [
+                    (np.isnan(macd) | np.isnan(macd_signal), 'Unknown'),
+                    (macd > macd_signal, 'Bullish'),
+                ], 'Bearish'),
+                'bb_signal': select('bb_signal', [
+                    (np.isnan(bb_upper) | np.isnan(bb_lower), 'Unknown'),
+                    (close >= bb_upper, 'Overbought'),
+                    (close <= bb_lower, 'Oversold'),
+                ], 'Neutral'),
+            }
+
+        # Trend counts double; each other component counts once
+        bullish = (votes('trend', signals['trend'], ['Strong Uptrend', 'Uptrend'], 2)
+                   + votes('rsi_signal', signals['rsi_signal'], ['Bullish', 'Oversold'])
+                   + votes('macd_signal', signals['macd_signal'], ['Bullish'])
+                   + votes('bb_signal', signals['bb_signal'], ['Oversold']))
+        bearish = (votes('trend', signals['trend'], ['Strong Downtrend', 'Downtrend'], 2)
+                   + votes('rsi_signal', signals['rsi_signal'], ['Bearish', 'Overbought'])
+                   + votes('macd_signal', signals['macd_signal'], ['Bearish'])
+                   + votes('bb_signal', signals['bb_signal'], ['Overbought']))
+
+        signals['bullish_count'] = bullish
+        signals['bearish_count'] = bearish
+        signals['overall'] = select('overall', [
+            (bullish > bearish + 1, 'BUY'),
+            (bearish > bullish + 1, 'SELL'),
+        ], 'HOLD')
+
+        return signals
+
+    @metrics.timed('indicator_seconds', step='generate_signal_series')
+    def generate_signal_series(self, df, indicators=None):
+        """Generate the generate_signals() verdict for every bar at once
+
+        Pass a DataFrame from calculate_all_indicators() to get a DataFrame of
+        categorical signal columns plus bullish/bearish counts on the same index.
+        Pass a close array or PricePanel together with the {column: array}
+        indicators from BatchIndicatorEngine.calculate_all_indicators() to get
+        {name: int8 array} of the same shape, where signal codes index into
+        SIGNAL_LABELS[name].
+        """
+        names = ['SMA_20', 'SMA_50', 'RSI', 'MACD', 'MACD_Signal', 'BB_Upper', 'BB_Lower']
+
+        if indicators is None:
+            if df is None or df.empty:
+                return pd.DataFrame()
+
+            close_col = 'Close' if 'Close' in df.columns else 'close'
+            nan = np.full(len(df), np.nan)
+
+            # A missing indicator column yields 'Unknown', as in the single-bar methods
+            def column(name):
+                return df[name].to_numpy(dtype=float) if name in df.columns else nan
+
+            codes = self._signal_codes(column(close_col), *(column(name) for name in names))
+
+            result = pd.DataFrame(index=df.index)
+            for name, values in codes.items():
+                if name in self.SIGNAL_LABELS:
+                    result[name] = pd.Categorical.from_codes(values, self.SIGNAL_LABELS[name])
+                else:
+                    result[name] = values
+            return result
+
+        # Batch indicators are always 2D, even for a single ticker's closes
+        close = np.asarray(df if isinstance(df, np.ndarray) else df['close'], dtype=float)
+        arrays = [np.asarray(indicators[name], dtype=float) for name in names]
+        return self._signal_codes(close.reshape(arrays[0].shape), *arrays)
+
     def get_support_resistance(self, df, window=20):
         """Identify support and resistance levels"""
         if df is None or df.empty:
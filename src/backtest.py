@@ -0,0 +1,262 @@
+"""
+Backtest Module - Vectorized replay of the BUY/SELL/HOLD signals over a dates x tickers panel
+"""
+
+import argparse
+import sys
+import os
+
+import numpy as np
+import pandas as pd
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config
+from src.analyzer import TechnicalAnalyzer
+from src.batch_indicators import BatchIndicatorEngine
+from src.database import StockDatabase
+
+TRADING_DAYS = 252
+
+
+def ffill(values):
+    """Carry the last non-NaN value down each column (leading NaNs stay NaN)"""
+    valid = ~np.isnan(values)
+    index = np.where(valid, np.arange(len(values))[:, None], 0)
+    np.maximum.accumulate(index, axis=0, out=index)
+    return np.take_along_axis(values, index, axis=0)
+
+
+def lag(values, fill=0.0):
+    """Shift rows down by one bar"""
+    out = np.empty_like(values)
+    out[:1] = fill
+    out[1:] = values[:-1]
+    return out
+
+
+def trade_returns(returns, positions, cost=0.0):
+    """Compounded return of every trade, plus the column each trade belongs to
+
+    A trade is a run of bars with the same non-zero position. Leaving it is
+    paid on the bar after the run, so that cost is charged to the trade
+    rather than to the flat bar or the opposite trade that follows.
+    """
+    held = positions != 0
+    changed = positions != lag(positions)
+    starts = held & changed
+    exit_cost = np.abs(lag(positions)) * changed * cost
+
+    # Walk column by column so a trade never spans two tickers
+    ids = np.cumsum(starts.T.ravel()) - 1
+    held_flat = held.T.ravel()
+    with np.errstate(divide='ignore'):
+        log_returns = np.log1p((returns + exit_cost).T.ravel())
+        exit_log = np.log1p(-exit_cost.T.ravel())
+
+    # An exit on bar t closes the trade that was held through bar t - 1
+    exits = np.flatnonzero(exit_cost.T.ravel())
+
+    count = int(starts.sum())
+    pnl = np.bincount(ids[held_flat], weights=log_returns[held_flat], minlength=count)
+    pnl += np.bincount(ids[exits - 1], weights=exit_log[exits], minlength=count)
+    columns = np.repeat(np.arange(returns.shape[1]), starts.sum(axis=0))
+    return np.expm1(pnl[:count]), columns
+
+
+def performance(returns, mask, positions):
+    """Return, risk and trading statistics for each column of a returns array"""
+    bars = mask.sum(axis=0)
+    years = bars / TRADING_DAYS
+
+    observed = np.where(mask, returns, np.nan)
+    changes = np.abs(np.diff(positions, axis=0, prepend=0.0))
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        log_equity = np.cumsum(np.log1p(returns), axis=0)
+        equity = np.exp(log_equity)
+        # Drawdowns are measured from the starting capital too
+        peak = np.maximum(np.maximum.accumulate(equity, axis=0), 1.0)
+
+        total = np.expm1(log_equity[-1])
+        mean = np.nanmean(observed, axis=0)
+        std = np.nanstd(observed, axis=0, ddof=1)
+
+        return {
+            'total_return': total,
+            'annual_return': np.where(years > 0, (1 + total) ** (1 / years) - 1, np.nan),
+            'volatility': std * np.sqrt(TRADING_DAYS),
+            'sharpe': mean / std * np.sqrt(TRADING_DAYS),
+            'max_drawdown': (equity / peak - 1).min(axis=0),
+            'turnover': np.where(years > 0, changes.sum(axis=0) / years, np.nan),
+            'exposure': np.where(bars > 0, ((positions != 0) & mask).sum(axis=0) / bars, np.nan),
+            'bars': bars,
+        }
+
+
+def ticker_statistics(returns, mask, positions, cost=0.0):
+    """performance() plus the number of trades and the share of winning trades per column"""
+    stats = performance(returns, mask, positions)
+
+    pnl, columns = trade_returns(returns, positions, cost)
+    trades = np.bincount(columns, minlength=returns.shape[1])
+    wins = np.bincount(columns, weights=pnl > 0, minlength=returns.shape[1])
+    with np.errstate(divide='ignore', invalid='ignore'):
+        stats['trades'] = trades
+        stats['hit_rate'] = wins / trades
+
+    return stats
+
+
+def target_positions(overall, allow_short=False):
+    """Target position after each bar from overall signal codes"""
+    labels = TechnicalAnalyzer.SIGNAL_LABELS['overall']
+
+    target = np.full(overall.shape, np.nan)
+    target[overall == labels.index('BUY')] = 1.0
+    target[overall == labels.index('SELL')] = -1.0 if allow_short else 0.0
+
+    # HOLD keeps the previous position; flat until the first BUY/SELL
+    return np.nan_to_num(ffill(target))
+
+
+def simulate(close, overall, cost, allow_short=False, first=0):
+    """Trade overall signal codes on a close array from row `first` on
+
+    Returns the forward-filled closes, the position held over each bar and
+    the strategy return of each bar after costs.
+    """
+    positions = target_positions(overall, allow_short)
+    close = ffill(close)[first:]
+
+    # Position taken at bar t's close is held over bar t + 1
+    held = lag(positions[first:])
+    with np.errstate(divide='ignore', invalid='ignore'):
+        bar_returns = np.nan_to_num(close / lag(close, np.nan) - 1)
+
+    costs = np.abs(np.diff(held, axis=0, prepend=0.0)) * cost
+    # A position can lose at most its whole stake on one bar
+    returns = np.maximum(held * bar_returns - costs, -1.0)
+
+    return close, held, returns
+
+
+class Backtester:
+    """Replay generate_signals() bar by bar for many tickers at once
+
+    BUY goes long and SELL exits (or goes short with allow_short); HOLD keeps
+    the current position. A signal computed on a bar's close is traded at that
+    close, so it earns from the next bar on. Every change in position pays
+    commission plus slippage as a fraction of the traded notional.
+    """
+
+    def __init__(self, db=None, analyzer=None, commission=None, slippage=None, allow_short=None):
+        """Initialize backtester with costs and signal parameters"""
+        self.db = db or StockDatabase(config.DATABASE_PATH)
+        self.analyzer = analyzer or TechnicalAnalyzer()
+        self.engine = BatchIndicatorEngine(self.analyzer)
+        self.commission = config.BACKTEST_COMMISSION if commission is None else commission
+        self.slippage = config.BACKTEST_SLIPPAGE if slippage is None else slippage
+        self.allow_short = config.BACKTEST_ALLOW_SHORT if allow_short is None else allow_short
+
+    def run(self, tickers=None, start_date=None, end_date=None):
+        """Backtest stored tickers (default: all) over [start_date, end_date]"""
+        # Bars before start_date are still loaded so indicators are warmed up
+        panel = self.db.get_price_panel(tickers, end_date=end_date, fields=['close'])
+        return self.run_panel(panel, start_date)
+
+    def run_panel(self, panel, start_date=None):
+        """Backtest every ticker in a PricePanel (None if it has no bars to trade)"""
+        close = panel['close']
+        indicators = self.engine.calculate_all_indicators(close)
+        signals = self.analyzer.generate_signal_series(close, indicators)
+
+        first = 0
+        if start_date:
+            first = np.searchsorted(panel.dates, np.datetime64(pd.Timestamp(start_date).date(), 'D'))
+
+        dates = panel.dates[first:]
+        if not len(dates):
+            return None
+
+        mask = panel.mask[first:]
+        close, held, returns = simulate(close, signals['overall'], self.commission + self.slippage,
+                                        self.allow_short, first)
+        return self._report(panel.tickers, dates, mask, close, held, returns)
+
+    def _report(self, tickers, dates, mask, close, held, returns):
+        """Per-ticker and equal-weight portfolio statistics"""
+        summary = ticker_statistics(returns, mask, held, self.commission + self.slippage)
+
+        first_close = close[mask.argmax(axis=0), np.arange(len(tickers))]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            summary['buy_hold_return'] = np.where(mask.any(axis=0), close[-1] / first_close - 1, np.nan)
+
+        summary = pd.DataFrame(summary, index=pd.Index(tickers, name='ticker'))
+
+        # Equal weight across the tickers that traded on each date
+        active = mask.sum(axis=1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            portfolio_returns = np.where(active > 0, np.where(mask, returns, 0).sum(axis=1) / active, 0.0)
+            portfolio_held = np.where(active > 0, np.where(mask, held, 0).sum(axis=1) / active, 0.0)
+
+        portfolio = {name: values[0] for name, values in performance(
+            portfolio_returns[:, None], (active > 0)[:, None], portfolio_held[:, None]).items()}
+        portfolio['exposure'] = portfolio_held[active > 0].mean() if active.any() else np.nan
+        trades = summary['trades'].sum()
+        portfolio['trades'] = int(trades)
+        portfolio['hit_rate'] = (summary['hit_rate'] * summary['trades']).sum() / trades if trades else np.nan
+
+        index = pd.DatetimeIndex(dates, name='date')
+        return {
+            'summary': summary,
+            'portfolio': portfolio,
+            'equity': pd.Series(np.cumprod(1 + portfolio_returns), index=index, name='equity'),
+            'returns': pd.DataFrame(returns, index=index, columns=tickers),
+            'positions': pd.DataFrame(held, index=index, columns=tickers),
+        }
+
+
+def main():
+    """Run a backtest from the command line"""
+    parser = argparse.ArgumentParser(description="Backtest the built-in BUY/SELL/HOLD signals")
+    parser.add_argument('--tickers', nargs='+', help="tickers to backtest (default: all stored)")
+    parser.add_argument('--start', help="first date to trade (YYYY-MM-DD)")
+    parser.add_argument('--end', help="last date to trade (YYYY-MM-DD)")
+    parser.add_argument('--commission', type=float, help="fraction of traded notional per trade")
+    parser.add_argument('--slippage', type=float, help="fraction of traded notional per trade")
+    parser.add_argument('--short', action='store_true', help="go short on SELL instead of exiting")
+    args = parser.parse_args()
+
+    backtester = Backtester(commission=args.commission, slippage=args.slippage,
+                            allow_short=args.short or None)
+    result = backtester.run(args.tickers, args.start, args.end)
+    if result is None:
+        print("\n❌ No stored bars in the requested range")
+        print("💡 Run: python src/data_collector.py\n")
+        return
+
+    summary, portfolio = result['summary'], result['portfolio']
+
+    print(f"\n{'='*60}")
+    print(f"📊 BACKTEST: {len(summary)} tickers, {len(result['equity'])} bars")
+    print(f"{'='*60}")
+    print(f"Total return:   {portfolio['total_return']:.2%}")
+    print(f"Annual return:  {portfolio['annual_return']:.2%}")
+    print(f"Sharpe ratio:   {portfolio['sharpe']:.2f}")
+    print(f"Max drawdown:   {portfolio['max_drawdown']:.2%}")
+    print(f"Hit rate:       {portfolio['hit_rate']:.2%} of {portfolio['trades']} trades")
+    print(f"Turnover:       {portfolio['turnover']:.1f}x per year")
+
+    if len(summary) > 1:
+        columns = ['total_return', 'buy_hold_return', 'max_drawdown', 'hit_rate', 'trades', 'turnover']
+        ranked = summary.sort_values('total_return', ascending=False)[columns]
+        with pd.option_context('display.width', 200, 'display.max_columns', None):
+            print(f"\n🏆 Best:\n{ranked.head(5).round(3).to_string()}")
+            print(f"\n📉 Worst:\n{ranked.tail(5).round(3).to_string()}")
+    print()
+
+
+if __name__ == '__main__':
+    main()
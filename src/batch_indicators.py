@@ -0,0 +1,207 @@
+"""
+Batch Indicator Module - Vectorized technical indicators over a dates x tickers panel
+"""
+
+import numpy as np
+import sys
+import os
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.analyzer import TechnicalAnalyzer
+from src.panel import PricePanel
+
+
+def compact(values):
+    """Move each column's valid values to the top, keeping their order
+
+    Each ticker's bars then sit in consecutive rows, exactly as in its own
+    DataFrame, so the kernels below match the per-ticker pandas results.
+    """
+    order = np.argsort(np.isnan(values), axis=0, kind='stable')
+    return np.take_along_axis(values, order, axis=0), order
+
+
+def expand(compacted, order, valid):
+    """Undo compact(), leaving NaN wherever the original had no value"""
+    if order is None:
+        return compacted
+
+    out = np.empty_like(compacted)
+    np.put_along_axis(out, order, compacted, axis=0)
+    out[~valid] = np.nan
+    return out
+
+
+def rolling_sum(values, window):
+    """Sum over the trailing window via cumulative sums
+
+    Expects compacted columns: a NaN propagates through the running sum,
+    which only ever blanks out the trailing rows that expand() masks anyway.
+    """
+    out = np.full(values.shape, np.nan)
+    if len(values) < window:
+        return out
+
+    csum = np.cumsum(values, axis=0)
+    out[window - 1] = csum[window - 1]
+    np.subtract(csum[window:], csum[:-window], out=out[window:])
+    return out
+
+
+def rolling_mean(values, window):
+    """Simple moving average along the time axis"""
+    # Centering on each column's first value keeps the running sums small
+    offset = np.nan_to_num(values[:1])
+    return rolling_sum(values - offset, window) / window + offset
+
+
+def rolling_std(values, window):
+    """Rolling sample standard deviation (ddof=1) along the time axis"""
+    offset = np.nan_to_num(values[:1])
+    shifted = values - offset
+    sums = rolling_sum(shifted, window)
+    squares = rolling_sum(shifted * shifted, window)
+
+    variance = (squares - sums * sums / window) / (window - 1)
+    return np.sqrt(np.maximum(variance, 0.0))
+
+
+def ema(values, span):
+    """Exponential moving average (adjust=False) computed recursively over time"""
+    # Compacted columns have no leading NaNs, so the recursion can run
+    # unguarded; trailing NaNs only propagate into rows that are masked out
+    alpha = 2.0 / (span + 1.0)
+    decay = 1.0 - alpha
+    weighted = alpha * values
+
+    out = np.empty(values.shape)
+    if len(values) == 0:
+        return out
+
+    out[0] = values[0]
+    for t in range(1, len(values)):
+        np.multiply(out[t - 1], decay, out=out[t])
+        out[t] += weighted[t]
+    return out
+
+
+def rsi(values, period):
+    """Relative Strength Index from rolling average gains and losses"""
+    delta = np.zeros(values.shape)
+    delta[1:] = values[1:] - values[:-1]
+
+    # Like the pandas path, the first bar counts as a zero change
+    gains = np.where(delta > 0, delta, 0.0)
+    losses = np.where(delta < 0, -delta, 0.0)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rs = rolling_mean(gains, period) / rolling_mean(losses, period)
+        return 100 - (100 / (1 + rs))
+
+
+class BatchIndicatorEngine:
+    """Calculate technical indicators for every ticker in a panel at once"""
+
+    def __init__(self, analyzer=None):
+        """Initialize engine with the same parameters as a TechnicalAnalyzer"""
+        analyzer = analyzer or TechnicalAnalyzer()
+
+        self.short_window = analyzer.short_window
+        self.long_window = analyzer.long_window
+        self.rsi_period = analyzer.rsi_period
+        self.macd_fast = analyzer.macd_fast
+        self.macd_slow = analyzer.macd_slow
+        self.macd_signal = analyzer.macd_signal
+        self.bb_period = analyzer.bb_period
+        self.bb_std = analyzer.bb_std
+
+    def _prepare(self, data):
+        """Get a compacted close array plus what is needed to expand results"""
+        if isinstance(data, PricePanel):
+            close = data['close']
+        else:
+            close = np.asarray(data, dtype=float)
+
+        if close.ndim == 1:
+            close = close[:, None]
+
+        valid = ~np.isnan(close)
+        if valid.all():
+            return close, None, valid
+
+        compacted, order = compact(close)
+        return compacted, order, valid
+
+    def calculate_sma(self, data, window):
+        """Calculate Simple Moving Average for every ticker"""
+        close, order, valid = self._prepare(data)
+        return expand(rolling_mean(close, window), order, valid)
+
+    def calculate_ema(self, data, window):
+        """Calculate Exponential Moving Average for every ticker"""
+        close, order, valid = self._prepare(data)
+        return expand(ema(close, window), order, valid)
+
+    def calculate_rsi(self, data, period=None):
+        """Calculate Relative Strength Index for every ticker"""
+        close, order, valid = self._prepare(data)
+        return expand(rsi(close, period or self.rsi_period), order, valid)
+
+    def calculate_macd(self, data):
+        """Calculate MACD line, signal and histogram for every ticker"""
+        close, order, valid = self._prepare(data)
+        macd, signal, histogram = self._macd(close)
+        return (expand(macd, order, valid), expand(signal, order, valid),
+                expand(histogram, order, valid))
+
+    def calculate_bollinger_bands(self, data):
+        """Calculate Bollinger Bands for every ticker"""
+        close, order, valid = self._prepare(data)
+        upper, middle, lower = self._bollinger(close)
+        return (expand(upper, order, valid), expand(middle, order, valid),
+                expand(lower, order, valid))
+
+    def _macd(self, close):
+        """MACD on a compacted close array"""
+        macd = ema(close, self.macd_fast) - ema(close, self.macd_slow)
+        signal = ema(macd, self.macd_signal)
+        return macd, signal, macd - signal
+
+    def _bollinger(self, close):
+        """Bollinger Bands on a compacted close array"""
+        middle = rolling_mean(close, self.bb_period)
+        std = rolling_std(close, self.bb_period)
+        return middle + std * self.bb_std, middle, middle - std * self.bb_std
+
+    def calculate_all_indicators(self, data):
+        """Calculate all indicators as {column name: dates x tickers array}"""
+        close, order, valid = self._prepare(data)
+
+        macd, signal, histogram = self._macd(close)
+        upper, middle, lower = self._bollinger(close)
+
+        results = {
+            'SMA_20': rolling_mean(close, self.short_window),
+            'SMA_50': rolling_mean(close, self.long_window),
+            'RSI': rsi(close, self.rsi_period),
+            'MACD': macd,
+            'MACD_Signal': signal,
+            'MACD_Histogram': histogram,
+            'BB_Upper': upper,
+            'BB_Middle': middle,
+            'BB_Lower': lower,
+        }
+
+        return {name: expand(values, order, valid) for name, values in results.items()}
+
+    def ticker_frame(self, panel, results, ticker):
+        """Get one ticker's bars and indicators as a DataFrame like TechnicalAnalyzer returns"""
+        i = panel.ticker_index[ticker]
+        present = panel.mask[:, i]
+
+        df = panel.to_frame(ticker)
+        for name, values in results.items():
+            df[name] = values[present, i]
+        return df
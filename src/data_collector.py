@@ -1,41 +1,59 @@
 """
-Data Collector Module - Fetches stock data from Yahoo Finance
+Data Collector Module - Fetches stock data from Yahoo Finance (or another data provider)
 """
 
-import yfinance as yf
 import pandas as pd
-from datetime import datetime, timedelta
 import time
 import sys
 import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 # Add parent directory to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 import config
+from src import metrics
+from src.analyzer import TechnicalAnalyzer
 from src.database import StockDatabase
+from src.market_calendar import TradingCalendar
+from src.providers import get_provider
+from src.rate_limiter import TokenBucket
+from src.streaming_indicators import IndicatorState
+
+log = metrics.get_logger('collector')
 
 
 class DataCollector:
     """Handles fetching stock data from Yahoo Finance"""
     
-    def __init__(self, db_path=None):
+    def __init__(self, db_path=None, provider=None):
         """Initialize data collector"""
         db_path = db_path or config.DATABASE_PATH
         self.db = StockDatabase(db_path)
+        self.provider = provider or get_provider()
         self.period = config.DATA_PERIOD
         self.interval = config.DATA_INTERVAL
+        self.analyzer = TechnicalAnalyzer()
+        
+        # Shared limiters - every worker draws from the same buckets
+        self.history_limiter = TokenBucket(config.HISTORY_RATE_LIMIT, config.HISTORY_BURST)
+        self.info_limiter = TokenBucket(config.INFO_RATE_LIMIT, config.INFO_BURST)
+        self.calendar = TradingCalendar()
     
-    def fetch_stock_data(self, ticker, period=None, interval=None):
+    def fetch_stock_data(self, ticker, period=None, interval=None, start=None):
         """Fetch historical stock data from Yahoo Finance"""
         period = period or self.period
         interval = interval or self.interval
         
         try:
-            print(f"📥 Fetching data for {ticker}...")
+            if start:
+                print(f"📥 Fetching data for {ticker} since {start}...")
+            else:
+                print(f"📥 Fetching data for {ticker}...")
             
-            stock = yf.Ticker(ticker)
-            df = stock.history(period=period, interval=interval)
+            metrics.observe('rate_limit_wait_seconds', self.history_limiter.acquire(), limiter='history')
+            with metrics.timer('fetch_seconds', endpoint='history', provider=self.provider.name):
+                df = self.provider.history(ticker, period=period, interval=interval, start=start)
             
             if df.empty:
                 print(f"⚠️  No data found for {ticker}")
@@ -46,13 +64,128 @@ class DataCollector:
             
         except Exception as e:
             print(f"❌ Error fetching {ticker}: {e}")
+            metrics.inc('fetch_errors_total', endpoint='history', provider=self.provider.name)
+            log.error("Error fetching %s: %s", ticker, e)
+            return None
+    
+    def fetch_batch_data(self, tickers, period=None, interval=None, start=None, group_size=None):
+        """Fetch historical data for many tickers with one request per group"""
+        period = period or self.period
+        interval = interval or self.interval
+        group_size = group_size or config.BATCH_GROUP_SIZE
+        
+        frames = {}
+        failed = []
+        
+        for i in range(0, len(tickers), group_size):
+            group = list(tickers[i:i + group_size])
+            print(f"📥 Fetching batch of {len(group)} tickers ({group[0]} .. {group[-1]})...")
+            
+            try:
+                metrics.observe('rate_limit_wait_seconds', self.history_limiter.acquire(), limiter='history')
+                with metrics.timer('fetch_seconds', endpoint='download', provider=self.provider.name):
+                    wide = self.provider.download(group, period=period, interval=interval, start=start)
+            except Exception as e:
+                print(f"❌ Error fetching batch: {e}")
+                metrics.inc('fetch_errors_total', endpoint='download', provider=self.provider.name)
+                log.error("Error fetching batch %s .. %s: %s", group[0], group[-1], e)
+                wide = None
+            
+            for ticker in group:
+                df = self._split_batch_frame(wide, ticker, len(group))
+                if df is None:
+                    failed.append(ticker)
+                else:
+                    frames[ticker] = df
+        
+        print(f"✅ Fetched {len(frames)}/{len(tickers)} tickers in batches")
+        
+        # Fall back to the single-ticker path for anything the batch missed
+        for ticker in failed:
+            df = self.fetch_stock_data(ticker, period=period, interval=interval, start=start)
+            if df is not None:
+                frames[ticker] = df
+        
+        return frames
+    
+    def _split_batch_frame(self, wide, ticker, group_len):
+        """Extract one ticker's frame from a multi-ticker download"""
+        if wide is None or wide.empty:
+            return None
+        
+        if isinstance(wide.columns, pd.MultiIndex):
+            if ticker not in wide.columns.get_level_values(0):
+                return None
+            df = wide[ticker].copy()
+        elif group_len == 1:
+            df = wide.copy()
+        else:
+            return None
+        
+        df.columns.name = None
+        if 'Close' not in df.columns:
+            return None
+        
+        # Rows are aligned across the group; drop dates this ticker didn't trade
+        price_columns = [c for c in ('Open', 'High', 'Low', 'Close') if c in df.columns]
+        df = df.dropna(how='all', subset=price_columns)
+        
+        return df if not df.empty else None
+    
+    def fetch_incremental_data(self, ticker, interval=None):
+        """Fetch only bars after the last stored date, refetching in full when needed"""
+        recent = self.db.get_recent_bars(ticker, config.INCREMENTAL_OVERLAP_BARS)
+        
+        if recent.empty:
+            return self.fetch_stock_data(ticker, interval=interval)
+        
+        # Start at the oldest overlap bar so revisions to stored bars are seen
+        start = recent.index[0].strftime('%Y-%m-%d')
+        df = self.fetch_stock_data(ticker, interval=interval, start=start)
+        
+        if df is None:
             return None
+        
+        if self.needs_full_refetch(df, recent):
+            print(f"🔁 Adjusted history changed for {ticker}, refetching full period...")
+            return self.fetch_stock_data(ticker, interval=interval)
+        
+        return df
+    
+    def needs_full_refetch(self, df, recent):
+        """Check whether a delta download invalidates previously stored history"""
+        fetched_dates = df.index.strftime('%Y-%m-%d')
+        stored_dates = recent.index.strftime('%Y-%m-%d')
+        last_stored = stored_dates[-1]
+        
+        # A new split or dividend re-adjusts every earlier bar
+        new_bars = df[fetched_dates > last_stored]
+        for column in ('Dividends', 'Stock Splits'):
+            if column in new_bars.columns and (new_bars[column].fillna(0) != 0).any():
+                return True
+        
+        # Overlapping bars that no longer match mean the upstream revised history.
+        # The last stored bar may have been saved mid-session, so its close
+        # moving is just trading, not a revision
+        fetched_close = pd.Series(df['Close'].values, index=fetched_dates)
+        stored_close = pd.Series(recent['close'].values[:-1], index=stored_dates[:-1])
+        common = stored_close.index.intersection(fetched_close.index)
+        
+        if len(common) == 0:
+            return False
+        
+        stored = stored_close.loc[common]
+        fetched = fetched_close.loc[common]
+        change = ((fetched - stored).abs() / stored.abs()).fillna(0)
+        
+        return bool((change > config.REVISION_TOLERANCE).any())
     
     def fetch_stock_info(self, ticker):
         """Fetch company information for a stock"""
         try:
-            stock = yf.Ticker(ticker)
-            info = stock.info
+            metrics.observe('rate_limit_wait_seconds', self.info_limiter.acquire(), limiter='info')
+            with metrics.timer('fetch_seconds', endpoint='info', provider=self.provider.name):
+                info = self.provider.info(ticker)
             
             if info:
                 print(f"✅ Fetched info for {ticker}")
@@ -62,68 +195,273 @@ class DataCollector:
             
         except Exception as e:
             print(f"⚠️  Error fetching info for {ticker}: {e}")
+            metrics.inc('fetch_errors_total', endpoint='info', provider=self.provider.name)
+            log.warning("Error fetching info for %s: %s", ticker, e)
             return None
     
-    def collect_watchlist(self, watchlist=None, save_to_db=True):
-        """Collect data for all stocks in watchlist"""
+    def collect_watchlist(self, watchlist=None, save_to_db=True, mode=None, max_workers=None,
+                          incremental=None, progress_callback=None):
+        """Collect data for all stocks in watchlist
+
+        progress_callback(ticker, result) is called as each ticker finishes,
+        after its data has been committed.
+        """
         watchlist = watchlist or config.WATCHLIST
+        mode = mode or config.COLLECTION_MODE
+        if incremental is None:
+            incremental = config.INCREMENTAL_UPDATES
         
         print(f"\n{'='*60}")
         print(f"📊 COLLECTING DATA FOR {len(watchlist)} STOCKS")
         print(f"{'='*60}\n")
         
+        # Company info changes slowly, so only refetch entries past their TTL
+        fetched = self.db.get_fundamentals_times(watchlist)
+        now = time.time()
+        stale_info = {t for t in watchlist if now - fetched.get(t, 0) > config.FUNDAMENTALS_TTL}
+        print(f"ℹ️  Company info: {len(stale_info)} stale, {len(watchlist) - len(stale_info)} fresh")
+        
+        started = time.perf_counter()
+        
+        if mode == 'concurrent':
+            results = self._collect_concurrent(watchlist, save_to_db, max_workers, incremental,
+                                               stale_info, progress_callback=progress_callback)
+        elif mode == 'batch':
+            results = self._collect_batch(watchlist, save_to_db, max_workers, incremental, stale_info,
+                                          progress_callback=progress_callback)
+        elif mode == 'serial':
+            results = self._collect_serial(watchlist, save_to_db, incremental, stale_info,
+                                           progress_callback=progress_callback)
+        else:
+            raise ValueError(f"Unknown collection mode: {mode}")
+        
+        elapsed = time.perf_counter() - started
+        
+        # Print summary
+        print(f"\n{'='*60}")
+        print(f"📊 COLLECTION SUMMARY")
+        print(f"{'='*60}")
+        
+        successful = sum(1 for r in results.values() if r['success'])
+        total_records = sum(r['records'] for r in results.values())
+        
+        print(f"✅ Successful: {successful}/{len(watchlist)}")
+        print(f"📈 Total records: {total_records}")
+        print(f"⏱️  Elapsed: {elapsed:.1f}s ({len(watchlist) / elapsed if elapsed else 0:.2f} tickers/s)")
+        print(f"{'='*60}\n")
+        
+        return results
+    
+    def _collect_serial(self, watchlist, save_to_db, incremental=False, stale_info=None,
+                        progress_callback=None):
+        """Collect tickers one at a time, paced by the shared limiters"""
         results = {}
         
         for i, ticker in enumerate(watchlist, 1):
             print(f"\n[{i}/{len(watchlist)}] Processing {ticker}...")
             
-            # Fetch price data
-            df = self.fetch_stock_data(ticker)
+            fetch_info = save_to_db and (stale_info is None or ticker in stale_info)
+            df, info, timing = self._fetch_ticker(ticker, fetch_info, incremental)
+            results[ticker] = self._store_ticker(ticker, df, info, timing, save_to_db)
             
-            if df is not None and save_to_db:
-                # Save to database
-                self.db.save_stock_data(ticker, df)
+            if progress_callback:
+                progress_callback(ticker, results[ticker])
+        
+        return results
+    
+    def _collect_concurrent(self, watchlist, save_to_db, max_workers=None, incremental=False,
+                            stale_info=None, progress_callback=None):
+        """Collect tickers on a bounded worker pool throttled by the shared limiters"""
+        max_workers = max_workers or config.MAX_WORKERS
+        results = {}
+        
+        print(f"⚡ Concurrent mode: {max_workers} workers, "
+              f"{config.HISTORY_RATE_LIMIT}/s history, {config.INFO_RATE_LIMIT}/s info")
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(self._fetch_ticker, ticker,
+                                save_to_db and (stale_info is None or ticker in stale_info),
+                                incremental): ticker
+                for ticker in watchlist
+            }
+            
+            # Workers only fetch; saving stays on this thread so the
+            # database connection is never written from two threads
+            for i, future in enumerate(as_completed(futures), 1):
+                ticker = futures[future]
+                print(f"\n[{i}/{len(watchlist)}] Processing {ticker}...")
                 
-                # Fetch and save company info
-                info = self.fetch_stock_info(ticker)
+                df, info, timing = future.result()
+                results[ticker] = self._store_ticker(ticker, df, info, timing, save_to_db)
+                
+                if progress_callback:
+                    progress_callback(ticker, results[ticker])
+        
+        # Keep the caller's watchlist order
+        return {ticker: results[ticker] for ticker in watchlist}
+    
+    def _collect_batch(self, watchlist, save_to_db, max_workers=None, incremental=False,
+                       stale_info=None, progress_callback=None):
+        """Collect tickers with multi-symbol downloads and one bulk save per download group"""
+        # Tickers that share a start date can share a download
+        recents = {}
+        by_start = {}
+        for ticker in watchlist:
+            start = None
+            if incremental:
+                recent = self.db.get_recent_bars(ticker, config.INCREMENTAL_OVERLAP_BARS)
+                if not recent.empty:
+                    recents[ticker] = recent
+                    start = recent.index[0].strftime('%Y-%m-%d')
+            by_start.setdefault(start, []).append(ticker)
+        
+        # Each download group is fetched, saved and reported before the next
+        # starts, so progress advances group by group rather than at the end
+        results = {}
+        group_size = config.BATCH_GROUP_SIZE
+        for start, tickers in by_start.items():
+            for i in range(0, len(tickers), group_size):
+                group = tickers[i:i + group_size]
+                results.update(self._collect_group(group, start, recents, save_to_db, max_workers,
+                                                   stale_info, progress_callback))
+        
+        return {ticker: results[ticker] for ticker in watchlist}
+    
+    def _collect_group(self, group, start, recents, save_to_db, max_workers=None,
+                       stale_info=None, progress_callback=None):
+        """Download, save and report one batch download group"""
+        started = time.perf_counter()
+        frames = self.fetch_batch_data(group, start=start)
+        
+        for ticker in group:
+            recent = recents.get(ticker)
+            if ticker in frames and recent is not None and self.needs_full_refetch(frames[ticker], recent):
+                print(f"🔁 Adjusted history changed for {ticker}, refetching full period...")
+                df = self.fetch_stock_data(ticker)
+                if df is None:
+                    frames.pop(ticker)
+                else:
+                    frames[ticker] = df
+        
+        # Download time is shared by the whole group, so report each ticker's share
+        history_time = (time.perf_counter() - started) / len(group)
+        
+        save_time = 0.0
+        infos = {}
+        if save_to_db and frames:
+            started = time.perf_counter()
+            self.db.save_stock_data_bulk(frames)
+            save_time = (time.perf_counter() - started) / len(frames)
+            
+            with ThreadPoolExecutor(max_workers=max_workers or config.MAX_WORKERS) as executor:
+                info_tickers = [t for t in frames if stale_info is None or t in stale_info]
+                for ticker, info, elapsed in executor.map(self._timed_info, info_tickers):
+                    infos[ticker] = (info, elapsed)
+        
+        results = {}
+        for ticker in group:
+            df = frames.get(ticker)
+            info, info_time = infos.get(ticker, (None, 0.0))
+            timing = {'history': history_time, 'info': info_time, 'save': 0.0}
+            
+            if df is not None and save_to_db:
+                timing['save'] = save_time
                 if info:
                     self.db.save_stock_info(ticker, info)
                 
-                results[ticker] = {
-                    'success': True,
-                    'records': len(df),
-                    'latest_date': df.index[-1] if not df.empty else None
-                }
+                if config.STREAMING_INDICATORS:
+                    started = time.perf_counter()
+                    self.update_indicators(ticker)
+                    timing['indicators'] = time.perf_counter() - started
+                
+                results[ticker] = self._build_result(df, timing)
             else:
-                results[ticker] = {
-                    'success': False,
-                    'records': 0,
-                    'latest_date': None
-                }
+                results[ticker] = self._build_result(None, timing)
             
-            # Rate limiting - be nice to Yahoo Finance
-            if i < len(watchlist):
-                time.sleep(0.5)
+            if progress_callback:
+                progress_callback(ticker, results[ticker])
         
-        # Print summary
-        print(f"\n{'='*60}")
-        print(f"📊 COLLECTION SUMMARY")
-        print(f"{'='*60}")
+        return results
+    
+    def _timed_info(self, ticker):
+        """Fetch company info for one ticker and report how long it took"""
+        started = time.perf_counter()
+        info = self.fetch_stock_info(ticker)
+        return ticker, info, time.perf_counter() - started
+    
+    def _fetch_ticker(self, ticker, fetch_info=True, incremental=False):
+        """Fetch price history and company info for one ticker, with timings"""
+        timing = {'history': 0.0, 'info': 0.0, 'save': 0.0}
         
-        successful = sum(1 for r in results.values() if r['success'])
-        total_records = sum(r['records'] for r in results.values())
+        started = time.perf_counter()
+        if incremental:
+            df = self.fetch_incremental_data(ticker)
+        else:
+            df = self.fetch_stock_data(ticker)
+        timing['history'] = time.perf_counter() - started
         
-        print(f"✅ Successful: {successful}/{len(watchlist)}")
-        print(f"📈 Total records: {total_records}")
-        print(f"{'='*60}\n")
+        info = None
+        if df is not None and fetch_info:
+            started = time.perf_counter()
+            info = self.fetch_stock_info(ticker)
+            timing['info'] = time.perf_counter() - started
         
-        return results
+        return df, info, timing
+    
+    def _store_ticker(self, ticker, df, info, timing, save_to_db):
+        """Save fetched data for one ticker and build its result entry"""
+        if df is not None and save_to_db:
+            started = time.perf_counter()
+            
+            # Save to database
+            self.db.save_stock_data(ticker, df)
+            
+            # Save company info
+            if info:
+                self.db.save_stock_info(ticker, info)
+            
+            timing['save'] = time.perf_counter() - started
+            
+            if config.STREAMING_INDICATORS:
+                started = time.perf_counter()
+                self.update_indicators(ticker)
+                timing['indicators'] = time.perf_counter() - started
+            
+            return self._build_result(df, timing)
+        
+        return self._build_result(None, timing)
+    
+    def _build_result(self, df, timing):
+        """Build the per-ticker result entry returned by collect_watchlist"""
+        timing['total'] = sum(v for k, v in timing.items() if k != 'total')
+        
+        if df is not None:
+            return {
+                'success': True,
+                'records': len(df),
+                'latest_date': df.index[-1] if not df.empty else None,
+                'timing': timing
+            }
+        
+        return {
+            'success': False,
+            'records': 0,
+            'latest_date': None,
+            'timing': timing
+        }
     
-    def update_single_stock(self, ticker):
+    def update_single_stock(self, ticker, incremental=None):
         """Update data for a single stock"""
+        if incremental is None:
+            incremental = config.INCREMENTAL_UPDATES
+        
         print(f"\n🔄 Updating {ticker}...")
         
-        df = self.fetch_stock_data(ticker)
+        if incremental:
+            df = self.fetch_incremental_data(ticker)
+        else:
+            df = self.fetch_stock_data(ticker)
         
         if df is not None:
             self.db.save_stock_data(ticker, df)
@@ -132,17 +470,59 @@ class DataCollector:
             if info:
                 self.db.save_stock_info(ticker, info)
             
+            if config.STREAMING_INDICATORS:
+                self.update_indicators(ticker)
+            
             print(f"✅ {ticker} updated successfully")
             return True
         
         print(f"❌ Failed to update {ticker}")
         return False
     
+    def update_indicators(self, ticker):
+        """Advance the ticker's stored indicators over bars saved since the last update"""
+        params = self.analyzer.get_params()
+        saved = self.db.get_indicator_state(ticker)
+        
+        if saved and saved['params'] == params:
+            # Only bars after the state's last date cost anything
+            state = IndicatorState.from_dict(saved)
+            bars = self.db.get_stock_data(ticker, start_date=state.last_date, columns=['close'])
+            bars = bars[bars.index > pd.Timestamp(state.last_date)]
+        else:
+            # No usable state: first run, revised history or changed parameters
+            state = IndicatorState(params)
+            bars = self.db.get_stock_data(ticker, columns=['close'])
+        
+        if bars.empty:
+            return True
+        
+        dates = bars.index.strftime('%Y-%m-%d')
+        closes = bars['close'].tolist()
+        
+        # Only completed sessions go into the saved state; a bar still trading
+        # is recomputed from that checkpoint on every update until it closes
+        completed = dates.searchsorted(str(self.calendar.last_completed_session()), side='right')
+        rows = [state.update(date, close) for date, close in zip(dates[:completed], closes[:completed])]
+        checkpoint = state.to_dict()
+        rows += [state.update(date, close) for date, close in zip(dates[completed:], closes[completed:])]
+        indicators = pd.DataFrame(rows, index=bars.index)
+        
+        # Signals only look at the latest row, so the new bars are enough
+        signals = self.analyzer.generate_signals(indicators.assign(close=bars['close']))
+        
+        # Every row after the checkpoint was just recomputed, so overwrite them
+        self.db.save_indicators(ticker, indicators, replace=True, signals=signals)
+        if checkpoint['last_date'] is None:
+            return True
+        return self.db.save_indicator_state(ticker, checkpoint)
+    
     def get_latest_price(self, ticker):
         """Get the most recent price for a ticker"""
         try:
-            stock = yf.Ticker(ticker)
-            df = stock.history(period='1d')
+            metrics.observe('rate_limit_wait_seconds', self.history_limiter.acquire(), limiter='history')
+            with metrics.timer('fetch_seconds', endpoint='history', provider=self.provider.name):
+                df = self.provider.history(ticker, period='1d')
             
             if not df.empty:
                 return {
@@ -156,6 +536,8 @@ class DataCollector:
             
         except Exception as e:
             print(f"❌ Error getting latest price for {ticker}: {e}")
+            metrics.inc('fetch_errors_total', endpoint='history', provider=self.provider.name)
+            log.error("Error getting latest price for %s: %s", ticker, e)
             return None
     
     def check_data_freshness(self, ticker):
@@ -165,13 +547,9 @@ class DataCollector:
         if not latest:
             return True  # No data, needs update
         
-        latest_date = pd.to_datetime(latest['date'])
-        days_old = (datetime.now() - latest_date).days
-        
-        if days_old > 1:
-            return True  # Data is stale
-        
-        return False
+        # Stale only if a trading session has opened since the last stored bar,
+        # so weekends and holidays don't trigger refetches
+        return bool(self.calendar.missing_sessions(latest['date']))
 
 
 def main():
@@ -180,13 +558,25 @@ def main():
     print("🚀 STOCK ANALYSIS TOOL - DATA COLLECTOR")
     print("="*60 + "\n")
     
+    metrics.setup_logging()
     collector = DataCollector()
     
     # Collect data for all stocks in watchlist
+    started = time.perf_counter()
     results = collector.collect_watchlist()
+    log.info("Collected %d/%d tickers in %.1fs", sum(r['success'] for r in results.values()),
+             len(results), time.perf_counter() - started)
     
     print("\n✅ Data collection complete!")
     print(f"📁 Database: {config.DATABASE_PATH}")
+    
+    # Where the time went
+    print("\n⏱️  Timings:")
+    for line in metrics.summary():
+        print(f"   {line}")
+    path = metrics.write_metrics('collector')
+    if path:
+        print(f"📈 Metrics: {path}")
     print("\n💡 Next step: Run the dashboard with 'streamlit run dashboard.py'\n")
 
 
@@ -3,14 +3,54 @@ Database Module - SQLite integration for stock data storage
 """
 
 import sqlite3
+import numpy as np
 import pandas as pd
 from datetime import datetime
+from pathlib import Path
+import json
 import os
+import queue
+import sys
+import threading
+import time
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config
+from src import metrics
+from src.panel import PricePanel
+from src.price_store import PriceStore
+
+log = metrics.get_logger('database')
 
 
 class StockDatabase:
     """Handles all database operations for stock data"""
     
+    # DataFrame columns stored in the indicators table, in table order
+    INDICATOR_COLUMNS = [
+        'SMA_20', 'SMA_50', 'RSI', 'MACD', 'MACD_Signal', 'MACD_Histogram',
+        'BB_Upper', 'BB_Middle', 'BB_Lower'
+    ]
+    
+    # Columns that may be projected in range queries
+    PRICE_COLUMNS = ['ticker', 'date', 'open', 'high', 'low', 'close', 'volume']
+    INDICATOR_TABLE_COLUMNS = [
+        'ticker', 'date', 'sma_20', 'sma_50', 'rsi', 'macd', 'macd_signal',
+        'macd_histogram', 'bb_upper', 'bb_middle', 'bb_lower'
+    ]
+    
+    # Parameter and result columns of the sweep_results table
+    SWEEP_COLUMNS = [
+        'short_window', 'long_window', 'rsi_period', 'macd_fast', 'macd_slow', 'macd_signal',
+        'bb_period', 'bb_std', 'total_return', 'annual_return', 'volatility', 'sharpe',
+        'max_drawdown', 'hit_rate', 'trades', 'turnover', 'exposure', 'bars'
+    ]
+    
+    # Bumped by each migration in _migrate(), stored in PRAGMA user_version
+    SCHEMA_VERSION = 3
+    
     def __init__(self, db_path='data/stocks.db'):
         """Initialize database connection"""
         self.db_path = db_path
@@ -18,36 +58,80 @@ class StockDatabase:
         # Create data directory if it doesn't exist
         os.makedirs(os.path.dirname(db_path), exist_ok=True)
         
+        # One writer connection guarded by a lock, plus one read-only
+        # connection per thread so readers never share cursor state
         self.conn = None
+        self.write_lock = threading.RLock()
+        self.read_conns = {}
+        self.read_conns_lock = threading.Lock()
+        self.local = threading.local()
+        
+        # Registry ids never change once committed, so lookups are cached
+        self.ticker_ids = {}
+        
+        # Callbacks run with the set of tickers after each price write
+        self.write_listeners = []
+        
+        # OHLCV bars live either in SQLite or in the columnar price store
+        if config.PRICE_BACKEND == 'npy':
+            self.price_store = PriceStore(config.PRICE_STORE_DIR)
+        elif config.PRICE_BACKEND == 'sqlite':
+            self.price_store = None
+        else:
+            raise ValueError(f"Unknown price backend: {config.PRICE_BACKEND}")
+        
         self.create_tables()
     
+    def _configure(self, conn):
+        """Apply performance pragmas to a new connection"""
+        conn.execute(f"PRAGMA synchronous = {config.DB_SYNCHRONOUS}")
+        conn.execute(f"PRAGMA cache_size = {int(config.DB_CACHE_SIZE)}")
+        conn.execute(f"PRAGMA mmap_size = {int(config.DB_MMAP_SIZE)}")
+        conn.execute(f"PRAGMA temp_store = {config.DB_TEMP_STORE}")
+        return conn
+    
     def get_connection(self):
-        """Get or create database connection"""
-        if self.conn is None:
-            self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
-        return self.conn
+        """Get or create the single writer connection"""
+        with self.write_lock:
+            if self.conn is None:
+                conn = sqlite3.connect(self.db_path, check_same_thread=False,
+                                       timeout=config.DB_BUSY_TIMEOUT)
+                conn.execute(f"PRAGMA journal_mode = {config.DB_JOURNAL_MODE}")
+                self.conn = self._configure(conn)
+            return self.conn
+    
+    def get_read_connection(self):
+        """Get this thread's read-only connection"""
+        conn = getattr(self.local, 'conn', None)
+        if conn is not None:
+            return conn
+        
+        # Make sure the database file and WAL exist before opening read-only
+        self.get_connection()
+        
+        uri = Path(self.db_path).absolute().as_uri() + '?mode=ro'
+        conn = self._configure(sqlite3.connect(uri, uri=True, check_same_thread=False,
+                                               timeout=config.DB_BUSY_TIMEOUT))
+        self.local.conn = conn
+        
+        with self.read_conns_lock:
+            # Drop connections left behind by threads that have exited
+            for thread in [t for t in self.read_conns if not t.is_alive()]:
+                self.read_conns.pop(thread).close()
+            self.read_conns[threading.current_thread()] = conn
+        
+        return conn
     
     def create_tables(self):
         """Create database tables if they don't exist"""
+        with self.write_lock:
+            self._create_tables()
+    
+    def _create_tables(self):
+        """Create tables, indexes and triggers on the writer connection"""
         conn = self.get_connection()
         cursor = conn.cursor()
         
-        # Stock prices table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS stock_prices (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                ticker TEXT NOT NULL,
-                date TEXT NOT NULL,
-                open REAL,
-                high REAL,
-                low REAL,
-                close REAL,
-                volume INTEGER,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                UNIQUE(ticker, date)
-            )
-        ''')
-        
         # Stock information table
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS stock_info (
@@ -60,12 +144,229 @@ class StockDatabase:
             )
         ''')
         
+        # Full company info payload from Yahoo Finance
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS stock_fundamentals (
+                ticker TEXT PRIMARY KEY,
+                payload TEXT NOT NULL,
+                fetched_at REAL NOT NULL
+            )
+        ''')
+        
+        # Per-ticker write counter used to invalidate cached analysis
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS data_versions (
+                ticker TEXT PRIMARY KEY,
+                version INTEGER NOT NULL DEFAULT 0,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        
+        # Streaming indicator state (running sums, windows, last EMA values)
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS indicator_state (
+                ticker TEXT PRIMARY KEY,
+                last_date TEXT,
+                state TEXT,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        
+        self._migrate(conn)
+        self._sync_revision_triggers(conn)
+        
+        conn.commit()
+        print("✅ Database tables created successfully")
+    
+    def _migrate(self, conn):
+        """Bring the schema up to SCHEMA_VERSION, one version at a time"""
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        if version >= self.SCHEMA_VERSION:
+            return
+        
+        # Run every step in one write transaction so a failed upgrade leaves
+        # the old schema intact, and re-read the version once it's held in
+        # case another process finished the upgrade while we waited
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            
+            if version < 1:
+                self._migrate_v1(conn)
+            if version < 2:
+                self._migrate_v2(conn)
+            if version < 3:
+                self._migrate_v3(conn)
+            
+            if version < self.SCHEMA_VERSION:
+                conn.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+    
+    def _revision_triggers(self):
+        """CREATE TRIGGER statements that invalidate derived data when a stored close is revised"""
+        # Same rule as DataCollector.needs_full_refetch: changes within
+        # REVISION_TOLERANCE are vendor round-off, not revisions
+        revised = (f"(old.close IS NULL) != (new.close IS NULL) "
+                   f"OR abs(new.close - old.close) > {float(config.REVISION_TOLERANCE)!r} * abs(old.close)")
+        
+        return {
+            # A revised close invalidates every indicator computed from that bar on
+            'trg_prices_revised': f'''CREATE TRIGGER trg_prices_revised
+            AFTER UPDATE OF close ON stock_prices
+            WHEN {revised}
+            BEGIN
+                DELETE FROM indicators WHERE ticker_id = new.ticker_id AND day >= new.day;
+            END''',
+            'trg_prices_revised_state': f'''CREATE TRIGGER trg_prices_revised_state
+            AFTER UPDATE OF close ON stock_prices
+            WHEN {revised}
+            BEGIN
+                DELETE FROM indicator_state
+                WHERE ticker = (SELECT symbol FROM tickers WHERE id = new.ticker_id)
+                  AND last_date >= date(new.day * 86400, 'unixepoch');
+            END''',
+            # Indicators deleted by a price revision must not linger in the snapshot
+            'trg_prices_revised_snapshot': f'''CREATE TRIGGER trg_prices_revised_snapshot
+            AFTER UPDATE OF close ON stock_prices
+            WHEN {revised}
+            BEGIN
+                UPDATE latest_snapshot SET
+                    indicator_day = NULL, sma_20 = NULL, sma_50 = NULL, rsi = NULL, macd = NULL,
+                    macd_signal = NULL, macd_histogram = NULL, bb_upper = NULL, bb_middle = NULL,
+                    bb_lower = NULL, signals = NULL
+                WHERE ticker_id = new.ticker_id AND indicator_day >= new.day;
+            END''',
+        }
+    
+    def _stale_revision_triggers(self, conn):
+        """Revision triggers that are missing or differ from _revision_triggers()"""
+        existing = dict(conn.execute("SELECT name, sql FROM sqlite_master WHERE type = 'trigger'"))
+        return {name: sql for name, sql in self._revision_triggers().items()
+                if existing.get(name) != sql}
+    
+    def _sync_revision_triggers(self, conn):
+        """Create the revision triggers, replacing any built with a different tolerance"""
+        if not self._stale_revision_triggers(conn):
+            return
+        
+        # Same locking as _migrate(): another process may be replacing them too
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            for name, sql in self._stale_revision_triggers(conn).items():
+                conn.execute(f"DROP TRIGGER IF EXISTS {name}")
+                conn.execute(sql)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+    
+    def _table_columns(self, conn, table):
+        """Column names of a table (empty if it doesn't exist)"""
+        return [row[1] for row in conn.execute(f"PRAGMA table_info({table})")]
+    
+    def _migrate_v1(self, conn):
+        """v1: tickers registry plus WITHOUT ROWID price/indicator tables keyed (ticker_id, day)"""
+        cursor = conn.cursor()
+        
+        # Databases from before schema versioning key rows on ticker/date strings
+        legacy_prices = 'ticker' in self._table_columns(conn, 'stock_prices')
+        legacy_indicators = 'ticker' in self._table_columns(conn, 'indicators')
+        
+        cursor.execute("DROP TRIGGER IF EXISTS trg_prices_revised")
+        cursor.execute("DROP TRIGGER IF EXISTS trg_prices_revised_state")
+        if legacy_prices:
+            cursor.execute("ALTER TABLE stock_prices RENAME TO stock_prices_v0")
+        if legacy_indicators:
+            cursor.execute("ALTER TABLE indicators RENAME TO indicators_v0")
+        
+        # Ticker registry - every other table refers to tickers by id
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS tickers (
+                id INTEGER PRIMARY KEY,
+                symbol TEXT NOT NULL UNIQUE
+            )
+        ''')
+        
+        # Stock prices table (day = days since 1970-01-01)
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS stock_prices (
+                ticker_id INTEGER NOT NULL,
+                day INTEGER NOT NULL,
+                open REAL,
+                high REAL,
+                low REAL,
+                close REAL,
+                volume INTEGER,
+                PRIMARY KEY (ticker_id, day)
+            ) WITHOUT ROWID
+        ''')
+        
         # Technical indicators table
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS indicators (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                ticker TEXT NOT NULL,
-                date TEXT NOT NULL,
+                ticker_id INTEGER NOT NULL,
+                day INTEGER NOT NULL,
+                sma_20 REAL,
+                sma_50 REAL,
+                rsi REAL,
+                macd REAL,
+                macd_signal REAL,
+                macd_histogram REAL,
+                bb_upper REAL,
+                bb_middle REAL,
+                bb_lower REAL,
+                PRIMARY KEY (ticker_id, day)
+            ) WITHOUT ROWID
+        ''')
+        
+        if legacy_prices or legacy_indicators:
+            print("🔧 Migrating database to schema v1...")
+            sources = [t for t, legacy in (('stock_prices_v0', legacy_prices),
+                                            ('indicators_v0', legacy_indicators)) if legacy]
+            cursor.execute(
+                "INSERT OR IGNORE INTO tickers (symbol) "
+                + " UNION ".join(f"SELECT ticker FROM {t}" for t in sources)
+                + " ORDER BY 1"
+            )
+            
+            # julianday() of a date string minus the 1970-01-01 epoch gives the day number
+            day = "CAST(julianday(substr(old.date, 1, 10)) - 2440587.5 AS INTEGER)"
+            if legacy_prices:
+                cursor.execute(f'''
+                    INSERT OR REPLACE INTO stock_prices
+                    SELECT t.id, {day}, old.open, old.high, old.low, old.close, old.volume
+                    FROM stock_prices_v0 old JOIN tickers t ON t.symbol = old.ticker
+                ''')
+                cursor.execute("DROP TABLE stock_prices_v0")
+            if legacy_indicators:
+                cursor.execute(f'''
+                    INSERT OR REPLACE INTO indicators
+                    SELECT t.id, {day}, old.sma_20, old.sma_50, old.rsi, old.macd, old.macd_signal,
+                           old.macd_histogram, old.bb_upper, old.bb_middle, old.bb_lower
+                    FROM indicators_v0 old JOIN tickers t ON t.symbol = old.ticker
+                ''')
+                cursor.execute("DROP TABLE indicators_v0")
+        
+        # The revision triggers are (re)created by _sync_revision_triggers()
+    
+    def _migrate_v2(self, conn):
+        """v2: latest_snapshot table holding each ticker's last bar, indicators and signals"""
+        cursor = conn.cursor()
+        
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS latest_snapshot (
+                ticker_id INTEGER PRIMARY KEY,
+                day INTEGER,
+                open REAL,
+                high REAL,
+                low REAL,
+                close REAL,
+                volume INTEGER,
+                prev_close REAL,
+                indicator_day INTEGER,
                 sma_20 REAL,
                 sma_50 REAL,
                 rsi REAL,
@@ -75,16 +376,169 @@ class StockDatabase:
                 bb_upper REAL,
                 bb_middle REAL,
                 bb_lower REAL,
-                UNIQUE(ticker, date)
+                signals TEXT,
+                updated_at REAL
             )
         ''')
         
-        # Create indexes for better performance
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_ticker_date ON stock_prices(ticker, date)')
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_indicators_ticker ON indicators(ticker, date)')
+        # Seed from existing history
+        if self.price_store is not None:
+            ids = self._ticker_ids(conn, self.price_store.get_all_tickers(), create=True)
+        else:
+            ids = dict(conn.execute("SELECT symbol, id FROM tickers"))
+        self._refresh_snapshot_prices(conn, ids)
+        self._refresh_snapshot_indicators(conn, ids.values())
+    
+    def _migrate_v3(self, conn):
+        """v3: sweep_results table holding parameter-sweep backtests per ticker"""
+        cursor = conn.cursor()
         
-        conn.commit()
-        print("✅ Database tables created successfully")
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS sweep_results (
+                sweep_id TEXT NOT NULL,
+                point INTEGER NOT NULL,
+                ticker_id INTEGER NOT NULL,
+                short_window INTEGER,
+                long_window INTEGER,
+                rsi_period INTEGER,
+                macd_fast INTEGER,
+                macd_slow INTEGER,
+                macd_signal INTEGER,
+                bb_period INTEGER,
+                bb_std REAL,
+                total_return REAL,
+                annual_return REAL,
+                volatility REAL,
+                sharpe REAL,
+                max_drawdown REAL,
+                hit_rate REAL,
+                trades INTEGER,
+                turnover REAL,
+                exposure REAL,
+                bars INTEGER,
+                created_at REAL,
+                PRIMARY KEY (sweep_id, point, ticker_id)
+            ) WITHOUT ROWID
+        ''')
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_sweep_ticker ON sweep_results (ticker_id, sweep_id)")
+    
+    def _refresh_snapshot_prices(self, conn, ids):
+        """Rebuild the last-bar part of the snapshot for {ticker: ticker_id}"""
+        upsert = '''
+            ON CONFLICT(ticker_id) DO UPDATE SET
+                day = excluded.day,
+                open = excluded.open,
+                high = excluded.high,
+                low = excluded.low,
+                close = excluded.close,
+                volume = excluded.volume,
+                prev_close = excluded.prev_close,
+                updated_at = excluded.updated_at
+        '''
+        now = time.time()
+        
+        if self.price_store is None:
+            # Read through the writer connection so uncommitted bars are included
+            conn.executemany('''
+                INSERT INTO latest_snapshot
+                (ticker_id, day, open, high, low, close, volume, prev_close, updated_at)
+                SELECT p.ticker_id, p.day, p.open, p.high, p.low, p.close, p.volume,
+                       (SELECT q.close FROM stock_prices q
+                        WHERE q.ticker_id = p.ticker_id AND q.day < p.day
+                        ORDER BY q.day DESC LIMIT 1),
+                       ?
+                FROM stock_prices p
+                WHERE p.ticker_id = ?
+                ORDER BY p.day DESC
+                LIMIT 1
+            ''' + upsert, [(now, ticker_id) for ticker_id in ids.values()])
+            return
+        
+        rows = []
+        for ticker, ticker_id in ids.items():
+            bars = self.price_store.get_recent_bars(ticker, 2)
+            if bars.empty:
+                continue
+            last = bars.iloc[-1]
+            prev_close = float(bars['close'].iloc[-2]) if len(bars) > 1 else None
+            rows.append((ticker_id, self._to_day(bars.index[-1]), float(last['open']), float(last['high']),
+                         float(last['low']), float(last['close']), int(last['volume']), prev_close, now))
+        
+        conn.executemany('''
+            INSERT INTO latest_snapshot
+            (ticker_id, day, open, high, low, close, volume, prev_close, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''' + upsert, rows)
+    
+    def _refresh_snapshot_indicators(self, conn, ticker_ids):
+        """Copy each ticker's newest stored indicator row into the snapshot"""
+        conn.executemany('''
+            INSERT INTO latest_snapshot
+            (ticker_id, indicator_day, sma_20, sma_50, rsi, macd, macd_signal,
+             macd_histogram, bb_upper, bb_middle, bb_lower, updated_at)
+            SELECT ticker_id, day, sma_20, sma_50, rsi, macd, macd_signal,
+                   macd_histogram, bb_upper, bb_middle, bb_lower, ?
+            FROM indicators
+            WHERE ticker_id = ?
+            ORDER BY day DESC
+            LIMIT 1
+            ON CONFLICT(ticker_id) DO UPDATE SET
+                indicator_day = excluded.indicator_day,
+                sma_20 = excluded.sma_20,
+                sma_50 = excluded.sma_50,
+                rsi = excluded.rsi,
+                macd = excluded.macd,
+                macd_signal = excluded.macd_signal,
+                macd_histogram = excluded.macd_histogram,
+                bb_upper = excluded.bb_upper,
+                bb_middle = excluded.bb_middle,
+                bb_lower = excluded.bb_lower,
+                updated_at = excluded.updated_at
+        ''', [(time.time(), ticker_id) for ticker_id in ticker_ids])
+    
+    def _ticker_ids(self, conn, tickers, create=False):
+        """Map symbols to registry ids, registering unknown symbols when create=True"""
+        missing = [t for t in tickers if t not in self.ticker_ids]
+        if not missing:
+            return {t: self.ticker_ids[t] for t in tickers}
+        
+        if create:
+            conn.executemany("INSERT OR IGNORE INTO tickers (symbol) VALUES (?)",
+                             [(t,) for t in missing])
+        
+        found = {}
+        chunk = 900
+        for i in range(0, len(missing), chunk):
+            group = missing[i:i + chunk]
+            placeholders = ', '.join('?' * len(group))
+            cursor = conn.execute(f"SELECT symbol, id FROM tickers WHERE symbol IN ({placeholders})", group)
+            found.update(cursor.fetchall())
+        
+        # Ids registered inside a still-open transaction are only cached once read back later
+        if not create:
+            self.ticker_ids.update(found)
+        
+        ids = {t: self.ticker_ids[t] for t in tickers if t in self.ticker_ids}
+        ids.update(found)
+        return ids
+    
+    def _ticker_id(self, conn, ticker):
+        """Registry id of a symbol, or None if it has never been stored"""
+        return self._ticker_ids(conn, [ticker]).get(ticker)
+    
+    def _to_day(self, value):
+        """Convert a date-like value to days since 1970-01-01"""
+        return int(np.datetime64(pd.Timestamp(value).date(), 'D').astype(np.int64))
+    
+    def _to_days(self, index):
+        """Convert a DatetimeIndex to epoch days (the wall-clock date for tz-aware indexes)"""
+        if index.tz is not None:
+            index = index.tz_localize(None)
+        return index.values.astype('datetime64[D]').astype(np.int64)
+    
+    def _day_str(self, day):
+        """Format an epoch day as YYYY-MM-DD"""
+        return str(np.datetime64(int(day), 'D'))
     
     def save_stock_data(self, ticker, df):
         """Save stock price data to database"""
@@ -92,151 +546,484 @@ class StockDatabase:
             print(f"⚠️  No data to save for {ticker}")
             return False
         
-        conn = self.get_connection()
-        
         try:
-            # Prepare dataframe
-            df_to_save = df.copy()
-            df_to_save['ticker'] = ticker
-            df_to_save['date'] = df_to_save.index.strftime('%Y-%m-%d')
-            
-            # Select relevant columns
-            columns = ['ticker', 'date', 'Open', 'High', 'Low', 'Close', 'Volume']
-            df_to_save = df_to_save[columns]
-            df_to_save.columns = ['ticker', 'date', 'open', 'high', 'low', 'close', 'volume']
-            
-            # Save to database (replace existing data)
-            df_to_save.to_sql('stock_prices', conn, if_exists='append', index=False)
-            
-            print(f"✅ Saved {len(df_to_save)} records for {ticker}")
+            count = self._upsert_prices(self._price_rows(ticker, df))
+            metrics.inc('db_rows_written_total', count, table='stock_prices')
+            print(f"✅ Saved {count} records for {ticker}")
             return True
             
-        except sqlite3.IntegrityError:
-            # Data already exists, update instead
-            for _, row in df_to_save.iterrows():
-                cursor = conn.cursor()
-                cursor.execute('''
-                    INSERT OR REPLACE INTO stock_prices 
-                    (ticker, date, open, high, low, close, volume)
-                    VALUES (?, ?, ?, ?, ?, ?, ?)
-                ''', (row['ticker'], row['date'], row['open'], row['high'], 
-                      row['low'], row['close'], row['volume']))
-            conn.commit()
-            print(f"✅ Updated {len(df_to_save)} records for {ticker}")
+        except Exception as e:
+            print(f"❌ Error saving data for {ticker}: {e}")
+            log.error("Error saving data for %s: %s", ticker, e)
+            return False
+    
+    def save_stock_data_bulk(self, frames):
+        """Save price data for many tickers, given a {ticker: DataFrame} mapping"""
+        rows = []
+        for ticker, df in frames.items():
+            if df is not None and not df.empty:
+                rows.extend(self._price_rows(ticker, df))
+        
+        if not rows:
+            print("⚠️  No data to save")
+            return False
+        
+        try:
+            count = self._upsert_prices(rows)
+            metrics.inc('db_rows_written_total', count, table='stock_prices')
+            print(f"✅ Saved {count} records for {len(frames)} tickers")
             return True
             
         except Exception as e:
-            print(f"❌ Error saving data for {ticker}: {e}")
+            print(f"❌ Error saving bulk data: {e}")
+            log.error("Error saving bulk data: %s", e)
             return False
     
-    def get_stock_data(self, ticker, start_date=None, end_date=None):
-        """Retrieve stock price data from database"""
+    def _price_rows(self, ticker, df):
+        """Convert a price DataFrame into upsert parameter tuples"""
+        # Pull each column out as a plain list once instead of iterating rows
+        n = len(df)
+        days = self._to_days(df.index).tolist()
+        columns = [df[col].tolist() for col in ('Open', 'High', 'Low', 'Close', 'Volume')]
+        
+        return list(zip([ticker] * n, days, *columns))
+    
+    @metrics.timed('db_write_seconds', table='stock_prices')
+    def _upsert_prices(self, rows):
+        """Insert or update price rows in a single transaction"""
+        if self.price_store is not None:
+            return self._write_price_store(rows)
+        
+        conn = self.get_connection()
+        tickers = sorted({row[0] for row in rows})
+        
+        with self.write_lock, conn:
+            ids = self._ticker_ids(conn, tickers, create=True)
+            conn.executemany('''
+                INSERT INTO stock_prices (ticker_id, day, open, high, low, close, volume)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(ticker_id, day) DO UPDATE SET
+                    open = excluded.open,
+                    high = excluded.high,
+                    low = excluded.low,
+                    close = excluded.close,
+                    volume = excluded.volume
+            ''', [(ids[row[0]],) + row[1:] for row in rows])
+            
+            # Bump each ticker's data version and snapshot in the same transaction
+            self._bump_versions(conn, tickers)
+            self._refresh_snapshot_prices(conn, ids)
+        
+        for listener in self.write_listeners:
+            listener(tickers)
+        
+        return len(rows)
+    
+    def _bump_versions(self, conn, tickers):
+        """Increment the data version of each written ticker"""
+        conn.executemany('''
+            INSERT INTO data_versions (ticker, version, updated_at)
+            VALUES (?, 1, CURRENT_TIMESTAMP)
+            ON CONFLICT(ticker) DO UPDATE SET
+                version = version + 1,
+                updated_at = excluded.updated_at
+        ''', [(ticker,) for ticker in tickers])
+    
+    def _write_price_store(self, rows):
+        """Write price rows to the columnar store, keeping SQLite-side state in step"""
+        by_ticker = {}
+        for row in rows:
+            by_ticker.setdefault(row[0], []).append(row[1:])
+        
         conn = self.get_connection()
         
-        query = f"SELECT * FROM stock_prices WHERE ticker = '{ticker}'"
+        with self.write_lock:
+            revised = {}
+            for ticker, ticker_rows in by_ticker.items():
+                days, *columns = zip(*ticker_rows)
+                values = dict(zip(PricePanel.FIELDS, (np.array(c, dtype=float) for c in columns)))
+                first_revised = self.price_store.write(ticker, PriceStore.from_days(days), values)
+                if first_revised is not None:
+                    revised[ticker] = first_revised
+            
+            with conn:
+                tickers = sorted(by_ticker)
+                ids = self._ticker_ids(conn, tickers, create=True)
+                
+                # Same invalidation the stock_prices triggers do for the SQLite backend
+                for ticker, date in revised.items():
+                    conn.execute("DELETE FROM indicators WHERE ticker_id = ? AND day >= ?",
+                                 (ids[ticker], self._to_day(date)))
+                    conn.execute("DELETE FROM indicator_state WHERE ticker = ? AND last_date >= ?",
+                                 (ticker, str(date)))
+                    conn.execute('''
+                        UPDATE latest_snapshot SET
+                            indicator_day = NULL, sma_20 = NULL, sma_50 = NULL, rsi = NULL, macd = NULL,
+                            macd_signal = NULL, macd_histogram = NULL, bb_upper = NULL, bb_middle = NULL,
+                            bb_lower = NULL, signals = NULL
+                        WHERE ticker_id = ? AND indicator_day >= ?
+                    ''', (ids[ticker], self._to_day(date)))
+                
+                self._bump_versions(conn, tickers)
+                self._refresh_snapshot_prices(conn, ids)
+        
+        for listener in self.write_listeners:
+            listener(tickers)
+        
+        return len(rows)
+    
+    def add_write_listener(self, callback):
+        """Register a callback run with the written tickers after each price save"""
+        self.write_listeners.append(callback)
+    
+    def get_data_version(self, ticker):
+        """Get a counter that changes every time the ticker's prices are written"""
+        conn = self.get_read_connection()
+        
+        cursor = conn.execute("SELECT version FROM data_versions WHERE ticker = ?", (ticker,))
+        result = cursor.fetchone()
+        
+        return result[0] if result else 0
+    
+    @metrics.timed('db_query_seconds', query='get_stock_data')
+    def get_stock_data(self, ticker, start_date=None, end_date=None, columns=None):
+        """Retrieve stock price data from database"""
+        if self.price_store is not None:
+            return self.price_store.get_stock_data(ticker, start_date, end_date, columns)
+        
+        try:
+            return self._read_range('stock_prices', self.PRICE_COLUMNS, ticker,
+                                    start_date, end_date, columns)
+            
+        except ValueError:
+            raise
+        except Exception as e:
+            print(f"❌ Error retrieving data for {ticker}: {e}")
+            return pd.DataFrame()
+    
+    def _range_query(self, table, allowed, start_date=None, end_date=None, columns=None):
+        """Build a parameterized ticker/day-range query with an optional projection"""
+        if columns:
+            unknown = [c for c in columns if c not in allowed]
+            if unknown:
+                raise ValueError(f"Unknown columns for {table}: {unknown}")
+        else:
+            columns = allowed
+        
+        # ticker and date are rebuilt from the key rather than stored per row
+        names = [c for c in columns if c not in ('ticker', 'date')]
+        
+        # Identical SQL text per variant lets sqlite3 reuse the prepared statement
+        query = f"SELECT {', '.join(['day'] + names)} FROM {table} WHERE ticker_id = ?"
+        params = []
         
         if start_date:
-            query += f" AND date >= '{start_date}'"
+            query += " AND day >= ?"
+            params.append(self._to_day(start_date))
         if end_date:
-            query += f" AND date <= '{end_date}'"
+            query += " AND day <= ?"
+            params.append(self._to_day(end_date))
+        
+        query += " ORDER BY day ASC"
+        return query, params, 'ticker' in columns
+    
+    def _read_range(self, table, allowed, ticker, start_date=None, end_date=None, columns=None):
+        """Run a range query for one ticker and index the result by date"""
+        query, params, with_ticker = self._range_query(table, allowed, start_date, end_date, columns)
         
-        query += " ORDER BY date ASC"
+        conn = self.get_read_connection()
+        ticker_id = self._ticker_id(conn, ticker)
+        if ticker_id is None:
+            return pd.DataFrame()
+        
+        df = pd.read_sql_query(query, conn, params=[ticker_id] + params)
+        if df.empty:
+            return df
+        
+        days = df.pop('day').to_numpy(dtype=np.int64)
+        df.index = pd.DatetimeIndex(days.astype('datetime64[D]'), name='date')
+        if with_ticker:
+            df.insert(0, 'ticker', ticker)
+        return df
+    
+    @metrics.timed('db_query_seconds', query='get_price_panel')
+    def get_price_panel(self, tickers=None, start_date=None, end_date=None, fields=None):
+        """Load many tickers in one query as an aligned dates x tickers PricePanel"""
+        fields = list(fields or PricePanel.FIELDS)
+        unknown = [f for f in fields if f not in PricePanel.FIELDS]
+        if unknown:
+            raise ValueError(f"Unknown panel fields: {unknown}")
+        
+        if tickers is None:
+            tickers = self.get_all_tickers()
+        tickers = list(dict.fromkeys(tickers))
+        
+        if self.price_store is not None:
+            return self.price_store.get_price_panel(tickers, start_date, end_date, fields)
+        
+        conn = self.get_read_connection()
+        ids = self._ticker_ids(conn, tickers)
+        
+        query = f"SELECT ticker_id, day, {', '.join(fields)} FROM stock_prices WHERE 1 = 1"
+        params = []
+        
+        if start_date:
+            query += " AND day >= ?"
+            params.append(self._to_day(start_date))
+        if end_date:
+            query += " AND day <= ?"
+            params.append(self._to_day(end_date))
+        
+        # Stay well under SQLite's bound-parameter limit
+        rows = []
+        chunk = 900
+        id_list = list(ids.values())
+        for i in range(0, len(id_list), chunk):
+            group = id_list[i:i + chunk]
+            placeholders = ', '.join('?' * len(group))
+            cursor = conn.execute(f"{query} AND ticker_id IN ({placeholders})", params + group)
+            rows.extend(cursor.fetchall())
+        
+        names = ['ticker', 'day'] + fields
+        columns = dict(zip(names, zip(*rows))) if rows else {name: () for name in names}
+        days = np.asarray(columns['day'], dtype=np.int64).astype('datetime64[D]')
+        
+        # Align on ids, then label columns with symbols (unknown tickers get ids no row has)
+        keys = [ids.get(t, -i - 1) for i, t in enumerate(tickers)]
+        panel = PricePanel.from_rows(keys, days, columns, fields)
+        return PricePanel(panel.dates, tickers, panel.fields, panel.mask)
+    
+    @metrics.timed('db_query_seconds', query='get_last_dates')
+    def get_last_dates(self, tickers=None):
+        """Get {ticker: last stored bar date} for every ticker in one query"""
+        conn = self.get_read_connection()
+        
+        cursor = conn.execute('''
+            SELECT t.symbol, s.day
+            FROM latest_snapshot s JOIN tickers t ON t.id = s.ticker_id
+            WHERE s.day IS NOT NULL
+        ''')
+        dates = {ticker: self._day_str(day) for ticker, day in cursor.fetchall()}
+        
+        if tickers is not None:
+            dates = {t: dates[t] for t in tickers if t in dates}
+        return dates
+    
+    def get_update_times(self, tickers=None):
+        """Get {ticker: unix time of the last price write} in one query"""
+        conn = self.get_read_connection()
+        
+        cursor = conn.execute(
+            "SELECT ticker, CAST(strftime('%s', updated_at) AS REAL) FROM data_versions"
+        )
+        times = dict(cursor.fetchall())
+        
+        if tickers is not None:
+            times = {t: times[t] for t in tickers if t in times}
+        return times
+    
+    @metrics.timed('db_query_seconds', query='get_recent_bars')
+    def get_recent_bars(self, ticker, n):
+        """Retrieve the last n stored bars for a ticker, oldest first"""
+        if self.price_store is not None:
+            return self.price_store.get_recent_bars(ticker, n)
+        
+        conn = self.get_read_connection()
+        
+        query = """
+            SELECT day, open, high, low, close, volume
+            FROM stock_prices
+            WHERE ticker_id = ?
+            ORDER BY day DESC
+            LIMIT ?
+        """
         
         try:
-            df = pd.read_sql_query(query, conn)
+            df = pd.read_sql_query(query, conn, params=(self._ticker_id(conn, ticker), int(n)))
             
             if not df.empty:
-                df['date'] = pd.to_datetime(df['date'])
-                df.set_index('date', inplace=True)
+                days = df.pop('day').to_numpy(dtype=np.int64)
+                df.index = pd.DatetimeIndex(days.astype('datetime64[D]'), name='date')
+                df.sort_index(inplace=True)
             
             return df
             
         except Exception as e:
-            print(f"❌ Error retrieving data for {ticker}: {e}")
+            print(f"❌ Error retrieving recent bars for {ticker}: {e}")
             return pd.DataFrame()
     
-    def save_indicators(self, ticker, df):
-        """Save calculated technical indicators to database"""
+    @metrics.timed('db_write_seconds', table='indicators')
+    def save_indicators(self, ticker, df, replace=False, signals=None):
+        """Save calculated technical indicators (and optionally their signals) to database"""
         if df is None or df.empty:
             return False
         
         conn = self.get_connection()
         
         try:
-            df_to_save = df.copy()
-            df_to_save['ticker'] = ticker
-            df_to_save['date'] = df_to_save.index.strftime('%Y-%m-%d')
+            days = self._to_days(df.index)
             
-            # Save indicators
-            for _, row in df_to_save.iterrows():
-                cursor = conn.cursor()
-                cursor.execute('''
-                    INSERT OR REPLACE INTO indicators 
-                    (ticker, date, sma_20, sma_50, rsi, macd, macd_signal, 
-                     macd_histogram, bb_upper, bb_middle, bb_lower)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    ticker, row['date'],
-                    row.get('SMA_20'), row.get('SMA_50'), row.get('RSI'),
-                    row.get('MACD'), row.get('MACD_Signal'), row.get('MACD_Histogram'),
-                    row.get('BB_Upper'), row.get('BB_Middle'), row.get('BB_Lower')
-                ))
+            with self.write_lock:
+                ticker_id = self._ticker_ids(conn, [ticker], create=True)[ticker]
+                
+                # Rows up to the high-water mark are already stored; revised
+                # price bars delete their indicator rows, lowering the mark
+                cursor = conn.execute("SELECT MAX(day) FROM indicators WHERE ticker_id = ?", (ticker_id,))
+                last_day = cursor.fetchone()[0]
+                if last_day is not None and not replace:
+                    new_rows = days > last_day
+                    df = df[new_rows]
+                    days = days[new_rows]
+                
+                if df.empty:
+                    if signals is not None:
+                        with conn:
+                            self._save_snapshot_signals(conn, ticker_id, signals)
+                    return True
+                
+                n = len(df)
+                columns = [
+                    df[col].tolist() if col in df.columns else [None] * n
+                    for col in self.INDICATOR_COLUMNS
+                ]
+                rows = list(zip([ticker_id] * n, days.tolist(), *columns))
+                
+                with conn:
+                    conn.executemany('''
+                        INSERT INTO indicators 
+                        (ticker_id, day, sma_20, sma_50, rsi, macd, macd_signal, 
+                         macd_histogram, bb_upper, bb_middle, bb_lower)
+                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                        ON CONFLICT(ticker_id, day) DO UPDATE SET
+                            sma_20 = excluded.sma_20,
+                            sma_50 = excluded.sma_50,
+                            rsi = excluded.rsi,
+                            macd = excluded.macd,
+                            macd_signal = excluded.macd_signal,
+                            macd_histogram = excluded.macd_histogram,
+                            bb_upper = excluded.bb_upper,
+                            bb_middle = excluded.bb_middle,
+                            bb_lower = excluded.bb_lower
+                    ''', rows)
+                    
+                    # Signals must describe the stored latest indicators, so
+                    # new rows without signals clear the old ones
+                    self._refresh_snapshot_indicators(conn, [ticker_id])
+                    self._save_snapshot_signals(conn, ticker_id, signals)
+                
+                metrics.inc('db_rows_written_total', n, table='indicators')
             
-            conn.commit()
             return True
             
         except Exception as e:
             print(f"❌ Error saving indicators for {ticker}: {e}")
+            log.error("Error saving indicators for %s: %s", ticker, e)
             return False
     
-    def get_indicators(self, ticker):
-        """Retrieve technical indicators from database"""
-        conn = self.get_connection()
+    def _save_snapshot_signals(self, conn, ticker_id, signals):
+        """Store generate_signals() output for the ticker's latest indicators (None clears it)"""
+        payload = json.dumps(signals, default=float) if signals is not None else None
+        conn.execute("UPDATE latest_snapshot SET signals = ? WHERE ticker_id = ?",
+                     (payload, ticker_id))
+    
+    @metrics.timed('db_query_seconds', query='get_latest_snapshot')
+    def get_latest_snapshot(self, tickers=None):
+        """Get every ticker's last bar, indicators and signals in one query, indexed by ticker"""
+        conn = self.get_read_connection()
+        
+        df = pd.read_sql_query('''
+            SELECT t.symbol AS ticker, s.*
+            FROM latest_snapshot s JOIN tickers t ON t.id = s.ticker_id
+            WHERE s.day IS NOT NULL
+            ORDER BY t.symbol
+        ''', conn, index_col='ticker')
+        
+        if tickers is not None:
+            df = df.loc[[t for t in dict.fromkeys(tickers) if t in df.index]]
         
-        query = f"SELECT * FROM indicators WHERE ticker = '{ticker}' ORDER BY date ASC"
+        df = df.drop(columns='ticker_id')
+        df['day'] = pd.to_datetime(df['day'], unit='D')
+        df['indicator_day'] = pd.to_datetime(df['indicator_day'], unit='D')
+        df = df.rename(columns={'day': 'date', 'indicator_day': 'indicator_date'})
+        df.insert(df.columns.get_loc('prev_close') + 1, 'change_pct',
+                  (df['close'] / df['prev_close'] - 1) * 100)
         
+        # One column per signal (signal_trend, signal_rsi, ..., signal_overall)
+        signals = [json.loads(p) if isinstance(p, str) else {} for p in df.pop('signals')]
+        for key in ('trend', 'rsi_signal', 'macd_signal', 'bb_signal', 'overall'):
+            name = 'signal_' + key.replace('_signal', '')
+            df[name] = [s.get(key) for s in signals]
+        
+        return df
+    
+    @metrics.timed('db_query_seconds', query='get_indicators')
+    def get_indicators(self, ticker, start_date=None, end_date=None, columns=None):
+        """Retrieve technical indicators from database"""
         try:
-            df = pd.read_sql_query(query, conn)
-            
-            if not df.empty:
-                df['date'] = pd.to_datetime(df['date'])
-                df.set_index('date', inplace=True)
-            
-            return df
+            return self._read_range('indicators', self.INDICATOR_TABLE_COLUMNS, ticker,
+                                    start_date, end_date, columns)
             
+        except ValueError:
+            raise
         except Exception as e:
             print(f"❌ Error retrieving indicators for {ticker}: {e}")
             return pd.DataFrame()
     
+    def save_indicator_state(self, ticker, state):
+        """Save a ticker's streaming indicator state (an IndicatorState.to_dict())"""
+        conn = self.get_connection()
+        
+        try:
+            with self.write_lock, conn:
+                conn.execute('''
+                    INSERT OR REPLACE INTO indicator_state (ticker, last_date, state, updated_at)
+                    VALUES (?, ?, ?, ?)
+                ''', (ticker, state['last_date'], json.dumps(state), datetime.now()))
+            return True
+            
+        except Exception as e:
+            print(f"❌ Error saving indicator state for {ticker}: {e}")
+            return False
+    
+    def get_indicator_state(self, ticker):
+        """Retrieve a ticker's streaming indicator state, or None"""
+        conn = self.get_read_connection()
+        
+        cursor = conn.execute("SELECT state FROM indicator_state WHERE ticker = ?", (ticker,))
+        result = cursor.fetchone()
+        
+        return json.loads(result[0]) if result else None
+    
     def get_all_tickers(self):
         """Get list of all tickers in database"""
-        conn = self.get_connection()
+        if self.price_store is not None:
+            return self.price_store.get_all_tickers()
+        
+        conn = self.get_read_connection()
         cursor = conn.cursor()
         
-        cursor.execute("SELECT DISTINCT ticker FROM stock_prices ORDER BY ticker")
+        cursor.execute("SELECT symbol FROM tickers ORDER BY symbol")
         tickers = [row[0] for row in cursor.fetchall()]
         
         return tickers
     
     def get_latest_price(self, ticker):
         """Get the most recent price for a ticker"""
-        conn = self.get_connection()
+        conn = self.get_read_connection()
         
-        query = f"""
-            SELECT close, date 
-            FROM stock_prices 
-            WHERE ticker = '{ticker}' 
-            ORDER BY date DESC 
-            LIMIT 1
+        query = """
+            SELECT close, day 
+            FROM latest_snapshot 
+            WHERE ticker_id = ? AND day IS NOT NULL
         """
         
         try:
             cursor = conn.cursor()
-            cursor.execute(query)
+            cursor.execute(query, (self._ticker_id(conn, ticker),))
             result = cursor.fetchone()
             
             if result:
-                return {'close': result[0], 'date': result[1]}
+                return {'close': result[0], 'date': self._day_str(result[1])}
             return None
             
         except Exception as e:
@@ -246,23 +1033,28 @@ class StockDatabase:
     def save_stock_info(self, ticker, info):
         """Save stock company information"""
         conn = self.get_connection()
-        cursor = conn.cursor()
         
         try:
-            cursor.execute('''
-                INSERT OR REPLACE INTO stock_info 
-                (ticker, company_name, sector, industry, market_cap, updated_at)
-                VALUES (?, ?, ?, ?, ?, ?)
-            ''', (
-                ticker,
-                info.get('longName', ticker),
-                info.get('sector', 'Unknown'),
-                info.get('industry', 'Unknown'),
-                info.get('marketCap', 0),
-                datetime.now()
-            ))
+            with self.write_lock, conn:
+                conn.execute('''
+                    INSERT OR REPLACE INTO stock_info 
+                    (ticker, company_name, sector, industry, market_cap, updated_at)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                ''', (
+                    ticker,
+                    info.get('longName', ticker),
+                    info.get('sector', 'Unknown'),
+                    info.get('industry', 'Unknown'),
+                    info.get('marketCap', 0),
+                    datetime.now()
+                ))
+                
+                # Keep the full payload for the dashboard's fundamentals panels
+                conn.execute('''
+                    INSERT OR REPLACE INTO stock_fundamentals (ticker, payload, fetched_at)
+                    VALUES (?, ?, ?)
+                ''', (ticker, json.dumps(info, default=str), time.time()))
             
-            conn.commit()
             return True
             
         except Exception as e:
@@ -271,12 +1063,12 @@ class StockDatabase:
     
     def get_stock_info(self, ticker):
         """Retrieve stock company information"""
-        conn = self.get_connection()
+        conn = self.get_read_connection()
         
-        query = f"SELECT * FROM stock_info WHERE ticker = '{ticker}'"
+        query = "SELECT * FROM stock_info WHERE ticker = ?"
         
         try:
-            df = pd.read_sql_query(query, conn)
+            df = pd.read_sql_query(query, conn, params=(ticker,))
             
             if not df.empty:
                 return df.iloc[0].to_dict()
@@ -286,8 +1078,140 @@ class StockDatabase:
             print(f"❌ Error retrieving info for {ticker}: {e}")
             return None
     
+    def get_fundamentals(self, ticker):
+        """Retrieve the full stored info payload and its fetch time (epoch seconds)"""
+        conn = self.get_read_connection()
+        
+        try:
+            cursor = conn.execute(
+                "SELECT payload, fetched_at FROM stock_fundamentals WHERE ticker = ?", (ticker,)
+            )
+            result = cursor.fetchone()
+            
+            if result:
+                return json.loads(result[0]), result[1]
+            return None, None
+            
+        except Exception as e:
+            print(f"❌ Error retrieving fundamentals for {ticker}: {e}")
+            return None, None
+    
+    def get_fundamentals_times(self, tickers=None):
+        """Get {ticker: fetched_at} for stored fundamentals in one query"""
+        conn = self.get_read_connection()
+        
+        cursor = conn.execute("SELECT ticker, fetched_at FROM stock_fundamentals")
+        times = dict(cursor.fetchall())
+        
+        if tickers is not None:
+            times = {t: times[t] for t in tickers if t in times}
+        return times
+    
+    def save_sweep_results(self, sweep_id, df):
+        """Save one row per (grid point, ticker) from a parameter sweep, replacing reruns"""
+        if df is None or df.empty:
+            return False
+        
+        conn = self.get_connection()
+        columns = ['point'] + self.SWEEP_COLUMNS
+        
+        try:
+            with self.write_lock:
+                ids = self._ticker_ids(conn, df['ticker'].unique().tolist(), create=True)
+        
+                frame = df[columns].astype(object).where(df[columns].notna(), None)
+                rows = zip([sweep_id] * len(df), df['ticker'].map(ids).tolist(),
+                           *(frame[col].tolist() for col in columns), [time.time()] * len(df))
+        
+                with conn:
+                    conn.executemany(f'''
+                        INSERT OR REPLACE INTO sweep_results
+                        (sweep_id, ticker_id, {', '.join(columns)}, created_at)
+                        VALUES ({', '.join(['?'] * (len(columns) + 3))})
+                    ''', rows)
+        
+            return True
+        
+        except Exception as e:
+            print(f"❌ Error saving sweep {sweep_id}: {e}")
+            return False
+    
+    def get_sweep_results(self, sweep_id=None, tickers=None):
+        """Get stored sweep rows (default: the most recent sweep) with ticker symbols"""
+        conn = self.get_read_connection()
+        
+        if sweep_id is None:
+            cursor = conn.execute("SELECT sweep_id FROM sweep_results ORDER BY created_at DESC LIMIT 1")
+            result = cursor.fetchone()
+            if not result:
+                return pd.DataFrame()
+            sweep_id = result[0]
+        
+        query = f'''
+            SELECT r.sweep_id, r.point, t.symbol AS ticker, {', '.join('r.' + c for c in self.SWEEP_COLUMNS)}
+            FROM sweep_results r JOIN tickers t ON t.id = r.ticker_id
+            WHERE r.sweep_id = ?
+        '''
+        params = [sweep_id]
+        
+        if tickers is not None:
+            ids = self._ticker_ids(conn, tickers)
+            query += f" AND r.ticker_id IN ({', '.join(['?'] * len(ids))})"
+            params.extend(ids.values())
+        
+        query += " ORDER BY r.point, t.symbol"
+        return pd.read_sql_query(query, conn, params=params)
+    
+    def get_sweep_ids(self):
+        """Get stored sweeps as (sweep_id, points, tickers, created_at), newest first"""
+        conn = self.get_read_connection()
+        
+        return pd.read_sql_query('''
+            SELECT sweep_id, COUNT(DISTINCT point) AS points, COUNT(DISTINCT ticker_id) AS tickers,
+                   MAX(created_at) AS created_at
+            FROM sweep_results
+            GROUP BY sweep_id
+            ORDER BY created_at DESC
+        ''', conn)
+    
     def close(self):
-        """Close database connection"""
-        if self.conn:
-            self.conn.close()
-            self.conn = None
+        """Close the writer and all per-thread read connections"""
+        with self.read_conns_lock:
+            for conn in self.read_conns.values():
+                conn.close()
+            self.read_conns.clear()
+        self.local = threading.local()
+        
+        with self.write_lock:
+            if self.conn:
+                self.conn.close()
+                self.conn = None
+
+
+class BackgroundWriter:
+    """Runs database writes on a single background thread"""
+    
+    def __init__(self):
+        """Start the writer thread"""
+        self.queue = queue.Queue()
+        self.thread = threading.Thread(target=self._run, name='db-writer', daemon=True)
+        self.thread.start()
+    
+    def submit(self, func, *args, **kwargs):
+        """Queue a write call and return immediately"""
+        self.queue.put((func, args, kwargs))
+    
+    def flush(self):
+        """Block until every queued write has finished"""
+        self.queue.join()
+    
+    def _run(self):
+        """Process queued writes in order"""
+        while True:
+            func, args, kwargs = self.queue.get()
+            try:
+                func(*args, **kwargs)
+            except Exception as e:
+                print(f"❌ Background write failed: {e}")
+            finally:
+                self.queue.task_done()
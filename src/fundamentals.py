@@ -0,0 +1,80 @@
+"""
+Fundamentals Module - Locally stored company info with TTL and background refresh
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+import sys
+import os
+import threading
+import time
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config
+
+
+class FundamentalsStore:
+    """Serve company info from the database, refreshing stale entries in the background"""
+
+    def __init__(self, db, collector, ttl=None, retry=None, max_workers=2):
+        """Initialize store on top of a database and a collector used for refreshes"""
+        self.db = db
+        self.collector = collector
+        self.ttl = ttl if ttl is not None else config.FUNDAMENTALS_TTL
+        self.retry = retry if retry is not None else config.FUNDAMENTALS_RETRY
+        self.failed = {}        # ticker -> time of the last failed or empty fetch
+        self.executor = ThreadPoolExecutor(max_workers=max_workers,
+                                           thread_name_prefix='fundamentals')
+        self.pending = set()
+        self.lock = threading.Lock()
+
+    def is_stale(self, fetched_at):
+        """Check whether a fetch time is older than the TTL"""
+        return fetched_at is None or time.time() - fetched_at > self.ttl
+
+    def recently_failed(self, ticker):
+        """Check whether the last fetch failed within the retry interval"""
+        failed_at = self.failed.get(ticker)
+        return failed_at is not None and time.time() - failed_at <= self.retry
+
+    def get(self, ticker):
+        """Get stored info immediately (stale-while-revalidate); {} if never fetched"""
+        info, fetched_at = self.db.get_fundamentals(ticker)
+
+        # A failed fetch stores nothing, so without the retry interval every
+        # rerun would queue another refresh for the same ticker
+        if self.is_stale(fetched_at) and not self.recently_failed(ticker):
+            self.refresh_async(ticker)
+
+        return info or {}
+
+    def refresh_async(self, ticker):
+        """Queue a background refresh unless one is already running for the ticker"""
+        with self.lock:
+            if ticker in self.pending:
+                return False
+            self.pending.add(ticker)
+
+        self.executor.submit(self._refresh, ticker)
+        return True
+
+    def is_refreshing(self, ticker):
+        """Check whether a background refresh is in flight for the ticker"""
+        with self.lock:
+            return ticker in self.pending
+
+    def _refresh(self, ticker):
+        """Fetch and store info for one ticker"""
+        try:
+            info = self.collector.fetch_stock_info(ticker)
+            if info and self.db.save_stock_info(ticker, info):
+                self.failed.pop(ticker, None)
+            else:
+                self.failed[ticker] = time.time()
+        except Exception as e:
+            print(f"⚠️  Background fundamentals refresh failed for {ticker}: {e}")
+            self.failed[ticker] = time.time()
+        finally:
+            with self.lock:
+                self.pending.discard(ticker)
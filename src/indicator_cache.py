@@ -0,0 +1,161 @@
+"""
+Indicator Cache Module - Reuse indicator and signal results until prices or parameters change
+"""
+
+from collections import OrderedDict
+import glob
+import hashlib
+import json
+import os
+import pickle
+import sys
+import threading
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config
+from src import metrics
+
+
+class IndicatorCache:
+    """Two-tier (memory LRU + optional disk) cache of analysis results"""
+
+    def __init__(self, max_entries=None, cache_dir=None):
+        """Initialize cache; cache_dir=None keeps it memory-only"""
+        self.max_entries = max_entries or config.INDICATOR_CACHE_SIZE
+        self.cache_dir = cache_dir if cache_dir is not None else config.INDICATOR_CACHE_DIR
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        if self.cache_dir:
+            os.makedirs(self.cache_dir, exist_ok=True)
+
+    def _disk_path(self, key):
+        """File holding a key's entry; the ticker prefix allows per-ticker invalidation"""
+        digest = hashlib.sha1(repr(key).encode()).hexdigest()
+        return os.path.join(self.cache_dir, f"{self._safe_ticker(key[0])}-{digest}.pkl")
+
+    def _safe_ticker(self, ticker):
+        """Ticker usable in a file name"""
+        return ''.join(c if c.isalnum() else '_' for c in ticker)
+
+    def get(self, key):
+        """Get a cached value, or None on a miss"""
+        with self.lock:
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                metrics.inc('cache_requests_total', cache='indicator', result='hit')
+                return self.entries[key]
+
+        if self.cache_dir:
+            path = self._disk_path(key)
+            try:
+                with open(path, 'rb') as f:
+                    value = pickle.load(f)
+                self._remember(key, value)
+                with self.lock:
+                    self.disk_hits += 1
+                metrics.inc('cache_requests_total', cache='indicator', result='disk_hit')
+                return value
+            except FileNotFoundError:
+                pass
+            except Exception as e:
+                print(f"⚠️  Discarding unreadable cache file {path}: {e}")
+
+        with self.lock:
+            self.misses += 1
+        metrics.inc('cache_requests_total', cache='indicator', result='miss')
+        return None
+
+    def put(self, key, value):
+        """Store a value in both tiers"""
+        self._remember(key, value)
+
+        if self.cache_dir:
+            path = self._disk_path(key)
+            tmp_path = f"{path}.tmp"
+            try:
+                with open(tmp_path, 'wb') as f:
+                    pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(tmp_path, path)
+            except Exception as e:
+                print(f"⚠️  Could not write cache file {path}: {e}")
+
+    def _remember(self, key, value):
+        """Insert into the memory tier, evicting the least recently used entry"""
+        with self.lock:
+            self.entries[key] = value
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def invalidate(self, tickers):
+        """Drop every cached entry for the given tickers"""
+        tickers = set(tickers)
+
+        with self.lock:
+            for key in [k for k in self.entries if k[0] in tickers]:
+                del self.entries[key]
+
+        if self.cache_dir:
+            for ticker in tickers:
+                for path in glob.glob(os.path.join(self.cache_dir, f"{self._safe_ticker(ticker)}-*.pkl")):
+                    try:
+                        os.remove(path)
+                    except OSError:
+                        pass
+
+    def stats(self):
+        """Get hit/miss counts and the memory hit rate"""
+        with self.lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {
+                'entries': len(self.entries),
+                'hits': self.hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'hit_rate': (self.hits + self.disk_hits) / lookups if lookups else 0.0,
+            }
+
+
+class CachedAnalyzer:
+    """TechnicalAnalyzer front end that skips loading and recomputing unchanged tickers"""
+
+    def __init__(self, analyzer, db, cache=None):
+        """Wrap an analyzer and database; price writes invalidate the cache"""
+        self.analyzer = analyzer
+        self.db = db
+        self.cache = cache or IndicatorCache()
+        self.db.add_write_listener(self.cache.invalidate)
+
+    def params_hash(self):
+        """Short hash of the analyzer's indicator parameters"""
+        params = json.dumps(self.analyzer.get_params(), sort_keys=True)
+        return hashlib.sha1(params.encode()).hexdigest()[:12]
+
+    def analyze(self, ticker, load, variant=None, on_compute=None):
+        """Get (df_with_indicators, signals), calling load() and on_compute(df, signals) only on a miss"""
+        key = (ticker, self.db.get_data_version(ticker), self.params_hash(), variant)
+
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        df = load()
+        if df is None or df.empty:
+            return None, {}
+
+        df_with_indicators = self.analyzer.calculate_all_indicators(df)
+        signals = self.analyzer.generate_signals(df_with_indicators)
+
+        if on_compute:
+            on_compute(df_with_indicators, signals)
+
+        self.cache.put(key, (df_with_indicators, signals))
+        return df_with_indicators, signals
@@ -0,0 +1,116 @@
+"""
+Jobs Module - Run long tasks (like watchlist collection) on background threads
+"""
+
+import threading
+import time
+
+
+class Job:
+    """A background task with thread-safe progress tracking"""
+
+    def __init__(self, name, total=0):
+        """Initialize a pending job"""
+        self.name = name
+        self.total = total
+        self.done = 0
+        self.succeeded = 0
+        self.errors = []
+        self.current = None
+        self.status = 'pending'
+        self.result = None
+        self.error = None
+        self.started_at = None
+        self.finished_at = None
+        self.lock = threading.Lock()
+
+    def advance(self, item, result=None):
+        """Record one finished item; pass as a collect_watchlist progress callback"""
+        with self.lock:
+            self.done += 1
+            self.current = item
+            if result is None or result.get('success'):
+                self.succeeded += 1
+            else:
+                self.errors.append(item)
+
+    def eta(self):
+        """Estimated seconds remaining, or None before the first item finishes"""
+        with self.lock:
+            if not self.started_at or not self.done or not self.total:
+                return None
+            elapsed = time.time() - self.started_at
+            return elapsed / self.done * max(self.total - self.done, 0)
+
+    @property
+    def running(self):
+        """True while the job has not finished"""
+        return self.status in ('pending', 'running')
+
+    def progress(self):
+        """Get a snapshot of the job's progress"""
+        eta = self.eta()
+        with self.lock:
+            end = self.finished_at or time.time()
+            return {
+                'name': self.name,
+                'status': self.status,
+                'total': self.total,
+                'done': self.done,
+                'succeeded': self.succeeded,
+                'errors': list(self.errors),
+                'current': self.current,
+                'fraction': min(self.done / self.total, 1.0) if self.total else 0.0,
+                'elapsed': end - self.started_at if self.started_at else 0.0,
+                'eta': eta,
+                'error': self.error,
+            }
+
+
+class JobManager:
+    """Start jobs on background threads, at most one running job per name"""
+
+    def __init__(self):
+        """Initialize an empty job registry"""
+        self.jobs = {}
+        self.lock = threading.Lock()
+
+    def submit(self, name, func, *args, total=0, **kwargs):
+        """Run func(job, *args, **kwargs) in the background, or return the job already running"""
+        with self.lock:
+            existing = self.jobs.get(name)
+            if existing and existing.running:
+                return existing
+
+            job = Job(name, total=total)
+            self.jobs[name] = job
+
+        thread = threading.Thread(target=self._run, args=(job, func, args, kwargs),
+                                  name=f"job-{name}", daemon=True)
+        thread.start()
+        return job
+
+    def _run(self, job, func, args, kwargs):
+        """Execute a job and record its outcome"""
+        job.started_at = time.time()
+        job.status = 'running'
+
+        try:
+            job.result = func(job, *args, **kwargs)
+            job.status = 'done'
+        except Exception as e:
+            print(f"❌ Job {job.name} failed: {e}")
+            job.error = str(e)
+            job.status = 'failed'
+        finally:
+            job.finished_at = time.time()
+
+    def get(self, name):
+        """Get the latest job with this name, or None"""
+        with self.lock:
+            return self.jobs.get(name)
+
+    def is_running(self, name):
+        """Check whether a job with this name is running"""
+        job = self.get(name)
+        return job is not None and job.running
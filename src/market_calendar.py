@@ -0,0 +1,182 @@
+"""
+Market Calendar Module - NYSE trading days, holidays and session hours
+"""
+
+from datetime import date, datetime, time, timedelta
+from functools import lru_cache
+from zoneinfo import ZoneInfo
+
+
+MARKET_TZ = ZoneInfo('America/New_York')
+MARKET_OPEN = time(9, 30)
+MARKET_CLOSE = time(16, 0)
+EARLY_CLOSE = time(13, 0)
+
+
+def easter(year):
+    """Gregorian Easter Sunday (anonymous Gregorian algorithm)"""
+    a = year % 19
+    b, c = divmod(year, 100)
+    d, e = divmod(b, 4)
+    f = (b + 8) // 25
+    g = (b - f + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * l) // 451
+    month, day = divmod(h + l - 7 * m + 114, 31)
+    return date(year, month, day + 1)
+
+
+def nth_weekday(year, month, weekday, n):
+    """The nth given weekday (Mon=0) of a month; n=-1 for the last one"""
+    if n > 0:
+        first = date(year, month, 1)
+        return first + timedelta(days=(weekday - first.weekday()) % 7 + 7 * (n - 1))
+
+    next_month = date(year + month // 12, month % 12 + 1, 1)
+    last = next_month - timedelta(days=1)
+    return last - timedelta(days=(last.weekday() - weekday) % 7)
+
+
+def observed(day):
+    """Weekend holidays are observed on the Friday before or the Monday after"""
+    if day.weekday() == 5:
+        return day - timedelta(days=1)
+    if day.weekday() == 6:
+        return day + timedelta(days=1)
+    return day
+
+
+@lru_cache(maxsize=None)
+def nyse_holidays(year):
+    """Full-day NYSE closures for a year"""
+    holidays = {
+        nth_weekday(year, 2, 0, 3),     # Washington's Birthday
+        easter(year) - timedelta(days=2),  # Good Friday
+        nth_weekday(year, 5, 0, -1),    # Memorial Day
+        observed(date(year, 7, 4)),     # Independence Day
+        nth_weekday(year, 9, 0, 1),     # Labor Day
+        nth_weekday(year, 11, 3, 4),    # Thanksgiving
+        observed(date(year, 12, 25)),   # Christmas
+    }
+
+    # New Year's Day falling on a Saturday is not observed on Dec 31
+    new_year = date(year, 1, 1)
+    if new_year.weekday() != 5:
+        holidays.add(observed(new_year))
+
+    if year >= 1998:
+        holidays.add(nth_weekday(year, 1, 0, 3))       # Martin Luther King Jr. Day
+    if year >= 2022:
+        holidays.add(observed(date(year, 6, 19)))      # Juneteenth
+
+    return frozenset(holidays)
+
+
+@lru_cache(maxsize=None)
+def nyse_early_closes(year):
+    """Sessions that close at 1:00 PM"""
+    candidates = [
+        date(year, 7, 3),                                  # Day before Independence Day
+        nth_weekday(year, 11, 3, 4) + timedelta(days=1),   # Day after Thanksgiving
+        date(year, 12, 24),                                # Christmas Eve
+    ]
+    holidays = nyse_holidays(year)
+    return frozenset(d for d in candidates if d.weekday() < 5 and d not in holidays)
+
+
+class TradingCalendar:
+    """NYSE sessions and regular market hours in exchange time"""
+
+    def __init__(self, tz=MARKET_TZ):
+        """Initialize calendar for an exchange time zone"""
+        self.tz = tz
+
+    def now(self):
+        """Current exchange-local time"""
+        return datetime.now(self.tz)
+
+    def _to_date(self, value):
+        """Accept date, datetime, pandas Timestamp or YYYY-MM-DD string"""
+        if isinstance(value, str):
+            return date.fromisoformat(value[:10])
+        if isinstance(value, datetime):
+            return value.date()
+        return value
+
+    def is_trading_day(self, day):
+        """Check whether the exchange holds a session on a date"""
+        day = self._to_date(day)
+        return day.weekday() < 5 and day not in nyse_holidays(day.year)
+
+    def session_hours(self, day):
+        """Get (open, close) exchange-local datetimes, or None if closed"""
+        day = self._to_date(day)
+        if not self.is_trading_day(day):
+            return None
+
+        close = EARLY_CLOSE if day in nyse_early_closes(day.year) else MARKET_CLOSE
+        return (datetime.combine(day, MARKET_OPEN, self.tz),
+                datetime.combine(day, close, self.tz))
+
+    def is_open(self, now=None):
+        """Check whether the regular session is in progress"""
+        now = (now or self.now()).astimezone(self.tz)
+        hours = self.session_hours(now.date())
+        return hours is not None and hours[0] <= now < hours[1]
+
+    def sessions(self, start, end):
+        """Trading days in [start, end]"""
+        day, end = self._to_date(start), self._to_date(end)
+        days = []
+        while day <= end:
+            if self.is_trading_day(day):
+                days.append(day)
+            day += timedelta(days=1)
+        return days
+
+    def previous_session(self, day):
+        """Last trading day strictly before a date"""
+        day = self._to_date(day) - timedelta(days=1)
+        while not self.is_trading_day(day):
+            day -= timedelta(days=1)
+        return day
+
+    def next_session(self, day):
+        """First trading day strictly after a date"""
+        day = self._to_date(day) + timedelta(days=1)
+        while not self.is_trading_day(day):
+            day += timedelta(days=1)
+        return day
+
+    def latest_session(self, now=None):
+        """Most recent session that has opened (today once the bell rings)"""
+        now = (now or self.now()).astimezone(self.tz)
+        hours = self.session_hours(now.date())
+        if hours is not None and now >= hours[0]:
+            return now.date()
+        return self.previous_session(now.date())
+
+    def last_completed_session(self, now=None):
+        """Most recent session that has closed (today only after the closing bell)"""
+        now = (now or self.now()).astimezone(self.tz)
+        hours = self.session_hours(now.date())
+        if hours is not None and now >= hours[1]:
+            return now.date()
+        return self.previous_session(now.date())
+
+    def missing_sessions(self, last_date, now=None):
+        """Sessions after a stored bar date up to the latest session"""
+        latest = self.latest_session(now)
+        if last_date is None:
+            return [latest]
+        return self.sessions(self.next_session(last_date), latest)
+
+    def next_open(self, now=None):
+        """Exchange-local datetime of the next session open"""
+        now = (now or self.now()).astimezone(self.tz)
+        hours = self.session_hours(now.date())
+        if hours is not None and now < hours[0]:
+            return hours[0]
+        return self.session_hours(self.next_session(now.date()))[0]
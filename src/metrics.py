@@ -0,0 +1,349 @@
+"""
+Metrics Module - Lightweight timers and counters for the collection, storage and analysis paths
+
+Everything is recorded in one in-process registry and exported in the
+Prometheus text format, either as a file per process under METRICS_DIR (for
+node_exporter's textfile collector or a quick look) or over HTTP on
+METRICS_PORT.
+"""
+
+import functools
+import logging
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config
+
+PREFIX = 'stock_analysis_'
+
+HELP = {
+    'fetch_seconds': "Upstream provider request latency",
+    'fetch_errors_total': "Failed upstream provider requests",
+    'rate_limit_wait_seconds': "Time spent waiting on the request rate limiters",
+    'db_query_seconds': "Database read time",
+    'db_write_seconds': "Database write time",
+    'db_rows_written_total': "Rows written to the database",
+    'indicator_seconds': "Indicator and signal calculation time",
+    'cache_requests_total': "Cache lookups by result",
+    'dashboard_stage_seconds': "Dashboard render time per stage",
+    'dashboard_rerun_seconds': "Dashboard script run time per rerun",
+}
+
+_logging_ready = False
+_logging_lock = threading.Lock()
+
+
+def setup_logging():
+    """Configure the package logger from LOG_LEVEL and LOG_FILE (once per process)"""
+    global _logging_ready
+
+    with _logging_lock:
+        logger = logging.getLogger('stock_analysis')
+        if _logging_ready:
+            return logger
+
+        logger.setLevel(getattr(logging, str(config.LOG_LEVEL).upper(), logging.INFO))
+        logger.propagate = False
+
+        if config.LOG_FILE:
+            try:
+                os.makedirs(os.path.dirname(os.path.abspath(config.LOG_FILE)), exist_ok=True)
+                handler = logging.FileHandler(config.LOG_FILE)
+            except OSError as e:
+                print(f"⚠️  Could not open log file {config.LOG_FILE}: {e}")
+                handler = logging.StreamHandler()
+        else:
+            handler = logging.StreamHandler()
+
+        handler.setFormatter(logging.Formatter(
+            '%(asctime)s %(levelname)s [%(process)d] %(name)s: %(message)s'))
+        logger.addHandler(handler)
+
+        _logging_ready = True
+        return logger
+
+
+def get_logger(name):
+    """Logger for a module, e.g. get_logger('collector') -> stock_analysis.collector
+
+    Entry points call setup_logging(); until then only warnings and errors
+    reach stderr, so importing a module never creates the log file.
+    """
+    return logging.getLogger(f'stock_analysis.{name}')
+
+
+log = get_logger('metrics')
+
+
+def _key(labels):
+    """Hashable, ordered form of a label dict"""
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _label_text(labels):
+    """Labels as 'key=value key=value' for logs and reports"""
+    return ' '.join(f"{k}={v}" for k, v in dict(labels).items())
+
+
+class MetricsRegistry:
+    """Thread-safe counters and timers keyed by name and labels"""
+
+    def __init__(self):
+        """Initialize an empty registry"""
+        self.lock = threading.Lock()
+        self.counters = {}
+        self.timers = {}
+
+    def inc(self, name, value=1, **labels):
+        """Add to a counter"""
+        key = (name, _key(labels))
+        with self.lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def observe(self, name, seconds, **labels):
+        """Record one timed call"""
+        key = (name, _key(labels))
+        with self.lock:
+            stats = self.timers.get(key)
+            if stats is None:
+                self.timers[key] = [1, seconds, seconds]
+            else:
+                stats[0] += 1
+                stats[1] += seconds
+                stats[2] = max(stats[2], seconds)
+
+    def snapshot(self):
+        """Copy of every series as {'counters': [...], 'timers': [...]} of plain dicts"""
+        with self.lock:
+            counters = [
+                {'name': name, 'labels': dict(labels), 'value': value}
+                for (name, labels), value in sorted(self.counters.items())
+            ]
+            timers = [
+                {'name': name, 'labels': dict(labels), 'count': count, 'sum': total,
+                 'mean': total / count, 'max': peak}
+                for (name, labels), (count, total, peak) in sorted(self.timers.items())
+            ]
+        return {'counters': counters, 'timers': timers}
+
+    def reset(self):
+        """Drop every series"""
+        with self.lock:
+            self.counters.clear()
+            self.timers.clear()
+
+    def render(self):
+        """Every series in the Prometheus text exposition format"""
+        snap = self.snapshot()
+        lines = []
+
+        def series(name, labels, value):
+            body = ','.join(f'{k}="{_escape(v)}"' for k, v in labels.items())
+            lines.append(f"{PREFIX}{name}{{{body}}} {value:.9g}" if body else f"{PREFIX}{name} {value:.9g}")
+
+        def header(name, kind, seen):
+            if name not in seen:
+                seen.add(name)
+                if name in HELP:
+                    lines.append(f"# HELP {PREFIX}{name} {HELP[name]}")
+                lines.append(f"# TYPE {PREFIX}{name} {kind}")
+
+        seen = set()
+        for item in snap['counters']:
+            header(item['name'], 'counter', seen)
+            series(item['name'], item['labels'], item['value'])
+
+        # Timers are summaries without quantiles, plus a max gauge
+        for item in snap['timers']:
+            header(item['name'], 'summary', seen)
+            series(item['name'] + '_count', item['labels'], item['count'])
+            series(item['name'] + '_sum', item['labels'], item['sum'])
+        for item in snap['timers']:
+            header(item['name'] + '_max', 'gauge', seen)
+            series(item['name'] + '_max', item['labels'], item['max'])
+
+        return '\n'.join(lines) + '\n'
+
+
+def _escape(value):
+    """Escape a label value for the text format"""
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+REGISTRY = MetricsRegistry()
+
+
+def inc(name, value=1, **labels):
+    """Add to a counter in the process registry"""
+    if config.METRICS_ENABLED:
+        REGISTRY.inc(name, value, **labels)
+
+
+def observe(name, seconds, **labels):
+    """Record a duration in the process registry"""
+    if config.METRICS_ENABLED:
+        REGISTRY.observe(name, seconds, **labels)
+
+
+@contextmanager
+def timer(name, **labels):
+    """Time the body of a with block (recorded even if it raises)"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        observe(name, elapsed, **labels)
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug("%s %s %.4fs", name, _label_text(_key(labels)), elapsed)
+
+
+def timed(name, **labels):
+    """Decorator form of timer()"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with timer(name, **labels):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+class StageTimer:
+    """Breakdown of one run (e.g. a dashboard rerun) into named stages"""
+
+    def __init__(self, name='dashboard_stage_seconds'):
+        """Start the run clock; stages are also recorded under `name`"""
+        self.name = name
+        self.started = time.perf_counter()
+        self.last = self.started
+        self.stages = []
+
+    def _record(self, label, elapsed):
+        """Add a finished stage"""
+        self.stages.append((label, elapsed))
+        observe(self.name, elapsed, stage=label)
+
+    @contextmanager
+    def stage(self, label):
+        """Time one stage of the run"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.last = time.perf_counter()
+            self._record(label, self.last - started)
+
+    def lap(self, label):
+        """Close a stage that ran since the previous lap (or the start), for straight-line scripts"""
+        now = time.perf_counter()
+        self._record(label, now - self.last)
+        self.last = now
+
+    def elapsed(self):
+        """Seconds since the run started"""
+        return time.perf_counter() - self.started
+
+
+def summary(snapshot=None):
+    """Human-readable report lines: timers by total time, then counters and derived rates"""
+    snap = snapshot or REGISTRY.snapshot()
+    lines = []
+
+    timers = sorted(snap['timers'], key=lambda t: t['sum'], reverse=True)
+    if timers:
+        lines.append(f"{'timer':<48}{'calls':>8}{'total':>11}{'mean':>11}{'max':>11}")
+        for t in timers:
+            name = f"{t['name']} {_label_text(t['labels'])}".strip()
+            lines.append(f"{name:<48}{t['count']:>8}{t['sum']:>10.3f}s"
+                         f"{t['mean'] * 1000:>9.2f}ms{t['max'] * 1000:>9.1f}ms")
+
+    counters = {(c['name'], _key(c['labels'])): c['value'] for c in snap['counters']}
+    if counters:
+        lines.append('')
+        for (name, labels), value in counters.items():
+            lines.append(f"{name} {_label_text(labels)}".strip() + f": {value:,.0f}")
+
+    # Rows per second of write time, per table
+    for t in snap['timers']:
+        if t['name'] == 'db_write_seconds' and t['sum']:
+            rows = counters.get(('db_rows_written_total', _key(t['labels'])), 0)
+            lines.append(f"rows/s {_label_text(t['labels'])}: {rows / t['sum']:,.0f}")
+
+    # Hit rate per cache
+    caches = {}
+    for (name, labels), value in counters.items():
+        if name == 'cache_requests_total':
+            labels = dict(labels)
+            hits, total = caches.get(labels.get('cache'), (0, 0))
+            hit = value if labels.get('result') != 'miss' else 0
+            caches[labels.get('cache')] = (hits + hit, total + value)
+    for cache, (hits, total) in caches.items():
+        lines.append(f"cache hit rate cache={cache}: {hits / total:.1%}")
+
+    return lines
+
+
+def write_metrics(job, directory=None):
+    """Write the registry to {METRICS_DIR}/{job}.prom atomically; returns the path or None"""
+    directory = directory or config.METRICS_DIR
+    if not directory or not config.METRICS_ENABLED:
+        return None
+
+    path = os.path.join(directory, f"{job}.prom")
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(directory, exist_ok=True)
+        with open(tmp_path, 'w') as f:
+            f.write(REGISTRY.render())
+        os.replace(tmp_path, path)
+        return path
+    except OSError as e:
+        log.warning("Could not write metrics file %s: %s", path, e)
+        return None
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    """Serves the registry at /metrics"""
+
+    def do_GET(self):
+        """Return the text exposition, or 404 for other paths"""
+        if self.path.split('?')[0] not in ('/', '/metrics'):
+            self.send_error(404)
+            return
+
+        body = REGISTRY.render().encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        """Route access logs to the package logger instead of stderr"""
+        log.debug("metrics endpoint: " + format, *args)
+
+
+def serve(port=None, host='127.0.0.1'):
+    """Serve /metrics on a daemon thread; returns the server, or None if disabled or taken"""
+    port = port or config.METRICS_PORT
+    if not port or not config.METRICS_ENABLED:
+        return None
+
+    try:
+        server = ThreadingHTTPServer((host, int(port)), _MetricsHandler)
+    except OSError as e:
+        log.warning("Could not serve metrics on %s:%s: %s", host, port, e)
+        return None
+
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name='metrics-http', daemon=True).start()
+    log.info("Serving metrics on http://%s:%s/metrics", host, port)
+    return server
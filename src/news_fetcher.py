@@ -2,16 +2,24 @@
 News Fetcher Module - Fetch and analyze stock-related news
 """
 
-import yfinance as yf
 from datetime import datetime, timedelta
 import re
+import sys
+import os
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src import metrics
+from src.providers import get_provider
 
 
 class NewsFetcher:
     """Fetch news and perform basic sentiment analysis"""
     
-    def __init__(self):
+    def __init__(self, provider=None):
         """Initialize news fetcher"""
+        self.provider = provider or get_provider()
         self.sentiment_words = {
             'positive': [
                 'surge', 'soar', 'rally', 'gain', 'rise', 'jump', 'climb', 'boost', 
@@ -30,11 +38,10 @@ class NewsFetcher:
     def fetch_news(self, ticker, max_articles=10):
         """Fetch recent news for a stock ticker"""
         try:
-            stock = yf.Ticker(ticker)
-
             # Try to get news
             try:
-                news = stock.news
+                with metrics.timer('fetch_seconds', endpoint='news', provider=self.provider.name):
+                    news = self.provider.news(ticker)
             except AttributeError:
                 # Fallback: try alternative method
                 print(f"News attribute not available for {ticker}, trying alternative...")
@@ -0,0 +1,268 @@
+"""
+Optimizer Module - Parallel parameter sweeps of the indicator settings over stored history
+"""
+
+import argparse
+import itertools
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config
+from src.analyzer import TechnicalAnalyzer
+from src.backtest import simulate, ticker_statistics
+from src.batch_indicators import compact, ema, rolling_mean, rolling_std, rsi
+from src.database import StockDatabase
+
+# TechnicalAnalyzer settings a sweep can vary, in get_params() order
+PARAMS = ['short_window', 'long_window', 'rsi_period', 'macd_fast', 'macd_slow',
+          'macd_signal', 'bb_period', 'bb_std']
+
+# 216 points around the config.py defaults
+DEFAULT_GRID = {
+    'short_window': [10, 20, 30],
+    'long_window': [50, 100, 200],
+    'rsi_period': [7, 14, 21],
+    'macd_fast': [8, 12],
+    'macd_slow': [21, 26],
+    'bb_std': [2, 2.5],
+}
+
+# Statistics where smaller is better (max_drawdown is negative, so it ranks like returns)
+LOWER_IS_BETTER = {'volatility', 'turnover'}
+
+
+def expand_grid(grid):
+    """Every combination of a {param: values} grid as a list of param dicts
+
+    Params missing from the grid keep their config.py value. Combinations
+    whose fast window is not shorter than its slow window are skipped.
+    """
+    defaults = TechnicalAnalyzer().get_params()
+    values = [list(grid.get(name) or [defaults[name]]) for name in PARAMS]
+
+    points = []
+    for combo in itertools.product(*values):
+        params = dict(zip(PARAMS, combo))
+        if params['short_window'] < params['long_window'] and params['macd_fast'] < params['macd_slow']:
+            points.append(params)
+    return points
+
+
+class IntermediateCache:
+    """Indicator building blocks shared between grid points, each computed once
+
+    Points that differ only in the RSI period reuse the same moving averages,
+    every MACD signal span reuses one MACD line, and each EMA span and rolling
+    window is calculated a single time for the whole grid.
+    """
+
+    def __init__(self, close):
+        """Initialize cache over a compacted dates x tickers close array"""
+        self.close = close
+        self.cache = {}
+
+    def _get(self, key, func, *args):
+        """Compute func(*args) the first time a key is requested"""
+        if key not in self.cache:
+            self.cache[key] = func(*args)
+        return self.cache[key]
+
+    def sma(self, window):
+        """Simple moving average of close"""
+        return self._get(('sma', window), rolling_mean, self.close, window)
+
+    def std(self, window):
+        """Rolling standard deviation of close"""
+        return self._get(('std', window), rolling_std, self.close, window)
+
+    def ema(self, span):
+        """Exponential moving average of close"""
+        return self._get(('ema', span), ema, self.close, span)
+
+    def rsi(self, period):
+        """Relative Strength Index"""
+        return self._get(('rsi', period), rsi, self.close, period)
+
+    def macd(self, fast, slow):
+        """MACD line (fast EMA minus slow EMA)"""
+        return self._get(('macd', fast, slow), np.subtract, self.ema(fast), self.ema(slow))
+
+    def macd_signal(self, fast, slow, span):
+        """Signal line over a MACD line"""
+        return self._get(('macd_signal', fast, slow, span), ema, self.macd(fast, slow), span)
+
+    def indicators(self, params):
+        """Indicators used by generate_signal_series() for one grid point"""
+        middle = self.sma(params['bb_period'])
+        width = self.std(params['bb_period']) * params['bb_std']
+
+        return {
+            'SMA_20': self.sma(params['short_window']),
+            'SMA_50': self.sma(params['long_window']),
+            'RSI': self.rsi(params['rsi_period']),
+            'MACD': self.macd(params['macd_fast'], params['macd_slow']),
+            'MACD_Signal': self.macd_signal(params['macd_fast'], params['macd_slow'], params['macd_signal']),
+            'BB_Upper': middle + width,
+            'BB_Lower': middle - width,
+        }
+
+
+def evaluate_block(close, points, cost, allow_short=False):
+    """Backtest every grid point on a block of tickers
+
+    Returns {statistic: (points x tickers) array}. Runs in worker processes.
+    """
+    # Compacted columns hold each ticker's own bars back to back, as in a
+    # per-ticker backtest; rows past a ticker's last bar are masked out
+    valid = ~np.isnan(close)
+    if not valid.all():
+        close, order = compact(close)
+        valid = np.take_along_axis(valid, order, axis=0)
+
+    cache = IntermediateCache(close)
+    analyzer = TechnicalAnalyzer()
+
+    results = {}
+    for i, params in enumerate(points):
+        signals = analyzer.generate_signal_series(close, cache.indicators(params))
+        _, held, returns = simulate(close, signals['overall'], cost, allow_short)
+
+        for name, values in ticker_statistics(returns, valid, held, cost).items():
+            if name not in results:
+                results[name] = np.empty((len(points), close.shape[1]))
+            results[name][i] = values
+
+    return results
+
+
+class ParameterOptimizer:
+    """Sweep a grid of TechnicalAnalyzer parameters across a process pool"""
+
+    def __init__(self, db=None, workers=None, commission=None, slippage=None, allow_short=None):
+        """Initialize optimizer with worker count and backtest costs"""
+        self.db = db or StockDatabase(config.DATABASE_PATH)
+        self.workers = workers or config.OPTIMIZER_WORKERS or os.cpu_count() or 1
+        commission = config.BACKTEST_COMMISSION if commission is None else commission
+        slippage = config.BACKTEST_SLIPPAGE if slippage is None else slippage
+        self.cost = commission + slippage
+        self.allow_short = config.BACKTEST_ALLOW_SHORT if allow_short is None else allow_short
+
+    def run(self, grid=None, tickers=None, start_date=None, end_date=None, sweep_id=None, save=True):
+        """Backtest every grid point on every ticker and store one row per pair
+
+        Indicators warm up inside [start_date, end_date], so the first bars of
+        the range never trade.
+        """
+        points = expand_grid(grid or DEFAULT_GRID)
+        panel = self.db.get_price_panel(tickers, start_date, end_date, fields=['close'])
+        if not points or not len(panel.dates):
+            return pd.DataFrame()
+
+        sweep_id = sweep_id or datetime.now().strftime('sweep-%Y%m%d-%H%M%S')
+        print(f"\n🧪 {sweep_id}: {len(points)} parameter sets x {len(panel.tickers)} tickers "
+              f"on {self.workers} workers")
+
+        # One block of tickers per worker, so each worker computes a span's EMA
+        # or a window's rolling mean once for its whole share of the grid
+        close = panel['close']
+        blocks = [b for b in np.array_split(np.arange(len(panel.tickers)), self.workers) if len(b)]
+
+        started = time.monotonic()
+        frames = []
+        if len(blocks) == 1:
+            frames.append(self._frame(panel, blocks[0], evaluate_block(close, points, self.cost,
+                                                                       self.allow_short)))
+        else:
+            with ProcessPoolExecutor(max_workers=len(blocks)) as pool:
+                futures = {
+                    pool.submit(evaluate_block, close[:, block], points, self.cost, self.allow_short): block
+                    for block in blocks
+                }
+                for done, future in enumerate(as_completed(futures), 1):
+                    frames.append(self._frame(panel, futures[future], future.result()))
+                    print(f"  [{done}/{len(blocks)}] blocks done ({time.monotonic() - started:.1f}s)")
+
+        params = pd.DataFrame(points, columns=PARAMS)
+        results = pd.concat(frames, ignore_index=True)
+        results = results.join(params, on='point').sort_values(['point', 'ticker'], ignore_index=True)
+        print(f"✅ {len(results)} backtests in {time.monotonic() - started:.1f}s")
+
+        if save:
+            self.db.save_sweep_results(sweep_id, results)
+        results.insert(0, 'sweep_id', sweep_id)
+        return results
+
+    def _frame(self, panel, block, stats):
+        """Long-format rows (point, ticker, statistics...) for one block's results"""
+        points, width = next(iter(stats.values())).shape
+        frame = pd.DataFrame({
+            'point': np.repeat(np.arange(points), width),
+            'ticker': np.tile(np.asarray(panel.tickers, dtype=object)[block], points),
+        })
+        for name, values in stats.items():
+            frame[name] = values.ravel()
+        return frame
+
+
+def best_parameters(results, metric=None, per_ticker=False):
+    """Rank parameter sets by their mean metric across tickers, or pick each ticker's best"""
+    metric = metric or config.OPTIMIZER_METRIC
+    ascending = metric in LOWER_IS_BETTER
+
+    if per_ticker:
+        ranked = results.dropna(subset=[metric]).sort_values(metric, ascending=ascending)
+        return ranked.groupby('ticker', sort=True).head(1).set_index('ticker')[PARAMS + [metric]]
+
+    ranked = results.groupby('point').agg({**{name: 'first' for name in PARAMS}, metric: 'mean'})
+    return ranked.sort_values(metric, ascending=ascending)
+
+
+def main():
+    """Run a parameter sweep from the command line"""
+    parser = argparse.ArgumentParser(description="Sweep indicator parameters over stored history")
+    parser.add_argument('--tickers', nargs='+', help="tickers to evaluate (default: all stored)")
+    parser.add_argument('--start', help="first date to load (YYYY-MM-DD)")
+    parser.add_argument('--end', help="last date to load (YYYY-MM-DD)")
+    parser.add_argument('--workers', type=int, help="worker processes (default: OPTIMIZER_WORKERS)")
+    parser.add_argument('--metric', default=config.OPTIMIZER_METRIC, help="statistic used to rank results")
+    parser.add_argument('--id', help="name for the stored sweep (default: sweep-<timestamp>)")
+    parser.add_argument('--list', action='store_true', help="list stored sweeps and exit")
+    for name in PARAMS:
+        parser.add_argument('--' + name.replace('_', '-'), nargs='+', type=float if name == 'bb_std' else int,
+                            help=f"values to try for {name}")
+    args = parser.parse_args()
+
+    optimizer = ParameterOptimizer(workers=args.workers)
+
+    if args.list:
+        with pd.option_context('display.width', 200):
+            print(optimizer.db.get_sweep_ids().to_string(index=False))
+        return
+
+    grid = dict(DEFAULT_GRID)
+    grid.update({name: getattr(args, name) for name in PARAMS if getattr(args, name)})
+
+    results = optimizer.run(grid, args.tickers, args.start, args.end, sweep_id=args.id)
+    if results.empty:
+        print("\n❌ No stored bars or no valid parameter sets")
+        return
+
+    with pd.option_context('display.width', 200, 'display.max_columns', None):
+        print(f"\n🏆 Best parameter sets by mean {args.metric}:")
+        print(best_parameters(results, args.metric).head(10).round(3).to_string())
+        print("\n🎯 Best parameter set per ticker:")
+        print(best_parameters(results, args.metric, per_ticker=True).head(20).round(3).to_string())
+    print()
+
+
+if __name__ == '__main__':
+    main()
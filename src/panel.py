@@ -0,0 +1,83 @@
+"""
+Panel Module - Aligned dates x tickers arrays for universe-wide analytics
+"""
+
+import numpy as np
+import pandas as pd
+
+
+class PricePanel:
+    """OHLCV history for many tickers on a shared date axis"""
+
+    FIELDS = ('open', 'high', 'low', 'close', 'volume')
+
+    def __init__(self, dates, tickers, fields, mask):
+        """Initialize panel from pre-aligned arrays"""
+        self.dates = dates                  # (T,) datetime64[D], ascending
+        self.tickers = list(tickers)        # column order
+        self.ticker_index = {ticker: i for i, ticker in enumerate(self.tickers)}
+        self.fields = fields                # name -> (T, N) float64, NaN where missing
+        self.mask = mask                    # (T, N) bool, True where a bar exists
+
+    @classmethod
+    def from_rows(cls, tickers, dates, columns, fields=None):
+        """Build a panel from long-format ticker/date/value columns"""
+        fields = list(fields or cls.FIELDS)
+        tickers = list(tickers)
+
+        if len(dates) == 0:
+            empty = np.empty((0, len(tickers)))
+            return cls(np.array([], dtype='datetime64[D]'), tickers,
+                       {name: empty.copy() for name in fields},
+                       np.zeros((0, len(tickers)), dtype=bool))
+
+        row_tickers = np.asarray(columns['ticker'])
+        row_dates = np.asarray(dates, dtype='datetime64[D]')
+
+        # Map each row onto the (date, ticker) grid
+        axis_dates, date_pos = np.unique(row_dates, return_inverse=True)
+        unique_tickers, ticker_codes = np.unique(row_tickers, return_inverse=True)
+        index = {ticker: i for i, ticker in enumerate(tickers)}
+        ticker_pos = np.array([index[t] for t in unique_tickers])[ticker_codes]
+
+        shape = (len(axis_dates), len(tickers))
+        mask = np.zeros(shape, dtype=bool)
+        mask[date_pos, ticker_pos] = True
+
+        arrays = {}
+        for name in fields:
+            values = np.full(shape, np.nan)
+            values[date_pos, ticker_pos] = np.asarray(columns[name], dtype=float)
+            arrays[name] = values
+
+        return cls(axis_dates, tickers, arrays, mask)
+
+    @property
+    def shape(self):
+        """(dates, tickers)"""
+        return self.mask.shape
+
+    def __getitem__(self, field):
+        """Get the dates x tickers array for a field"""
+        return self.fields[field]
+
+    def column(self, ticker, field='close'):
+        """Get one ticker's values for a field (NaN where missing)"""
+        return self.fields[field][:, self.ticker_index[ticker]]
+
+    def to_frame(self, ticker):
+        """Get one ticker's bars as a DataFrame like get_stock_data returns"""
+        i = self.ticker_index[ticker]
+        present = self.mask[:, i]
+
+        df = pd.DataFrame(
+            {name: values[present, i] for name, values in self.fields.items()},
+            index=pd.DatetimeIndex(self.dates[present], name='date')
+        )
+        return df
+
+    def to_wide(self, field='close'):
+        """Get a field as a dates x tickers DataFrame"""
+        return pd.DataFrame(self.fields[field],
+                            index=pd.DatetimeIndex(self.dates, name='date'),
+                            columns=self.tickers)
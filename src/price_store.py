@@ -0,0 +1,305 @@
+"""
+Price Store Module - Columnar, memory-mapped per-ticker OHLCV files
+"""
+
+import argparse
+import glob
+import os
+import sqlite3
+import sys
+import threading
+from urllib.parse import quote, unquote
+
+import numpy as np
+import pandas as pd
+
+try:
+    import fcntl
+except ImportError:  # Windows: cross-process locking is unavailable
+    fcntl = None
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config
+from src.panel import PricePanel
+
+
+class PriceStore:
+    """OHLCV stored as one (columns x capacity) float64 .npy file per ticker
+
+    Each column is contiguous on disk and dates are integer epoch days, so a
+    date range is a binary search plus a slice of a memory-mapped array.
+    Files are preallocated with spare columns (day = NaN) so new bars are
+    written in place instead of rewriting the whole history.
+    """
+
+    COLUMNS = ('day', 'open', 'high', 'low', 'close', 'volume')
+    ROW = {name: i for i, name in enumerate(COLUMNS)}
+    MIN_CAPACITY = 256      # bars allocated for a new file; grown by doubling
+
+    def __init__(self, root=None):
+        """Initialize store rooted at a directory"""
+        self.root = root or config.PRICE_STORE_DIR
+        os.makedirs(self.root, exist_ok=True)
+        self.lock = threading.Lock()
+
+    def _path(self, ticker):
+        """File holding a ticker's bars (symbols like ^GSPC are percent-encoded)"""
+        return os.path.join(self.root, quote(ticker, safe='') + '.npy')
+
+    def _load(self, ticker):
+        """Memory-map a ticker's stored bars, or None if it has no file"""
+        try:
+            data = np.load(self._path(ticker), mmap_mode='r')
+        except FileNotFoundError:
+            return None
+        return data[:, :self._used(data)]
+
+    @staticmethod
+    def _used(data):
+        """Number of stored bars; spare columns have a NaN day, which sorts last"""
+        return int(np.searchsorted(data[0], np.inf, side='right'))
+
+    def _lock_file(self):
+        """Open the file used to serialize writers across processes"""
+        handle = open(os.path.join(self.root, '.lock'), 'w')
+        if fcntl:
+            fcntl.flock(handle, fcntl.LOCK_EX)
+        return handle
+
+    @staticmethod
+    def to_days(dates):
+        """Convert dates to integer days since 1970-01-01"""
+        return np.asarray(dates, dtype='datetime64[D]').astype(np.int64)
+
+    @staticmethod
+    def from_days(days):
+        """Convert integer epoch days back to datetime64[D]"""
+        return np.asarray(days, dtype=np.int64).astype('datetime64[D]')
+
+    def _day_range(self, days, start_date=None, end_date=None):
+        """Slice bounds of [start_date, end_date] in a sorted day column"""
+        lo, hi = 0, len(days)
+        if start_date:
+            lo = np.searchsorted(days, self.to_days(pd.Timestamp(start_date).date()), 'left')
+        if end_date:
+            hi = np.searchsorted(days, self.to_days(pd.Timestamp(end_date).date()), 'right')
+        return lo, hi
+
+    def write(self, ticker, dates, values):
+        """Upsert bars given dates and {column: values}; returns the first revised date or None"""
+        days = self.to_days(dates)
+        if not len(days):
+            return None
+
+        new = np.empty((len(self.COLUMNS), len(days)))
+        new[0] = days
+        for name in self.COLUMNS[1:]:
+            new[self.ROW[name]] = np.asarray(values[name], dtype=float)
+
+        # Later rows win when a batch repeats a date, like successive upserts
+        order = np.argsort(days, kind='stable')
+        new = new[:, order]
+        keep = np.append(new[0, 1:] != new[0, :-1], True)
+        new = new[:, keep]
+
+        with self.lock:
+            handle = self._lock_file()
+            try:
+                path = self._path(ticker)
+                try:
+                    stored = np.load(path, mmap_mode='r+')
+                except FileNotFoundError:
+                    stored = np.empty((len(self.COLUMNS), 0))
+                used = self._used(stored)
+
+                # Only stored bars from the first new date on can change
+                first = int(np.searchsorted(stored[0, :used], new[0, 0]))
+                old = np.array(stored[:, first:used])
+                revised = None
+
+                overlap = np.isin(old[0], new[0])
+                if overlap.any():
+                    pos = np.searchsorted(new[0], old[0, overlap])
+                    old_close = old[self.ROW['close'], overlap]
+                    new_close = new[self.ROW['close'], pos]
+                    # Same REVISION_TOLERANCE rule as the SQLite revision triggers
+                    changed = ((np.isnan(old_close) != np.isnan(new_close)) |
+                               (np.abs(new_close - old_close) > config.REVISION_TOLERANCE * np.abs(old_close)))
+                    if changed.any():
+                        revised = np.datetime64(int(old[0, overlap][changed].min()), 'D')
+
+                tail = np.concatenate([old[:, ~overlap], new], axis=1)
+                tail = tail[:, np.argsort(tail[0], kind='stable')]
+                end = first + tail.shape[1]
+
+                if end <= stored.shape[1] and np.array_equal(tail[0, :old.shape[1]], old[0]):
+                    # Appends and updates keep every stored bar in place, so
+                    # only the tail is written. Days go last: readers count bars
+                    # by their day, so an appended bar appears whole
+                    stored[1:, first:end] = tail[1:]
+                    stored[0, first:end] = tail[0]
+                    stored.flush()
+                else:
+                    # Inserted bars shift the tail or the file is full: rewrite
+                    # beside the old file and swap, so mapped readers never see
+                    # a partial array
+                    merged = np.concatenate([np.array(stored[:, :first]), tail], axis=1)
+                    capacity = max(self.MIN_CAPACITY, 2 * merged.shape[1])
+                    grown = np.full((len(self.COLUMNS), capacity), np.nan)
+                    grown[:, :merged.shape[1]] = merged
+
+                    tmp_path = f"{path}.tmp"
+                    with open(tmp_path, 'wb') as f:
+                        np.save(f, grown)
+                    os.replace(tmp_path, path)
+                del stored
+            finally:
+                handle.close()
+
+        return revised
+
+    def get_stock_data(self, ticker, start_date=None, end_date=None, columns=None):
+        """Get bars as a DataFrame indexed by date, like StockDatabase.get_stock_data"""
+        if columns:
+            unknown = [c for c in columns if c not in ('ticker', 'date') + self.COLUMNS[1:]]
+            if unknown:
+                raise ValueError(f"Unknown columns for price store: {unknown}")
+            names = [c for c in columns if c != 'date']
+        else:
+            names = ['ticker'] + list(self.COLUMNS[1:])
+
+        data = self._load(ticker)
+        if data is None:
+            return pd.DataFrame()
+
+        lo, hi = self._day_range(data[0], start_date, end_date)
+        if lo >= hi:
+            return pd.DataFrame()
+
+        frame = {}
+        for name in names:
+            if name == 'ticker':
+                frame[name] = ticker
+            elif name == 'volume':
+                volume = np.array(data[self.ROW[name], lo:hi])
+                frame[name] = volume if np.isnan(volume).any() else volume.astype(np.int64)
+            else:
+                frame[name] = np.array(data[self.ROW[name], lo:hi])
+
+        index = pd.DatetimeIndex(self.from_days(data[0, lo:hi]), name='date')
+        return pd.DataFrame(frame, index=index)
+
+    def get_recent_bars(self, ticker, n):
+        """Get the last n bars, oldest first"""
+        data = self._load(ticker)
+        if data is None or not data.shape[1]:
+            return pd.DataFrame()
+
+        start = self.from_days(data[0, max(data.shape[1] - int(n), 0)])
+        return self.get_stock_data(ticker, start_date=str(start),
+                                   columns=list(self.COLUMNS[1:]))
+
+    def get_price_panel(self, tickers, start_date=None, end_date=None, fields=None):
+        """Load many tickers as an aligned dates x tickers PricePanel"""
+        fields = list(fields or PricePanel.FIELDS)
+        tickers = list(dict.fromkeys(tickers))
+
+        slices = {}
+        for ticker in tickers:
+            data = self._load(ticker)
+            if data is not None:
+                lo, hi = self._day_range(data[0], start_date, end_date)
+                if lo < hi:
+                    slices[ticker] = data[:, lo:hi]
+
+        if not slices:
+            return PricePanel.from_rows(tickers, [], {}, fields)
+
+        axis = np.unique(np.concatenate([s[0] for s in slices.values()]))
+        shape = (len(axis), len(tickers))
+        mask = np.zeros(shape, dtype=bool)
+        arrays = {name: np.full(shape, np.nan) for name in fields}
+
+        for i, ticker in enumerate(tickers):
+            block = slices.get(ticker)
+            if block is None:
+                continue
+            pos = np.searchsorted(axis, block[0])
+            mask[pos, i] = True
+            for name in fields:
+                arrays[name][pos, i] = block[self.ROW[name]]
+
+        return PricePanel(self.from_days(axis), tickers, arrays, mask)
+
+    def get_last_date(self, ticker):
+        """Get the most recent stored bar date as YYYY-MM-DD, or None"""
+        data = self._load(ticker)
+        if data is None or not data.shape[1]:
+            return None
+        return str(self.from_days(data[0, -1]))
+
+    def get_last_dates(self, tickers=None):
+        """Get {ticker: last stored bar date}"""
+        tickers = self.get_all_tickers() if tickers is None else tickers
+        dates = {ticker: self.get_last_date(ticker) for ticker in tickers}
+        return {ticker: date for ticker, date in dates.items() if date}
+
+    def get_latest_price(self, ticker):
+        """Get the most recent close as {'close', 'date'}, or None"""
+        data = self._load(ticker)
+        if data is None or not data.shape[1]:
+            return None
+        return {'close': float(data[self.ROW['close'], -1]), 'date': str(self.from_days(data[0, -1]))}
+
+    def get_all_tickers(self):
+        """Get the sorted list of stored tickers"""
+        paths = glob.glob(os.path.join(self.root, '*.npy'))
+        return sorted(unquote(os.path.basename(p)[:-len('.npy')]) for p in paths)
+
+
+def migrate_from_sqlite(db_path, store):
+    """Copy every ticker's bars from a SQLite stock_prices table into a PriceStore"""
+    conn = sqlite3.connect(db_path)
+    tickers = conn.execute("SELECT id, symbol FROM tickers ORDER BY symbol").fetchall()
+
+    total = 0
+    for i, (ticker_id, ticker) in enumerate(tickers, 1):
+        rows = conn.execute(
+            "SELECT day, open, high, low, close, volume FROM stock_prices WHERE ticker_id = ? ORDER BY day",
+            (ticker_id,)
+        ).fetchall()
+        if not rows:
+            continue
+
+        days, *columns = zip(*rows)
+        values = {name: np.array(col, dtype=float) for name, col in zip(PriceStore.COLUMNS[1:], columns)}
+        store.write(ticker, PriceStore.from_days(days), values)
+
+        total += len(rows)
+        print(f"[{i}/{len(tickers)}] {ticker}: {len(rows)} bars")
+
+    conn.close()
+    return total
+
+
+def main():
+    """Migrate an existing SQLite database to the columnar price store"""
+    parser = argparse.ArgumentParser(description="Migrate SQLite prices to the columnar price store")
+    parser.add_argument('--db', default=config.DATABASE_PATH, help="SQLite database to read")
+    parser.add_argument('--dir', default=config.PRICE_STORE_DIR, help="price store directory to write")
+    args = parser.parse_args()
+
+    # Opening the database first upgrades older schemas
+    from src.database import StockDatabase
+    StockDatabase(args.db).close()
+
+    print(f"\n📦 Migrating {args.db} -> {args.dir}")
+    total = migrate_from_sqlite(args.db, PriceStore(args.dir))
+    print(f"\n✅ Migrated {total} bars")
+    print("💡 Set PRICE_BACKEND = 'npy' in config.py to use the price store\n")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,421 @@
+"""
+Providers Module - Market data sources behind DataCollector and NewsFetcher
+
+YFinanceProvider talks to Yahoo Finance. ReplayProvider serves recorded (or
+synthetic) responses from disk with injected latency and errors, so collection
+can run and be benchmarked without network access. RecordingProvider wraps
+another provider and saves what it returns in the replay format.
+"""
+
+import json
+import os
+import random
+import sys
+import threading
+import time
+import zlib
+from datetime import timedelta
+from urllib.parse import quote
+
+import numpy as np
+import pandas as pd
+
+try:
+    import yfinance as yf
+except ImportError:  # Replay-only installs
+    yf = None
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config
+from src.market_calendar import MARKET_TZ, TradingCalendar
+
+HISTORY_COLUMNS = ['Open', 'High', 'Low', 'Close', 'Volume', 'Dividends', 'Stock Splits']
+
+
+class ProviderError(Exception):
+    """Raised by a provider when an upstream request fails"""
+
+
+class DataProvider:
+    """Interface for upstream price, company info and news requests
+
+    history() returns a Yahoo-style frame (Open, High, Low, Close, Volume,
+    Dividends, Stock Splits) on an exchange-local DatetimeIndex; an empty
+    frame means no data. Failures raise, like the yfinance calls they replace.
+    """
+
+    name = 'base'
+
+    def history(self, ticker, period=None, interval='1d', start=None):
+        """Get bars for a period (e.g. '2y') or since a start date"""
+        raise NotImplementedError
+
+    def download(self, tickers, period=None, interval='1d', start=None):
+        """Get bars for many tickers as one frame with (ticker, field) columns"""
+        frames = {}
+        for ticker in tickers:
+            df = self.history(ticker, period=period, interval=interval, start=start)
+            if not df.empty:
+                frames[ticker] = df
+        if not frames:
+            return pd.DataFrame()
+        return pd.concat(frames, axis=1)
+
+    def info(self, ticker):
+        """Get the company info dict"""
+        raise NotImplementedError
+
+    def news(self, ticker):
+        """Get recent news items in Yahoo's format"""
+        raise NotImplementedError
+
+
+class YFinanceProvider(DataProvider):
+    """Live data from Yahoo Finance"""
+
+    name = 'yfinance'
+
+    def __init__(self):
+        """Initialize provider (requires the yfinance package)"""
+        if yf is None:
+            raise ImportError("yfinance is not installed; use DATA_PROVIDER = 'replay' to run offline")
+
+    def history(self, ticker, period=None, interval='1d', start=None):
+        stock = yf.Ticker(ticker)
+        if start:
+            return stock.history(start=start, interval=interval)
+        return stock.history(period=period, interval=interval)
+
+    def download(self, tickers, period=None, interval='1d', start=None):
+        if start:
+            return yf.download(list(tickers), start=start, interval=interval, group_by='ticker',
+                               auto_adjust=True, actions=True, threads=False, progress=False)
+        return yf.download(list(tickers), period=period, interval=interval, group_by='ticker',
+                           auto_adjust=True, actions=True, threads=False, progress=False)
+
+    def info(self, ticker):
+        return yf.Ticker(ticker).info
+
+    def news(self, ticker):
+        return yf.Ticker(ticker).news
+
+
+def slice_period(df, period=None, start=None):
+    """Cut a full history down to what a period or start request returns"""
+    if df.empty:
+        return df
+
+    if start:
+        first = pd.Timestamp(start)
+        if df.index.tz is not None:
+            first = first.tz_localize(df.index.tz)
+        return df[df.index >= first]
+
+    if not period or period == 'max':
+        return df
+
+    last = df.index[-1]
+    if period == 'ytd':
+        return df[df.index.year == last.year]
+
+    unit = period.lstrip('0123456789')
+    count = int(period[:len(period) - len(unit)])
+    if unit == 'd':
+        return df.tail(count)
+    if unit == 'wk':
+        first = last - pd.DateOffset(weeks=count)
+    elif unit == 'mo':
+        first = last - pd.DateOffset(months=count)
+    elif unit == 'y':
+        first = last - pd.DateOffset(years=count)
+    else:
+        raise ValueError(f"Unknown period: {period}")
+    return df[df.index > first]
+
+
+def ticker_seed(ticker, seed=0):
+    """Stable per-ticker seed (unlike hash(), the same across processes)"""
+    return zlib.crc32(f"{seed}:{ticker}".encode())
+
+
+def synthetic_history(ticker, end=None, years=10, seed=0):
+    """Deterministic daily OHLCV for a ticker on NYSE sessions ending at `end`"""
+    calendar = TradingCalendar()
+    end = pd.Timestamp(end).date() if end else calendar.latest_session()
+    sessions = calendar.sessions(end - timedelta(days=int(365.25 * years)), end)
+
+    rng = np.random.default_rng(ticker_seed(ticker, seed))
+    n = len(sessions)
+
+    # Geometric random walk with a per-ticker drift and volatility
+    drift = rng.normal(0.0003, 0.0004)
+    volatility = rng.uniform(0.01, 0.03)
+    close = rng.uniform(20, 400) * np.exp(np.cumsum(rng.normal(drift, volatility, n)))
+
+    gap = rng.normal(0, volatility / 3, n)
+    open_ = np.empty(n)
+    open_[0] = close[0]
+    open_[1:] = close[:-1] * np.exp(gap[1:])
+    high = np.maximum(open_, close) * np.exp(np.abs(rng.normal(0, volatility / 2, n)))
+    low = np.minimum(open_, close) * np.exp(-np.abs(rng.normal(0, volatility / 2, n)))
+    volume = rng.lognormal(np.log(rng.uniform(5e5, 5e7)), 0.4, n).astype(np.int64)
+
+    index = pd.DatetimeIndex(pd.to_datetime(sessions), name='Date').tz_localize(MARKET_TZ)
+    return pd.DataFrame({
+        'Open': open_, 'High': high, 'Low': low, 'Close': close, 'Volume': volume,
+        'Dividends': 0.0, 'Stock Splits': 0.0,
+    }, index=index)
+
+
+def synthetic_info(ticker, seed=0, price=None):
+    """Deterministic company info with the fields the dashboard displays"""
+    rng = random.Random(ticker_seed(ticker, seed))
+    sector, industry = rng.choice([
+        ('Technology', 'Software - Infrastructure'),
+        ('Healthcare', 'Drug Manufacturers - General'),
+        ('Financial Services', 'Banks - Diversified'),
+        ('Consumer Cyclical', 'Internet Retail'),
+        ('Energy', 'Oil & Gas Integrated'),
+        ('Industrials', 'Aerospace & Defense'),
+    ])
+    price = price or rng.uniform(20, 400)
+    eps = price / rng.uniform(8, 45)
+
+    return {
+        'symbol': ticker,
+        'longName': f"{ticker} Holdings Inc.",
+        'sector': sector,
+        'industry': industry,
+        'marketCap': int(rng.uniform(2e9, 2e12)),
+        'currentPrice': price,
+        'regularMarketPrice': price,
+        'fiftyTwoWeekHigh': price * rng.uniform(1.0, 1.5),
+        'fiftyTwoWeekLow': price * rng.uniform(0.5, 1.0),
+        'trailingEps': eps,
+        'trailingPE': price / eps,
+        'pegRatio': rng.uniform(0.5, 3.0),
+        'priceToBook': rng.uniform(1, 20),
+        'enterpriseToEbitda': rng.uniform(5, 40),
+        'beta': rng.uniform(0.5, 2.0),
+        'profitMargins': rng.uniform(-0.05, 0.4),
+        'operatingMargins': rng.uniform(0.0, 0.45),
+        'returnOnAssets': rng.uniform(0.0, 0.2),
+        'returnOnEquity': rng.uniform(0.0, 0.6),
+        'currentRatio': rng.uniform(0.5, 3.0),
+        'quickRatio': rng.uniform(0.3, 2.5),
+        'debtToEquity': rng.uniform(0, 250),
+        'totalCash': int(rng.uniform(1e8, 1e11)),
+        'dividendRate': round(rng.uniform(0, 4), 2),
+        'dividendYield': round(rng.uniform(0, 0.04), 4),
+        'payoutRatio': rng.uniform(0, 0.8),
+    }
+
+
+def synthetic_news(ticker, seed=0, count=8, now=None):
+    """Deterministic headlines spread over the last few days"""
+    rng = random.Random(ticker_seed(ticker, seed))
+    now = now or time.time()
+    templates = [
+        "{t} shares surge after earnings beat expectations",
+        "{t} stock slides as analysts downgrade outlook",
+        "{t} announces record quarterly revenue growth",
+        "{t} faces concern over supply chain risk",
+        "{t} holds annual shareholder meeting",
+        "Analysts stay bullish on {t} ahead of product launch",
+        "{t} shares tumble amid market uncertainty",
+        "{t} expands partnership in new markets",
+    ]
+
+    return [{
+        'title': rng.choice(templates).format(t=ticker),
+        'publisher': rng.choice(['Reuters', 'Bloomberg', 'MarketWatch', 'Barron\'s']),
+        'link': f"https://example.com/news/{quote(ticker, safe='')}/{i}",
+        'providerPublishTime': int(now - rng.uniform(0, 5 * 86400)),
+    } for i in range(count)]
+
+
+class ReplayProvider(DataProvider):
+    """Serve recorded responses from disk, synthesizing any that were never recorded
+
+    Every call first sleeps for the configured latency (plus jitter) and then
+    fails with probability error_rate, so collection throughput and retry
+    behaviour can be measured deterministically offline.
+    """
+
+    name = 'replay'
+
+    def __init__(self, root=None, latency=None, jitter=None, error_rate=None, seed=None,
+                 synthetic=True, as_of=None):
+        """Initialize provider over a recordings directory"""
+        self.root = root or config.REPLAY_DIR
+        self.latency = config.REPLAY_LATENCY if latency is None else latency
+        self.jitter = config.REPLAY_JITTER if jitter is None else jitter
+        self.error_rate = config.REPLAY_ERROR_RATE if error_rate is None else error_rate
+        self.seed = config.REPLAY_SEED if seed is None else seed
+        self.synthetic = synthetic
+        self.as_of = as_of
+
+        self.random = random.Random(self.seed)
+        self.lock = threading.Lock()
+        self.histories = {}
+        self.calls = 0
+        self.errors = 0
+
+    def _path(self, ticker, name):
+        """File holding one kind of response for a ticker"""
+        return os.path.join(self.root, quote(ticker, safe=''), name)
+
+    def _call(self, what):
+        """Apply injected latency and errors to one request"""
+        with self.lock:
+            self.calls += 1
+            delay = self.latency + (self.random.uniform(0, self.jitter) if self.jitter else 0)
+            fail = self.error_rate > 0 and self.random.random() < self.error_rate
+            if fail:
+                self.errors += 1
+
+        if delay > 0:
+            time.sleep(delay)
+        if fail:
+            raise ProviderError(f"Injected error for {what}")
+
+    def _full_history(self, ticker, interval):
+        """Recorded (or synthetic daily) history, loaded once per ticker and interval"""
+        key = (ticker, interval)
+        with self.lock:
+            if key in self.histories:
+                return self.histories[key]
+
+        path = self._path(ticker, f"history_{interval}.csv")
+        if os.path.exists(path):
+            df = pd.read_csv(path, index_col=0)
+            df.index = pd.to_datetime(df.index, utc=True).tz_convert(MARKET_TZ)
+            df.index.name = 'Date'
+        elif self.synthetic and interval == '1d':
+            df = synthetic_history(ticker, end=self.as_of, seed=self.seed)
+        else:
+            df = pd.DataFrame(columns=HISTORY_COLUMNS)
+
+        with self.lock:
+            self.histories[key] = df
+        return df
+
+    def history(self, ticker, period=None, interval='1d', start=None):
+        self._call(f"{ticker} history")
+        return slice_period(self._full_history(ticker, interval), period, start).copy()
+
+    def download(self, tickers, period=None, interval='1d', start=None):
+        # A batch is one upstream request, so it pays latency and risks failure once
+        self._call(f"batch of {len(tickers)}")
+
+        frames = {}
+        for ticker in tickers:
+            df = slice_period(self._full_history(ticker, interval), period, start)
+            if not df.empty:
+                frames[ticker] = df
+        if not frames:
+            return pd.DataFrame()
+        return pd.concat(frames, axis=1)
+
+    def _load_json(self, ticker, name):
+        """Recorded JSON response, or None"""
+        try:
+            with open(self._path(ticker, name)) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def info(self, ticker):
+        self._call(f"{ticker} info")
+        info = self._load_json(ticker, 'info.json')
+        if info is None and self.synthetic:
+            history = self._full_history(ticker, '1d')
+            price = float(history['Close'].iloc[-1]) if not history.empty else None
+            info = synthetic_info(ticker, self.seed, price)
+        return info or {}
+
+    def news(self, ticker):
+        self._call(f"{ticker} news")
+        news = self._load_json(ticker, 'news.json')
+        if news is None and self.synthetic:
+            news = synthetic_news(ticker, self.seed)
+        return news or []
+
+
+class RecordingProvider(DataProvider):
+    """Pass requests through to another provider and save the responses for replay"""
+
+    name = 'record'
+
+    def __init__(self, inner=None, root=None):
+        """Initialize recorder around a live provider"""
+        self.inner = inner or YFinanceProvider()
+        self.root = root or config.REPLAY_DIR
+        self.lock = threading.Lock()
+
+    def _path(self, ticker, name):
+        """File holding one kind of response for a ticker"""
+        path = os.path.join(self.root, quote(ticker, safe=''), name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        return path
+
+    def _save_history(self, ticker, interval, df):
+        """Merge bars into the recording, newest response winning"""
+        if df is None or df.empty:
+            return
+
+        path = self._path(ticker, f"history_{interval}.csv")
+        df = df[[c for c in HISTORY_COLUMNS if c in df.columns]]
+
+        with self.lock:
+            if os.path.exists(path):
+                old = pd.read_csv(path, index_col=0)
+                old.index = pd.to_datetime(old.index, utc=True).tz_convert(df.index.tz or MARKET_TZ)
+                df = pd.concat([old[~old.index.isin(df.index)], df]).sort_index()
+            df.to_csv(path, date_format='%Y-%m-%dT%H:%M:%S%z')
+
+    def _save_json(self, ticker, name, payload):
+        """Save a JSON response"""
+        with self.lock, open(self._path(ticker, name), 'w') as f:
+            json.dump(payload, f, default=str)
+
+    def history(self, ticker, period=None, interval='1d', start=None):
+        df = self.inner.history(ticker, period=period, interval=interval, start=start)
+        self._save_history(ticker, interval, df)
+        return df
+
+    def download(self, tickers, period=None, interval='1d', start=None):
+        wide = self.inner.download(tickers, period=period, interval=interval, start=start)
+        if isinstance(wide.columns, pd.MultiIndex):
+            for ticker in wide.columns.get_level_values(0).unique():
+                df = wide[ticker].dropna(how='all', subset=['Close'])
+                df.columns.name = None
+                self._save_history(ticker, interval, df)
+        return wide
+
+    def info(self, ticker):
+        info = self.inner.info(ticker)
+        if info:
+            self._save_json(ticker, 'info.json', info)
+        return info
+
+    def news(self, ticker):
+        news = self.inner.news(ticker)
+        if news:
+            self._save_json(ticker, 'news.json', news)
+        return news
+
+
+def get_provider(name=None):
+    """Create the provider selected by DATA_PROVIDER ('yfinance', 'replay' or 'record')"""
+    name = name or config.DATA_PROVIDER
+
+    if name == 'yfinance':
+        return YFinanceProvider()
+    if name == 'replay':
+        return ReplayProvider()
+    if name == 'record':
+        return RecordingProvider()
+    raise ValueError(f"Unknown data provider: {name}")
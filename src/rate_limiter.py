@@ -0,0 +1,52 @@
+"""
+Rate Limiter Module - Token bucket for throttling upstream API requests
+"""
+
+import threading
+import time
+
+
+class TokenBucket:
+    """Thread-safe token bucket shared by all collector workers"""
+
+    def __init__(self, rate, capacity=None):
+        """Initialize bucket refilling `rate` tokens per second"""
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+
+        self.rate = float(rate)
+        self.capacity = float(capacity or max(1.0, rate))
+        self.tokens = self.capacity
+        self.last_refill = time.monotonic()
+        self.lock = threading.Lock()
+
+    def _refill(self):
+        """Add tokens accrued since the last refill"""
+        now = time.monotonic()
+        elapsed = now - self.last_refill
+        self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+        self.last_refill = now
+
+    def try_acquire(self, tokens=1):
+        """Take tokens without blocking, return True on success"""
+        with self.lock:
+            self._refill()
+            if self.tokens >= tokens:
+                self.tokens -= tokens
+                return True
+            return False
+
+    def acquire(self, tokens=1):
+        """Block until tokens are available, return seconds waited"""
+        waited = 0.0
+
+        while True:
+            with self.lock:
+                self._refill()
+                if self.tokens >= tokens:
+                    self.tokens -= tokens
+                    return waited
+                wait = (tokens - self.tokens) / self.rate
+
+            time.sleep(wait)
+            waited += wait
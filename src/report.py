@@ -0,0 +1,212 @@
+"""
+Report Module - Headless watchlist analysis into a single CSV, Parquet or JSON report
+
+Runs the dashboard's per-ticker pipeline (load, indicators, signals,
+support/resistance, volatility) across a process pool. Nothing here imports
+Streamlit or Plotly, so it starts quickly under cron:
+
+    python src/report.py                       # config.WATCHLIST -> data/reports/
+    python src/report.py --all --format json   # every stored ticker
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from functools import partial
+
+import numpy as np
+import pandas as pd
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config
+from src import metrics
+from src.analyzer import TechnicalAnalyzer
+from src.database import StockDatabase
+from src.portfolio_manager import PortfolioManager
+
+log = metrics.get_logger('report')
+
+FORMATS = ('csv', 'parquet', 'json')
+
+# Latest-bar indicator columns copied into each report row
+INDICATORS = ['SMA_20', 'SMA_50', 'RSI', 'MACD', 'MACD_Signal', 'MACD_Histogram',
+              'BB_Upper', 'BB_Middle', 'BB_Lower']
+
+REPORT_COLUMNS = (
+    ['ticker', 'date', 'bars', 'close', 'change_pct', 'volume'] + INDICATORS +
+    ['trend', 'rsi_signal', 'macd_signal', 'bb_signal', 'overall',
+     'support', 'resistance', 'volatility', 'error']
+)
+
+# Per-process database and analyzer, opened once by each pool worker
+_worker = {}
+
+
+def _init_worker(db_path):
+    """Open the database and analyzer once per worker process"""
+    # Every worker opens the same schema, so its setup message is just noise
+    with contextlib.redirect_stdout(io.StringIO()):
+        _worker['db'] = StockDatabase(db_path)
+    _worker['analyzer'] = TechnicalAnalyzer()
+
+
+def analyze_ticker(db, analyzer, ticker, start_date=None):
+    """One report row: latest bar, indicators, signals, support/resistance and volatility"""
+    df = db.get_stock_data(ticker, start_date=start_date,
+                           columns=['open', 'high', 'low', 'close', 'volume'])
+    if df.empty:
+        return {'ticker': ticker, 'error': 'no stored data'}
+
+    df = analyzer.calculate_all_indicators(df)
+    signals = analyzer.generate_signals(df)
+    support, resistance = analyzer.get_support_resistance(df)
+
+    latest = df.iloc[-1]
+    prev_close = df['close'].iloc[-2] if len(df) > 1 else np.nan
+
+    row = {
+        'ticker': ticker,
+        'date': df.index[-1].strftime('%Y-%m-%d'),
+        'bars': len(df),
+        'close': latest['close'],
+        'change_pct': (latest['close'] / prev_close - 1) * 100,
+        'volume': latest['volume'],
+    }
+    row.update({name: latest[name] for name in INDICATORS})
+    row.update({key: signals[key] for key in ('trend', 'rsi_signal', 'macd_signal', 'bb_signal', 'overall')})
+    row.update({
+        'support': support,
+        'resistance': resistance,
+        'volatility': analyzer.calculate_volatility(df),
+    })
+    return row
+
+
+def _analyze(ticker, start_date=None):
+    """Report row for one ticker in a worker; failures become an error row"""
+    try:
+        return analyze_ticker(_worker['db'], _worker['analyzer'], ticker, start_date)
+    except Exception as e:
+        return {'ticker': ticker, 'error': str(e)}
+
+
+class WatchlistReport:
+    """Analyze many tickers across a process pool"""
+
+    def __init__(self, db_path=None, workers=None):
+        """Initialize report with the database to read and the worker count"""
+        self.db_path = db_path or config.DATABASE_PATH
+        self.workers = workers or config.REPORT_WORKERS or os.cpu_count() or 1
+
+    def run(self, tickers, start_date=None):
+        """One row per ticker (in the given order) as a DataFrame with REPORT_COLUMNS"""
+        tickers = list(dict.fromkeys(tickers))
+        if not tickers:
+            return pd.DataFrame(columns=REPORT_COLUMNS)
+
+        # Opening the database here creates or migrates the schema before any worker starts
+        _init_worker(self.db_path)
+        analyze = partial(_analyze, start_date=start_date)
+        workers = min(self.workers, len(tickers))
+
+        if workers == 1:
+            rows = [analyze(ticker) for ticker in tickers]
+        else:
+            # A few chunks per worker keeps the pool balanced without per-ticker IPC
+            chunksize = max(1, len(tickers) // (workers * 4))
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                     initargs=(self.db_path,)) as pool:
+                rows = list(pool.map(analyze, tickers, chunksize=chunksize))
+
+        return pd.DataFrame(rows).reindex(columns=REPORT_COLUMNS)
+
+
+def report_format(path=None, fmt=None):
+    """Output format from an explicit choice, the file extension or REPORT_FORMAT"""
+    if fmt:
+        return fmt
+    ext = os.path.splitext(path or '')[1].lstrip('.').lower()
+    return ext if ext in FORMATS else config.REPORT_FORMAT
+
+
+def write_report(df, path, fmt):
+    """Write the report (parquet needs pyarrow or fastparquet)"""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+    if fmt == 'csv':
+        df.to_csv(path, index=False)
+    elif fmt == 'parquet':
+        df.to_parquet(path, index=False)
+    elif fmt == 'json':
+        df.to_json(path, orient='records', indent=2)
+    else:
+        raise ValueError(f"Unknown report format: {fmt}")
+    return path
+
+
+def main():
+    """Write a watchlist report from the command line"""
+    parser = argparse.ArgumentParser(description="Analyze a watchlist without the dashboard")
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument('--tickers', nargs='+', help="tickers to analyze (default: WATCHLIST)")
+    group.add_argument('--watchlist', help="name of a watchlist saved from the dashboard")
+    group.add_argument('--all', action='store_true', help="every ticker in the database")
+    parser.add_argument('--start', help="first date to load (default: all stored history)")
+    parser.add_argument('--workers', type=int, help="worker processes (default: REPORT_WORKERS)")
+    parser.add_argument('--format', choices=FORMATS, help="report format (default: from --output, else REPORT_FORMAT)")
+    parser.add_argument('--output', help="report file (default: REPORT_DIR/analysis-<date>.<format>)")
+    args = parser.parse_args()
+
+    metrics.setup_logging()
+
+    if args.all:
+        with contextlib.redirect_stdout(io.StringIO()):
+            tickers = StockDatabase(config.DATABASE_PATH).get_all_tickers()
+    elif args.watchlist:
+        watchlist = PortfolioManager().get_watchlists().get(args.watchlist)
+        if watchlist is None:
+            print(f"\n❌ No watchlist named '{args.watchlist}'\n")
+            sys.exit(1)
+        tickers = watchlist['tickers']
+    else:
+        tickers = args.tickers or config.WATCHLIST
+
+    fmt = report_format(args.output, args.format)
+    output = args.output or os.path.join(config.REPORT_DIR,
+                                         f"analysis-{datetime.now().strftime('%Y%m%d')}.{fmt}")
+
+    started = time.perf_counter()
+    report = WatchlistReport(workers=args.workers)
+    df = report.run(tickers, args.start)
+    elapsed = time.perf_counter() - started
+
+    analyzed = df['error'].isna()
+    counts = df.loc[analyzed, 'overall'].value_counts()
+    print(f"\n📊 Analyzed {analyzed.sum()}/{len(df)} tickers in {elapsed:.1f}s "
+          f"on {min(report.workers, max(len(df), 1))} workers")
+    print(f"🟢 BUY: {counts.get('BUY', 0)}   🔴 SELL: {counts.get('SELL', 0)}   🟡 HOLD: {counts.get('HOLD', 0)}")
+    if (~analyzed).any():
+        print(f"⚠️  Skipped: {', '.join(df.loc[~analyzed, 'ticker'].head(10))}"
+              + (" ..." if (~analyzed).sum() > 10 else ""))
+
+    try:
+        write_report(df, output, fmt)
+    except ImportError as e:
+        print(f"❌ Could not write {fmt}: {str(e).splitlines()[0]}\n")
+        sys.exit(1)
+    print(f"📁 Report: {output}\n")
+    log.info("Report of %d/%d tickers written to %s in %.1fs", analyzed.sum(), len(df), output, elapsed)
+
+    if not analyzed.any():
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
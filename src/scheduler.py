@@ -0,0 +1,134 @@
+"""
+Scheduler Module - Long-running collector that refreshes only tickers with missing sessions
+"""
+
+import argparse
+import sys
+import os
+import threading
+import time
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config
+from src import metrics
+from src.data_collector import DataCollector
+from src.market_calendar import TradingCalendar
+
+
+class CollectorScheduler:
+    """Run DataCollector every UPDATE_FREQUENCY seconds, paced across the interval"""
+
+    def __init__(self, collector=None, calendar=None, watchlist=None, interval=None,
+                 chunk_size=None, spread=None):
+        """Initialize scheduler around a collector and trading calendar"""
+        self.collector = collector or DataCollector()
+        self.db = self.collector.db
+        self.calendar = calendar or TradingCalendar()
+        self.watchlist = watchlist or config.WATCHLIST
+        self.interval = interval or config.UPDATE_FREQUENCY
+        self.chunk_size = chunk_size or config.SCHEDULER_CHUNK_SIZE
+        self.spread = spread if spread is not None else config.SCHEDULER_SPREAD
+        self.stop_event = threading.Event()
+
+    def due_tickers(self, now=None):
+        """Get the tickers whose stored bars are behind the trading calendar"""
+        now = (now or self.calendar.now()).astimezone(self.calendar.tz)
+        last_dates = self.db.get_last_dates(self.watchlist)
+        written = self.db.get_update_times(self.watchlist)
+        latest = self.calendar.latest_session(now)
+
+        due = []
+        for ticker in self.watchlist:
+            last_date = last_dates.get(ticker)
+            if self.calendar.missing_sessions(last_date, now):
+                due.append(ticker)
+                continue
+
+            # The latest bar is current, but it may have been written mid-session
+            close = self.calendar.session_hours(latest)[1].timestamp()
+            written_at = written.get(ticker, 0)
+            if written_at < close:
+                if now.timestamp() >= close or now.timestamp() - written_at >= self.interval:
+                    due.append(ticker)
+
+        return due
+
+    def run_cycle(self, now=None):
+        """Refresh due tickers in chunks spread across part of the interval"""
+        due = self.due_tickers(now)
+        print(f"\n🗓️  {len(due)}/{len(self.watchlist)} tickers due "
+              f"(latest session {self.calendar.latest_session(now)})")
+
+        if not due:
+            return {}
+
+        chunks = [due[i:i + self.chunk_size] for i in range(0, len(due), self.chunk_size)]
+        pace = self.interval * self.spread / len(chunks)
+
+        results = {}
+        for i, chunk in enumerate(chunks, 1):
+            started = time.monotonic()
+            results.update(self.collector.collect_watchlist(chunk))
+
+            # Keep upstream load flat instead of bursting the whole universe
+            if i < len(chunks):
+                if self.stop_event.wait(max(pace - (time.monotonic() - started), 0)):
+                    break
+
+        return results
+
+    def seconds_until_next_cycle(self, cycle_started):
+        """Wait a full interval, or until the next open when the market is idle"""
+        wait = self.interval - (time.monotonic() - cycle_started)
+
+        if not self.calendar.is_open() and not self.due_tickers():
+            until_open = (self.calendar.next_open() - self.calendar.now()).total_seconds()
+            wait = max(wait, until_open)
+
+        return max(wait, 0)
+
+    def run(self, once=False):
+        """Run cycles until stopped (or a single cycle with once=True)"""
+        print(f"\n{'='*60}")
+        print(f"⏰ COLLECTOR SCHEDULER: {len(self.watchlist)} tickers every {self.interval}s")
+        print(f"{'='*60}")
+
+        while not self.stop_event.is_set():
+            cycle_started = time.monotonic()
+            results = self.run_cycle()
+            metrics.write_metrics('scheduler')
+
+            if once:
+                return results
+
+            wait = self.seconds_until_next_cycle(cycle_started)
+            print(f"💤 Next check in {wait / 60:.0f} min")
+            self.stop_event.wait(wait)
+
+    def stop(self):
+        """Stop after the current chunk"""
+        self.stop_event.set()
+
+
+def main():
+    """Run the scheduler from the command line"""
+    parser = argparse.ArgumentParser(description="Scheduled stock data collector")
+    parser.add_argument('--once', action='store_true', help="run a single cycle and exit")
+    parser.add_argument('--interval', type=int, help="seconds between cycles (default: UPDATE_FREQUENCY)")
+    parser.add_argument('--tickers', nargs='+', help="tickers to refresh (default: WATCHLIST)")
+    args = parser.parse_args()
+
+    metrics.setup_logging()
+    metrics.serve()
+    scheduler = CollectorScheduler(watchlist=args.tickers, interval=args.interval)
+
+    try:
+        scheduler.run(once=args.once)
+    except KeyboardInterrupt:
+        print("\n👋 Scheduler stopped")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,121 @@
+"""
+Screener Module - Filter and rank the whole universe on its latest indicators and signals
+"""
+
+import argparse
+import sys
+import os
+
+import pandas as pd
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config
+from src.database import StockDatabase
+
+
+class Screener:
+    """Evaluate filter expressions over the latest_snapshot table in one pass"""
+
+    # Snapshot columns renamed to the names used by TechnicalAnalyzer
+    # (indicator columns) and generate_signals() (signal keys)
+    COLUMN_NAMES = {
+        'sma_20': 'SMA_20',
+        'sma_50': 'SMA_50',
+        'rsi': 'RSI',
+        'macd': 'MACD',
+        'macd_signal': 'MACD_Signal',
+        'macd_histogram': 'MACD_Histogram',
+        'bb_upper': 'BB_Upper',
+        'bb_middle': 'BB_Middle',
+        'bb_lower': 'BB_Lower',
+        'signal_trend': 'trend',
+        'signal_rsi': 'rsi_signal',
+        'signal_macd': 'macd_signal',
+        'signal_bb': 'bb_signal',
+        'signal_overall': 'overall',
+    }
+
+    DISPLAY_COLUMNS = ['date', 'close', 'change_pct', 'RSI', 'SMA_20', 'SMA_50', 'MACD_Histogram',
+                       'trend', 'rsi_signal', 'macd_signal', 'bb_signal', 'overall']
+
+    def __init__(self, db=None):
+        """Initialize screener on a database"""
+        self.db = db or StockDatabase(config.DATABASE_PATH)
+
+    def load(self, tickers=None):
+        """Get the latest values for every ticker as one DataFrame indexed by ticker"""
+        df = self.db.get_latest_snapshot(tickers).rename(columns=self.COLUMN_NAMES)
+        df['price'] = df['close']
+        return df
+
+    def screen(self, expression=None, tickers=None, sort_by=None, ascending=True, limit=None):
+        """Filter with a pandas query expression, then sort and rank the matches
+
+        Example: screen("RSI < 30 and SMA_20 > SMA_50 and overall == 'BUY'", sort_by='RSI')
+        """
+        df = self.load(tickers)
+        missing_signals = df.index[df['overall'].isna()].tolist()
+
+        if expression and expression.strip():
+            try:
+                df = df.query(expression)
+            except (NameError, KeyError) as e:
+                raise ValueError(f"Unknown column in screen expression ({e}). "
+                                 f"Available: {', '.join(df.columns)}") from None
+            except Exception as e:
+                # pandas.eval surfaces bad expressions as many exception types
+                # (SyntaxError, TypeError, AttributeError, NotImplementedError, ...)
+                raise ValueError(f"Invalid screen expression: {e}") from None
+
+        if sort_by:
+            if sort_by not in df.columns:
+                raise ValueError(f"Unknown sort column: {sort_by}. "
+                                 f"Available: {', '.join(df.columns)}")
+            df = df.sort_values(sort_by, ascending=ascending, na_position='last', kind='stable')
+
+        # 1 = best match under the requested ordering
+        df.insert(0, 'rank', range(1, len(df) + 1))
+
+        if limit:
+            df = df.head(limit)
+
+        # Filters on signal columns silently drop these, so callers can say why
+        df.attrs['missing_signals'] = missing_signals
+        return df
+
+
+def main():
+    """Run a screen from the command line"""
+    parser = argparse.ArgumentParser(description="Screen the stored universe on its latest indicators")
+    parser.add_argument('expression', nargs='?', default='',
+                        help="filter, e.g. \"RSI < 30 and SMA_20 > SMA_50 and overall == 'BUY'\"")
+    parser.add_argument('--sort', help="column to rank by, e.g. RSI or change_pct")
+    parser.add_argument('--desc', action='store_true', help="rank in descending order")
+    parser.add_argument('--limit', type=int, help="show at most this many matches")
+    parser.add_argument('--tickers', nargs='+', help="restrict to these tickers")
+    args = parser.parse_args()
+
+    screener = Screener()
+    try:
+        results = screener.screen(args.expression, tickers=args.tickers, sort_by=args.sort,
+                                  ascending=not args.desc, limit=args.limit)
+    except ValueError as e:
+        print(f"\n❌ {e}\n")
+        sys.exit(1)
+
+    print(f"\n🔎 {len(results)} matches" + (f" for: {args.expression}" if args.expression else ""))
+    missing = results.attrs['missing_signals']
+    if missing:
+        print(f"⚠️  No stored signals for {len(missing)} tickers ({', '.join(missing[:10])}"
+              + (" ..." if len(missing) > 10 else "") + "); signal filters skip them until indicators are updated")
+    if not results.empty:
+        columns = ['rank'] + Screener.DISPLAY_COLUMNS
+        with pd.option_context('display.width', 200, 'display.max_columns', None):
+            print(results[columns].round(2).to_string())
+    print()
+
+
+if __name__ == '__main__':
+    main()
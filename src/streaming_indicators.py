@@ -0,0 +1,345 @@
+"""
+Streaming Indicator Module - Constant-time indicator updates for newly arrived bars
+"""
+
+from collections import deque
+import math
+
+
+class RollingWindow:
+    """Fixed-size window keeping running sums of its values and squares"""
+
+    def __init__(self, size):
+        """Initialize an empty window"""
+        self.size = size
+        self.values = deque(maxlen=size)
+        self.shift = None       # values are summed relative to this to limit round-off
+        self.total = 0.0
+        self.total_sq = 0.0
+        self.updates = 0
+        self.negatives = 0      # values below zero in the window
+        self.run = 0            # trailing values equal to the newest one
+
+    def push(self, value):
+        """Add a value, dropping the oldest once the window is full"""
+        if self.shift is None:
+            self.shift = value
+
+        if len(self.values) == self.size:
+            oldest = self.values[0]
+            old = oldest - self.shift
+            self.total -= old
+            self.total_sq -= old * old
+            self.negatives -= oldest < 0
+
+        self.run = self.run + 1 if self.values and value == self.values[-1] else 1
+        self.negatives += value < 0
+        self.values.append(value)
+        new = value - self.shift
+        self.total += new
+        self.total_sq += new * new
+
+        # Periodically rebuild the sums so floating-point drift can't build up
+        self.updates += 1
+        if self.updates >= self.size:
+            self._resync()
+
+    def _resync(self):
+        """Recompute running sums from the buffered values"""
+        self.shift = sum(self.values) / len(self.values)
+        centered = [v - self.shift for v in self.values]
+        self.total = math.fsum(centered)
+        self.total_sq = math.fsum(c * c for c in centered)
+        self.updates = 0
+
+    @property
+    def full(self):
+        """True once the window holds `size` values"""
+        return len(self.values) == self.size
+
+    @property
+    def constant(self):
+        """True when every value in the full window is the same"""
+        return self.run >= self.size
+
+    def mean(self):
+        """Mean of the window (NaN until full)"""
+        if not self.full:
+            return math.nan
+
+        # Like pandas, a constant window gives its value exactly and a window
+        # without negatives never goes below zero, whatever the round-off
+        if self.constant:
+            return self.values[-1]
+        mean = self.shift + self.total / self.size
+        return max(mean, 0.0) if self.negatives == 0 else mean
+
+    def std(self):
+        """Sample standard deviation of the window (NaN until full)"""
+        if not self.full or self.size < 2:
+            return math.nan
+        if self.constant:
+            return 0.0
+        variance = (self.total_sq - self.total * self.total / self.size) / (self.size - 1)
+        return math.sqrt(max(variance, 0.0))
+
+    def to_dict(self):
+        """Serialize window state"""
+        return {
+            'size': self.size,
+            'values': list(self.values),
+            'shift': self.shift,
+            'total': self.total,
+            'total_sq': self.total_sq,
+            'updates': self.updates,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """Restore window state"""
+        window = cls(data['size'])
+        window.values.extend(data['values'])
+        window.shift = data['shift']
+        window.total = data['total']
+        window.total_sq = data['total_sq']
+        window.updates = data['updates']
+
+        # Derived from the buffered values, so older saved states restore too
+        window.negatives = sum(v < 0 for v in window.values)
+        for v in reversed(window.values):
+            if v != window.values[-1]:
+                break
+            window.run += 1
+        return window
+
+
+class SMAState:
+    """Simple moving average over a rolling window"""
+
+    def __init__(self, window):
+        """Initialize with the window length"""
+        self.window = RollingWindow(window)
+
+    def update(self, value):
+        """Add a bar and return the current SMA"""
+        self.window.push(value)
+        return self.value
+
+    @property
+    def value(self):
+        """Current SMA (NaN until the window is full)"""
+        return self.window.mean()
+
+    def to_dict(self):
+        """Serialize state"""
+        return {'window': self.window.to_dict()}
+
+    @classmethod
+    def from_dict(cls, data):
+        """Restore state"""
+        state = cls(data['window']['size'])
+        state.window = RollingWindow.from_dict(data['window'])
+        return state
+
+
+class EMAState:
+    """Exponential moving average (adjust=False) seeded with the first value"""
+
+    def __init__(self, span):
+        """Initialize with the EMA span"""
+        self.span = span
+        self.alpha = 2.0 / (span + 1.0)
+        self.value = None
+
+    def update(self, value):
+        """Add a bar and return the current EMA"""
+        if self.value is None:
+            self.value = value
+        else:
+            self.value = self.value + self.alpha * (value - self.value)
+        return self.value
+
+    def to_dict(self):
+        """Serialize state"""
+        return {'span': self.span, 'value': self.value}
+
+    @classmethod
+    def from_dict(cls, data):
+        """Restore state"""
+        state = cls(data['span'])
+        state.value = data['value']
+        return state
+
+
+class MACDState:
+    """MACD line, signal line and histogram"""
+
+    def __init__(self, fast, slow, signal):
+        """Initialize with the fast, slow and signal spans"""
+        self.fast = EMAState(fast)
+        self.slow = EMAState(slow)
+        self.signal = EMAState(signal)
+
+    def update(self, value):
+        """Add a bar and return (macd, signal, histogram)"""
+        macd = self.fast.update(value) - self.slow.update(value)
+        signal = self.signal.update(macd)
+        return macd, signal, macd - signal
+
+    def to_dict(self):
+        """Serialize state"""
+        return {
+            'fast': self.fast.to_dict(),
+            'slow': self.slow.to_dict(),
+            'signal': self.signal.to_dict(),
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """Restore state"""
+        state = cls(data['fast']['span'], data['slow']['span'], data['signal']['span'])
+        state.fast = EMAState.from_dict(data['fast'])
+        state.slow = EMAState.from_dict(data['slow'])
+        state.signal = EMAState.from_dict(data['signal'])
+        return state
+
+
+class RSIState:
+    """Relative Strength Index from rolling average gains and losses"""
+
+    def __init__(self, period):
+        """Initialize with the RSI period"""
+        self.period = period
+        self.prev_close = None
+        self.gains = RollingWindow(period)
+        self.losses = RollingWindow(period)
+
+    def update(self, value):
+        """Add a bar and return the current RSI"""
+        # The first bar counts as a zero change, matching TechnicalAnalyzer
+        delta = 0.0 if self.prev_close is None else value - self.prev_close
+        self.prev_close = value
+
+        self.gains.push(max(delta, 0.0))
+        self.losses.push(max(-delta, 0.0))
+        return self.value
+
+    @property
+    def value(self):
+        """Current RSI (NaN until the window is full)"""
+        avg_gain = self.gains.mean()
+        avg_loss = self.losses.mean()
+
+        if math.isnan(avg_gain) or math.isnan(avg_loss):
+            return math.nan
+        if avg_loss == 0:
+            return math.nan if avg_gain == 0 else 100.0
+        return 100 - (100 / (1 + avg_gain / avg_loss))
+
+    def to_dict(self):
+        """Serialize state"""
+        return {
+            'period': self.period,
+            'prev_close': self.prev_close,
+            'gains': self.gains.to_dict(),
+            'losses': self.losses.to_dict(),
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """Restore state"""
+        state = cls(data['period'])
+        state.prev_close = data['prev_close']
+        state.gains = RollingWindow.from_dict(data['gains'])
+        state.losses = RollingWindow.from_dict(data['losses'])
+        return state
+
+
+class BollingerState:
+    """Bollinger Bands over a rolling window"""
+
+    def __init__(self, period, num_std):
+        """Initialize with the band period and width in standard deviations"""
+        self.num_std = num_std
+        self.window = RollingWindow(period)
+
+    def update(self, value):
+        """Add a bar and return (upper, middle, lower)"""
+        self.window.push(value)
+        middle = self.window.mean()
+        width = self.window.std() * self.num_std
+        return middle + width, middle, middle - width
+
+    def to_dict(self):
+        """Serialize state"""
+        return {'num_std': self.num_std, 'window': self.window.to_dict()}
+
+    @classmethod
+    def from_dict(cls, data):
+        """Restore state"""
+        state = cls(data['window']['size'], data['num_std'])
+        state.window = RollingWindow.from_dict(data['window'])
+        return state
+
+
+class IndicatorState:
+    """All of TechnicalAnalyzer's indicators for one ticker, updated bar by bar"""
+
+    def __init__(self, params):
+        """Initialize empty state from analyzer parameters"""
+        self.params = dict(params)
+        self.last_date = None
+        self.last_close = None
+
+        self.sma_short = SMAState(params['short_window'])
+        self.sma_long = SMAState(params['long_window'])
+        self.rsi = RSIState(params['rsi_period'])
+        self.macd = MACDState(params['macd_fast'], params['macd_slow'], params['macd_signal'])
+        self.bollinger = BollingerState(params['bb_period'], params['bb_std'])
+
+    def update(self, date, close):
+        """Add one bar and return its indicator values keyed by column name"""
+        close = float(close)
+        self.last_date = date
+        self.last_close = close
+
+        macd, signal, histogram = self.macd.update(close)
+        upper, middle, lower = self.bollinger.update(close)
+
+        return {
+            'SMA_20': self.sma_short.update(close),
+            'SMA_50': self.sma_long.update(close),
+            'RSI': self.rsi.update(close),
+            'MACD': macd,
+            'MACD_Signal': signal,
+            'MACD_Histogram': histogram,
+            'BB_Upper': upper,
+            'BB_Middle': middle,
+            'BB_Lower': lower,
+        }
+
+    def to_dict(self):
+        """Serialize state for storage"""
+        return {
+            'params': self.params,
+            'last_date': self.last_date,
+            'last_close': self.last_close,
+            'sma_short': self.sma_short.to_dict(),
+            'sma_long': self.sma_long.to_dict(),
+            'rsi': self.rsi.to_dict(),
+            'macd': self.macd.to_dict(),
+            'bollinger': self.bollinger.to_dict(),
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """Restore state saved with to_dict()"""
+        state = cls(data['params'])
+        state.last_date = data['last_date']
+        state.last_close = data['last_close']
+        state.sma_short = SMAState.from_dict(data['sma_short'])
+        state.sma_long = SMAState.from_dict(data['sma_long'])
+        state.rsi = RSIState.from_dict(data['rsi'])
+        state.macd = MACDState.from_dict(data['macd'])
+        state.bollinger = BollingerState.from_dict(data['bollinger'])
+        return state
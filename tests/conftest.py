@@ -0,0 +1,44 @@
+"""
+Shared fixtures for the test suite
+"""
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def random_bars(n, seed=0, start='2020-01-01', price=100.0):
+    """Random-walk OHLCV bars on business days, shaped like get_stock_data()"""
+    rng = np.random.default_rng(seed)
+    close = price * np.exp(np.cumsum(rng.normal(0, 0.02, n)))
+    spread = close * rng.uniform(0, 0.02, n)
+
+    return pd.DataFrame({
+        'open': close + rng.normal(0, 1, n) * spread,
+        'high': close + spread,
+        'low': close - spread,
+        'close': close,
+        'volume': rng.integers(1_000, 1_000_000, n).astype(float),
+    }, index=pd.bdate_range(start, periods=n, name='date'))
+
+
+@pytest.fixture
+def bars():
+    """Factory for random_bars()"""
+    return random_bars
+
+
+@pytest.fixture
+def db(tmp_path):
+    """Empty StockDatabase in a temporary directory"""
+    from src.database import StockDatabase
+
+    database = StockDatabase(str(tmp_path / 'stocks.db'))
+    yield database
+    database.close()
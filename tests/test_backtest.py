@@ -0,0 +1,58 @@
+"""
+Tests for the vectorized backtest against hand-computed trades
+"""
+
+import numpy as np
+import pytest
+
+from src.analyzer import TechnicalAnalyzer
+from src.backtest import TRADING_DAYS, simulate, ticker_statistics, trade_returns
+
+LABELS = TechnicalAnalyzer.SIGNAL_LABELS['overall']
+CLOSE = np.array([[100.0], [110.0], [99.0], [99.0], [108.9]])   # +10%, -10%, 0%, +10%
+
+
+def codes(*signals):
+    """Column of overall signal codes"""
+    return np.array([[LABELS.index(s)] for s in signals])
+
+
+def test_long_trade_pays_entry_and_exit():
+    signals = codes('BUY', 'HOLD', 'SELL', 'HOLD', 'HOLD')
+    _, held, returns = simulate(CLOSE, signals, cost=0.01)
+
+    # Signals trade at their bar's close, so each position earns from the next bar
+    assert held[:, 0].tolist() == [0, 1, 1, 0, 0]
+    assert returns[:, 0] == pytest.approx([0, 0.09, -0.10, -0.01, 0])
+
+    stats = ticker_statistics(returns, np.ones_like(held, dtype=bool), held, cost=0.01)
+    expected = 1.09 * 0.90 * 0.99 - 1
+    assert stats['total_return'][0] == pytest.approx(expected)
+    assert stats['max_drawdown'][0] == pytest.approx(1.09 * 0.90 * 0.99 / 1.09 - 1)
+    assert stats['exposure'][0] == pytest.approx(2 / 5)
+    assert stats['turnover'][0] == pytest.approx(2 / (5 / TRADING_DAYS))
+
+    # The exit paid on bar 3 belongs to the trade, not to the flat bar after it
+    pnl, _ = trade_returns(returns, held, cost=0.01)
+    assert pnl == pytest.approx([expected])
+    assert stats['trades'][0] == 1
+    assert stats['hit_rate'][0] == 0
+
+
+def test_short_flips_split_costs_between_trades():
+    signals = codes('BUY', 'SELL', 'HOLD', 'BUY', 'HOLD')
+    _, held, returns = simulate(CLOSE, signals, cost=0.01, allow_short=True)
+
+    assert held[:, 0].tolist() == [0, 1, -1, -1, 1]
+    # Flipping trades twice the notional, so it pays twice the cost
+    assert returns[:, 0] == pytest.approx([0, 0.09, 0.08, 0, 0.08])
+
+    stats = ticker_statistics(returns, np.ones_like(held, dtype=bool), held, cost=0.01)
+    assert stats['total_return'][0] == pytest.approx(1.09 * 1.08 * 1.08 - 1)
+
+    # Long, short (each closed with one cost), then a long still open
+    pnl, _ = trade_returns(returns, held, cost=0.01)
+    assert pnl == pytest.approx([1.09 * 0.99 - 1, 1.09 * 0.99 - 1, 0.09])
+    assert stats['trades'][0] == 3
+    assert stats['hit_rate'][0] == 1
+    assert stats['exposure'][0] == pytest.approx(4 / 5)
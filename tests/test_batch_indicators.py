@@ -0,0 +1,58 @@
+"""
+BatchIndicatorEngine must match TechnicalAnalyzer ticker by ticker
+"""
+
+import numpy as np
+
+from src.analyzer import TechnicalAnalyzer
+from src.batch_indicators import BatchIndicatorEngine
+from src.panel import PricePanel
+
+
+def ragged_panel(frames):
+    """PricePanel over {ticker: bars} with each ticker keeping only its own dates"""
+    tickers, dates, columns = [], [], {name: [] for name in PricePanel.FIELDS}
+    for ticker, df in frames.items():
+        tickers.extend([ticker] * len(df))
+        dates.extend(df.index.values.astype('datetime64[D]'))
+        for name in PricePanel.FIELDS:
+            columns[name].extend(df[name])
+    columns['ticker'] = tickers
+    return PricePanel.from_rows(list(frames), np.array(dates), columns)
+
+
+def test_matches_analyzer_on_ragged_panel(bars):
+    full = bars(400, seed=1)
+    frames = {
+        'FULL': full,
+        'LATE': bars(250, seed=2, start=full.index[150]),          # starts mid-panel
+        'GAPS': full.drop(full.index[np.arange(30, 400, 7)]),       # missing sessions
+        'SHORT': bars(40, seed=3, start=full.index[300]),          # shorter than SMA_50
+    }
+    frames['GAPS'] = frames['GAPS'].assign(close=frames['GAPS']['close'] * 1.5)
+
+    panel = ragged_panel(frames)
+    engine = BatchIndicatorEngine()
+    results = engine.calculate_all_indicators(panel)
+    analyzer = TechnicalAnalyzer()
+
+    for ticker, df in frames.items():
+        expected = analyzer.calculate_all_indicators(df)
+        actual = engine.ticker_frame(panel, results, ticker)
+
+        assert actual.index.equals(expected.index)
+        for name in results:
+            np.testing.assert_allclose(actual[name].to_numpy(), expected[name].to_numpy(),
+                                       rtol=1e-8, atol=1e-8, equal_nan=True, err_msg=f"{ticker} {name}")
+
+
+def test_rows_without_a_bar_stay_nan(bars):
+    full = bars(120, seed=4)
+    frames = {'A': full, 'B': full.iloc[::2]}
+    panel = ragged_panel(frames)
+
+    sma = BatchIndicatorEngine().calculate_sma(panel, 5)
+    missing = ~panel.mask[:, panel.ticker_index['B']]
+
+    assert missing.any()
+    assert np.isnan(sma[missing, panel.ticker_index['B']]).all()
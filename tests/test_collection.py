@@ -0,0 +1,70 @@
+"""
+Tests for watchlist collection modes
+"""
+
+import pandas as pd
+
+import config
+from src.data_collector import DataCollector
+
+
+class FakeProvider:
+    """Serves fixed bars and records every request"""
+
+    name = 'fake'
+
+    def __init__(self, frames, events):
+        self.frames = frames
+        self.events = events
+
+    def download(self, tickers, **kwargs):
+        self.events.append(('download', tuple(tickers)))
+        return pd.concat({t: self.frames[t] for t in tickers}, axis=1)
+
+    def info(self, ticker):
+        return {'longName': ticker}
+
+
+def test_batch_mode_reports_progress_per_group(tmp_path, bars, monkeypatch):
+    monkeypatch.setattr(config, 'BATCH_GROUP_SIZE', 2)
+    tickers = ['AAA', 'BBB', 'CCC', 'DDD', 'EEE']
+    frames = {t: bars(30, seed=i).rename(columns=str.capitalize) for i, t in enumerate(tickers)}
+    events = []
+
+    collector = DataCollector(str(tmp_path / 'stocks.db'), provider=FakeProvider(frames, events))
+    collector.history_limiter.acquire = collector.info_limiter.acquire = lambda: 0.0
+    try:
+        results = collector.collect_watchlist(
+            tickers, mode='batch', incremental=False,
+            progress_callback=lambda ticker, result: events.append(('done', ticker))
+        )
+    finally:
+        collector.db.close()
+
+    # Every group's tickers are reported before the next group downloads
+    assert events == [
+        ('download', ('AAA', 'BBB')), ('done', 'AAA'), ('done', 'BBB'),
+        ('download', ('CCC', 'DDD')), ('done', 'CCC'), ('done', 'DDD'),
+        ('download', ('EEE',)), ('done', 'EEE'),
+    ]
+    assert list(results) == tickers
+    assert all(r['success'] and r['records'] == 30 for r in results.values())
+
+
+def test_live_bar_move_is_not_a_revision(tmp_path, bars):
+    collector = DataCollector(str(tmp_path / 'stocks.db'), provider=FakeProvider({}, []))
+    try:
+        stored = bars(5)
+        fetched = stored.rename(columns=str.capitalize)
+
+        # Only the last stored bar, possibly saved mid-session, has moved
+        live = fetched.copy()
+        live.iloc[-1, live.columns.get_loc('Close')] *= 1.005
+        assert not collector.needs_full_refetch(live, stored)
+
+        # An earlier, completed bar moving is a revision
+        revised = fetched.copy()
+        revised.iloc[-2, revised.columns.get_loc('Close')] *= 1.005
+        assert collector.needs_full_refetch(revised, stored)
+    finally:
+        collector.db.close()
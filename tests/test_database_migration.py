@@ -0,0 +1,114 @@
+"""
+Tests for upgrading databases created before schema versioning
+"""
+
+import sqlite3
+
+import pytest
+
+from src.database import StockDatabase
+
+
+def legacy_database(path, bars):
+    """Schema v0: prices and indicators keyed by ticker/date strings"""
+    conn = sqlite3.connect(path)
+    conn.executescript('''
+        CREATE TABLE stock_prices (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            ticker TEXT NOT NULL,
+            date TEXT NOT NULL,
+            open REAL,
+            high REAL,
+            low REAL,
+            close REAL,
+            volume INTEGER,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            UNIQUE(ticker, date)
+        );
+        CREATE TABLE indicators (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            ticker TEXT NOT NULL,
+            date TEXT NOT NULL,
+            sma_20 REAL,
+            sma_50 REAL,
+            rsi REAL,
+            macd REAL,
+            macd_signal REAL,
+            macd_histogram REAL,
+            bb_upper REAL,
+            bb_middle REAL,
+            bb_lower REAL,
+            UNIQUE(ticker, date)
+        );
+    ''')
+
+    frames = {ticker: bars(30, seed=i) for i, ticker in enumerate(['AAA', 'BBB'])}
+    for ticker, df in frames.items():
+        # Prices were stored as timestamps, indicators as plain dates
+        conn.executemany(
+            "INSERT INTO stock_prices (ticker, date, open, high, low, close, volume) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [(ticker, str(day), *row) for day, row in zip(df.index, df.itertuples(index=False))]
+        )
+        conn.executemany(
+            "INSERT INTO indicators (ticker, date, sma_20, rsi) VALUES (?, ?, ?, ?)",
+            [(ticker, day.strftime('%Y-%m-%d'), close, 50.0 + n)
+             for n, (day, close) in enumerate(df['close'].iloc[-10:].items())]
+        )
+    conn.commit()
+    conn.close()
+    return frames
+
+
+def test_migrates_v0_database(tmp_path, bars):
+    path = str(tmp_path / 'stocks.db')
+    frames = legacy_database(path, bars)
+
+    db = StockDatabase(path)
+    try:
+        conn = db.get_connection()
+        assert conn.execute("PRAGMA user_version").fetchone()[0] == StockDatabase.SCHEMA_VERSION
+        assert conn.execute("SELECT COUNT(*) FROM stock_prices").fetchone()[0] == 60
+        assert conn.execute("SELECT COUNT(*) FROM indicators").fetchone()[0] == 20
+        assert not db._stale_revision_triggers(conn)
+
+        for ticker, df in frames.items():
+            prices = db.get_stock_data(ticker)
+            assert list(prices.index) == list(df.index)
+            assert prices['close'].tolist() == pytest.approx(df['close'].tolist())
+
+            indicators = db.get_indicators(ticker)
+            assert list(indicators.index) == list(df.index[-10:])
+            assert indicators['rsi'].iloc[-1] == 59.0
+
+        snapshot = db.get_latest_snapshot()
+        assert list(snapshot.index) == ['AAA', 'BBB']
+        for ticker, df in frames.items():
+            row = snapshot.loc[ticker]
+            assert row['date'] == df.index[-1]
+            assert row['close'] == pytest.approx(df['close'].iloc[-1])
+            assert row['prev_close'] == pytest.approx(df['close'].iloc[-2])
+            assert row['indicator_date'] == df.index[-1]
+            assert row['rsi'] == 59.0
+    finally:
+        db.close()
+
+
+def test_failed_migration_leaves_v0_schema(tmp_path, bars, monkeypatch):
+    path = str(tmp_path / 'stocks.db')
+    legacy_database(path, bars)
+
+    def fail(self, conn):
+        raise RuntimeError("boom")
+    monkeypatch.setattr(StockDatabase, '_migrate_v2', fail)
+
+    with pytest.raises(RuntimeError):
+        StockDatabase(path)
+
+    conn = sqlite3.connect(path)
+    try:
+        assert conn.execute("PRAGMA user_version").fetchone()[0] == 0
+        assert 'ticker' in [row[1] for row in conn.execute("PRAGMA table_info(stock_prices)")]
+        assert conn.execute("SELECT COUNT(*) FROM stock_prices").fetchone()[0] == 60
+        assert conn.execute("SELECT name FROM sqlite_master WHERE name = 'tickers'").fetchone() is None
+    finally:
+        conn.close()
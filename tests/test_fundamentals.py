@@ -0,0 +1,48 @@
+"""
+Tests for the stale-while-revalidate fundamentals store
+"""
+
+from src.fundamentals import FundamentalsStore
+
+
+class FakeCollector:
+    """Returns canned info and counts fetches"""
+
+    def __init__(self, info):
+        self.info = info
+        self.calls = 0
+
+    def fetch_stock_info(self, ticker):
+        self.calls += 1
+        return self.info
+
+
+def settle(store):
+    """Wait for queued refreshes (the store runs them on one worker here)"""
+    store.executor.submit(lambda: None).result()
+
+
+def test_failed_fetch_is_not_retried_until_retry_interval(db):
+    collector = FakeCollector({})
+    store = FundamentalsStore(db, collector, retry=60, max_workers=1)
+
+    for _ in range(3):
+        assert store.get('AAA') == {}
+        settle(store)
+    assert collector.calls == 1
+
+    # Once the retry interval has passed the ticker is fetched again
+    store.failed['AAA'] -= 61
+    store.get('AAA')
+    settle(store)
+    assert collector.calls == 2
+
+
+def test_successful_fetch_is_stored(db):
+    collector = FakeCollector({'longName': 'Aaa Inc'})
+    store = FundamentalsStore(db, collector, max_workers=1)
+
+    store.get('AAA')
+    settle(store)
+    assert store.get('AAA')['longName'] == 'Aaa Inc'
+    assert collector.calls == 1
@@ -0,0 +1,64 @@
+"""
+Tests for incremental indicator updates and price revision handling
+"""
+
+from datetime import datetime, time
+
+import numpy as np
+import pytest
+
+from src.data_collector import DataCollector
+
+
+@pytest.fixture
+def collector(tmp_path):
+    """DataCollector on a temporary database; these tests never hit the provider"""
+    collector = DataCollector(str(tmp_path / 'stocks.db'), provider=object())
+    yield collector
+    collector.db.close()
+
+
+def download(df):
+    """Bars as the provider returns them (capitalized columns)"""
+    return df.rename(columns=str.capitalize)
+
+
+def trading(collector, day):
+    """Pin the collector's clock to midday of a session"""
+    collector.calendar.now = lambda: datetime.combine(day.date(), time(12), collector.calendar.tz)
+
+
+def test_in_progress_bar_is_not_checkpointed(collector, bars):
+    df = bars(80)
+    trading(collector, df.index[-1])
+    collector.db.save_stock_data('AAA', download(df))
+
+    assert collector.update_indicators('AAA')
+    state = collector.db.get_indicator_state('AAA')
+    assert state['last_date'] == df.index[-2].strftime('%Y-%m-%d')
+
+    # The live bar moves; its indicators follow from the checkpoint
+    live = df.iloc[[-1]].copy()
+    live['close'] *= 1.01
+    collector.db.save_stock_data('AAA', download(live))
+    assert collector.update_indicators('AAA')
+
+    df.loc[live.index, 'close'] = live['close']
+    expected = collector.analyzer.calculate_all_indicators(df)
+    stored = collector.db.get_indicators('AAA')
+    assert stored['sma_20'].iloc[-1] == pytest.approx(expected['SMA_20'].iloc[-1])
+    assert collector.db.get_indicator_state('AAA')['last_date'] == state['last_date']
+
+
+@pytest.mark.parametrize('factor, kept', [(1 + 1e-6, True), (1.01, False)])
+def test_revision_tolerance(db, bars, factor, kept):
+    df = bars(60)
+    db.save_stock_data('AAA', download(df))
+    db.save_indicator_state('AAA', {'last_date': df.index[-1].strftime('%Y-%m-%d')})
+
+    revised = df.iloc[[30]].copy()
+    revised['close'] *= factor
+    db.save_stock_data('AAA', download(revised))
+
+    assert (db.get_indicator_state('AAA') is not None) == kept
+    assert np.isclose(db.get_stock_data('AAA')['close'].iloc[30], revised['close'].iloc[0])
@@ -0,0 +1,79 @@
+"""
+Tests for the columnar price store
+"""
+
+import os
+
+import numpy as np
+import pytest
+
+import config
+from src.price_store import PriceStore, migrate_from_sqlite
+
+
+def write(store, ticker, df):
+    """Write a random_bars() frame"""
+    return store.write(ticker, df.index.values, {c: df[c].values for c in PriceStore.COLUMNS[1:]})
+
+
+def assert_stored(store, ticker, df):
+    stored = store.get_stock_data(ticker, columns=list(PriceStore.COLUMNS[1:]))
+    assert list(stored.index) == list(df.index)
+    for column in PriceStore.COLUMNS[1:]:
+        assert stored[column].tolist() == pytest.approx(df[column].tolist())
+
+
+def test_round_trip_and_ranges(tmp_path, bars):
+    store = PriceStore(str(tmp_path))
+    df = bars(40)
+    assert write(store, 'AAA', df) is None
+
+    assert_stored(store, 'AAA', df)
+    assert store.get_all_tickers() == ['AAA']
+    assert store.get_last_date('AAA') == df.index[-1].strftime('%Y-%m-%d')
+    assert list(store.get_recent_bars('AAA', 5).index) == list(df.index[-5:])
+
+    window = store.get_stock_data('AAA', start_date=df.index[10], end_date=df.index[19])
+    assert list(window.index) == list(df.index[10:20])
+
+
+def test_incremental_write_updates_file_in_place(tmp_path, bars):
+    store = PriceStore(str(tmp_path))
+    df = bars(40)
+    write(store, 'AAA', df.iloc[:35])
+    path = store._path('AAA')
+    inode, size = os.stat(path).st_ino, os.path.getsize(path)
+
+    # Overlap bars plus new ones, like an incremental download
+    assert write(store, 'AAA', df.iloc[30:]) is None
+    assert (os.stat(path).st_ino, os.path.getsize(path)) == (inode, size)
+    assert_stored(store, 'AAA', df)
+
+    # A revised close is reported by date
+    revised = df.iloc[[32]].copy()
+    revised['close'] *= 1.01
+    assert write(store, 'AAA', revised) == np.datetime64(df.index[32].date(), 'D')
+
+
+def test_inserted_and_overflowing_bars_rewrite_file(tmp_path, bars):
+    store = PriceStore(str(tmp_path))
+    df = bars(PriceStore.MIN_CAPACITY + 10)
+    write(store, 'AAA', df.iloc[::2])
+    write(store, 'AAA', df.iloc[1::2])
+    assert_stored(store, 'AAA', df)
+
+
+def test_migrate_from_sqlite(tmp_path, bars, monkeypatch):
+    from src.database import StockDatabase
+
+    monkeypatch.setattr(config, 'PRICE_BACKEND', 'sqlite')
+    db = StockDatabase(str(tmp_path / 'stocks.db'))
+    frames = {t: bars(30, seed=i) for i, t in enumerate(['AAA', '^GSPC'])}
+    db.save_stock_data_bulk({t: df.rename(columns=str.capitalize) for t, df in frames.items()})
+    db.close()
+
+    store = PriceStore(str(tmp_path / 'prices'))
+    assert migrate_from_sqlite(str(tmp_path / 'stocks.db'), store) == 60
+    assert store.get_all_tickers() == ['AAA', '^GSPC']
+    for ticker, df in frames.items():
+        assert_stored(store, ticker, df.assign(volume=df['volume'].round()))
@@ -0,0 +1,62 @@
+"""
+Tests for the snapshot screener
+"""
+
+import pytest
+
+from src.screener import Screener
+
+
+@pytest.fixture
+def screener(db, bars):
+    """Screener over two tickers with stored prices and indicators"""
+    from src.analyzer import TechnicalAnalyzer
+
+    analyzer = TechnicalAnalyzer()
+    for i, ticker in enumerate(['AAA', 'BBB']):
+        df = bars(80, seed=i)
+        db.save_stock_data(ticker, df.rename(columns=str.capitalize))
+        indicators = analyzer.calculate_all_indicators(df)
+        db.save_indicators(ticker, indicators, signals=analyzer.generate_signals(indicators))
+    return Screener(db)
+
+
+def test_filters_and_ranks(screener):
+    results = screener.screen("RSI > 0", sort_by='RSI', ascending=False)
+    assert list(results['rank']) == [1, 2]
+    assert results['RSI'].is_monotonic_decreasing
+
+
+@pytest.mark.parametrize('expression', [
+    "nope > 1",
+    "RSI >",
+    "RSI.foo > 1",
+    "RSI > 1 if True else 2",
+])
+def test_bad_expression_raises_value_error(screener, expression):
+    with pytest.raises(ValueError):
+        screener.screen(expression)
+
+
+def test_unknown_sort_column_raises_value_error(screener):
+    with pytest.raises(ValueError, match='nope'):
+        screener.screen(sort_by='nope')
+
+
+def test_indicators_saved_without_signals_clear_stale_ones(db, bars):
+    from src.analyzer import TechnicalAnalyzer
+
+    analyzer = TechnicalAnalyzer()
+    df = bars(80)
+    db.save_stock_data('AAA', df.rename(columns=str.capitalize))
+    db.save_indicators('AAA', analyzer.calculate_all_indicators(df.iloc[:60]), signals={'overall': 'BUY'})
+
+    # Nothing new to store: the snapshot's signals are left alone
+    db.save_indicators('AAA', analyzer.calculate_all_indicators(df.iloc[:30]))
+    assert db.get_latest_snapshot()['signal_overall'].iloc[0] == 'BUY'
+
+    # New rows without signals: the old ones no longer describe them
+    db.save_indicators('AAA', analyzer.calculate_all_indicators(df))
+    results = Screener(db).screen("overall == 'BUY'")
+    assert results.empty
+    assert results.attrs['missing_signals'] == ['AAA']
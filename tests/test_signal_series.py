@@ -0,0 +1,50 @@
+"""
+generate_signal_series must give generate_signals' verdict on every bar
+"""
+
+import numpy as np
+import pytest
+
+from src.analyzer import TechnicalAnalyzer
+from src.batch_indicators import BatchIndicatorEngine
+
+KEYS = ['trend', 'rsi_signal', 'macd_signal', 'bb_signal', 'overall']
+
+
+def scalar_signals(analyzer, df):
+    """generate_signals() on every prefix of df, one dict per bar"""
+    return [analyzer.generate_signals(df.iloc[:i + 1]) for i in range(len(df))]
+
+
+@pytest.mark.parametrize('seed', [0, 1, 2, 3])
+def test_series_matches_scalar_rules(bars, seed):
+    analyzer = TechnicalAnalyzer()
+    df = bars(260, seed=seed)
+    if seed == 3:
+        # A flat stretch exercises NaN RSI and equal moving averages
+        df.loc[df.index[120:200], 'close'] = df['close'].iloc[120]
+
+    indicators = analyzer.calculate_all_indicators(df)
+    expected = scalar_signals(analyzer, indicators)
+    series = analyzer.generate_signal_series(indicators)
+
+    for key in KEYS:
+        assert series[key].astype(str).tolist() == [s[key] for s in expected], key
+
+    # Every label occurs somewhere, so the comparison covers each rule
+    if seed == 0:
+        assert set(series['overall'].astype(str)) == {'BUY', 'SELL', 'HOLD'}
+
+
+@pytest.mark.parametrize('seed', [0, 1])
+def test_batch_codes_match_scalar_rules(bars, seed):
+    analyzer = TechnicalAnalyzer()
+    frames = [bars(260, seed=seed), bars(260, seed=seed + 10, price=20.0)]
+    close = np.column_stack([df['close'].to_numpy() for df in frames])
+    codes = analyzer.generate_signal_series(close, BatchIndicatorEngine(analyzer).calculate_all_indicators(close))
+
+    for column, df in enumerate(frames):
+        expected = scalar_signals(analyzer, analyzer.calculate_all_indicators(df))
+        for key in KEYS:
+            labels = TechnicalAnalyzer.SIGNAL_LABELS[key]
+            assert [labels[c] for c in codes[key][:, column]] == [s[key] for s in expected], key
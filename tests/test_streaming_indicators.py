@@ -0,0 +1,48 @@
+"""
+Streaming IndicatorState updates must reproduce calculate_all_indicators
+"""
+
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.analyzer import TechnicalAnalyzer
+from src.streaming_indicators import IndicatorState
+
+
+def stream(df, params, checkpoints=()):
+    """Feed bars one at a time, round-tripping the state through JSON at each checkpoint"""
+    state = IndicatorState(params)
+    rows = []
+    for i, (date, close) in enumerate(zip(df.index.strftime('%Y-%m-%d'), df['close'])):
+        if i in checkpoints:
+            state = IndicatorState.from_dict(json.loads(json.dumps(state.to_dict())))
+        rows.append(state.update(date, close))
+    return pd.DataFrame(rows, index=df.index)
+
+
+@pytest.mark.parametrize('checkpoints', [(), (1, 60, 61, 250), tuple(range(0, 300, 13))])
+def test_matches_batch_calculation(bars, checkpoints):
+    df = bars(300, seed=5)
+    analyzer = TechnicalAnalyzer()
+
+    expected = analyzer.calculate_all_indicators(df)
+    actual = stream(df, analyzer.get_params(), checkpoints)
+
+    for name in actual.columns:
+        np.testing.assert_allclose(actual[name].to_numpy(), expected[name].to_numpy(),
+                                   rtol=1e-8, atol=1e-8, equal_nan=True, err_msg=name)
+
+
+def test_flat_prices_match_rsi_edge_cases(bars):
+    df = bars(80, seed=6)
+    df.loc[df.index[20:50], 'close'] = 50.0      # no gains and no losses -> NaN RSI
+    df.loc[df.index[50:], 'close'] = np.linspace(51, 80, 30)   # only gains -> RSI 100
+    analyzer = TechnicalAnalyzer()
+
+    expected = analyzer.calculate_all_indicators(df)['RSI'].to_numpy()
+    actual = stream(df, analyzer.get_params(), (40,))['RSI'].to_numpy()
+
+    np.testing.assert_allclose(actual, expected, rtol=1e-8, atol=1e-8, equal_nan=True)